@@ -0,0 +1,5 @@
+"""
+pytest 설정 - 루트의 테스트 파일을 수집하기 전에 tests 패키지의 테스트 환경 준비
+"""
+
+import tests  # noqa: F401  (LLM 응답 캐시를 임시 경로로 지정)
@@ -9,23 +9,25 @@ import time
 import signal
 import sys
 import argparse
+import importlib.util
 from pathlib import Path
 from typing import List, Tuple, Optional
 
-from src.agents.vehicle_agent import VehicleManualAgent
-from src.config.settings import DEFAULT_PDF_PATH
+from src.utils.startup_profiler import start_profiling, stop_profiling, profile_section
+
+# --profile-startup 모드에서는 모듈 임포트 시간까지 측정하기 위해 무거운 임포트 전에 활성화
+if "--profile-startup" in sys.argv:
+    start_profiling()
+
+from src.config.settings import VEHICLE_MANUALS, DEFAULT_VEHICLE_ID
 from src.utils.callback_handlers import (
     PerformanceMonitoringHandler,
     RealTimeNotificationHandler,
     AlertHandler
 )
 
-# Gradio는 선택적 임포트
-try:
-    import gradio as gr
-    GRADIO_AVAILABLE = True
-except ImportError:
-    GRADIO_AVAILABLE = False
+# Gradio는 선택적 임포트 (웹 인터페이스 모드에서만 로드)
+GRADIO_AVAILABLE = importlib.util.find_spec("gradio") is not None
 
 
 class GradioVehicleChatbot:
@@ -114,8 +116,9 @@ class GradioVehicleChatbot:
         
         return stats_text.strip()
     
-    def create_interface(self) -> gr.Blocks:
+    def create_interface(self):
         """Gradio 인터페이스 생성"""
+        import gradio as gr
         
         with gr.Blocks(
             title="🚗 지능형 차량 어시스턴트",
@@ -378,6 +381,8 @@ def main():
 사용 예시:
   python main.py                    # 터미널 인터페이스 (기본)
   python main.py --gradio           # Gradio 웹 인터페이스
+  python main.py --profile-startup  # 시작 시간 프로파일 출력
+  python main.py --vehicle xc60_2026  # 기본 차량 매뉴얼 지정
   python main.py --help             # 도움말 표시
         """
     )
@@ -395,6 +400,19 @@ def main():
         help='Gradio 서버 포트 (기본: 7860)'
     )
     
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='모듈 임포트 및 초기화 단계별 소요 시간 트리 출력'
+    )
+    
+    parser.add_argument(
+        '--vehicle',
+        choices=sorted(VEHICLE_MANUALS),
+        default=DEFAULT_VEHICLE_ID,
+        help=f'기본 차량 매뉴얼 ID (기본: {DEFAULT_VEHICLE_ID})'
+    )
+    
     args = parser.parse_args()
     
     print("=" * 60)
@@ -429,14 +447,22 @@ def main():
     signal.signal(signal.SIGINT, signal_handler)
     
     try:
-        # PDF 파일 경로 설정
-        pdf_path = str(DEFAULT_PDF_PATH)
-        print(f"📄 PDF 파일: {Path(pdf_path).name}")
+        # 기본 차량 매뉴얼 설정 (다른 차량 매뉴얼은 질의 시 로드)
+        manual = VEHICLE_MANUALS[args.vehicle]
+        print(f"🚘 기본 차량: {manual.get('name', args.vehicle)} ({args.vehicle})")
+        print(f"📄 PDF 파일: {Path(str(manual['pdf_path'])).name}")
         
         # 에이전트 초기화 (SubGraph 아키텍처)
         print("\n🔧 SubGraph 시스템 초기화 중...")
-        agent = VehicleManualAgent(pdf_path)
+        with profile_section("에이전트 모듈 임포트"):
+            from src.agents.vehicle_agent import VehicleManualAgent
+        with profile_section("에이전트 초기화"):
+            agent = VehicleManualAgent(vehicle_id=args.vehicle)
         print("✅ SubGraph 시스템 준비 완료!")
+        
+        profiler = stop_profiling()
+        if profiler is not None:
+            profiler.print_report()
         print("📊 성능 모니터링 활성화")
         print("🔔 실시간 알림 활성화")
         print("🔧 SubGraph 모듈화 완료")
@@ -450,6 +476,7 @@ def main():
             run_terminal_interface(agent, callbacks)
     
     except Exception as e:
+        stop_profiling()
         print(f"❌ 시스템 초기화 실패: {str(e)}")
         print("📋 해결 방법:")
         print("1. .env 파일에 OPENAI_API_KEY가 설정되어 있는지 확인")
@@ -12,6 +12,7 @@ sys.path.insert(0, str(project_root))
 
 from tests.test_emergency_system import run_emergency_tests
 from tests.test_performance_benchmark import run_performance_tests
+from tests.test_ann_benchmark import run_ann_benchmark
 
 
 def main():
@@ -19,7 +20,7 @@ def main():
     parser = argparse.ArgumentParser(description="응급 상황 시스템 테스트 실행")
     parser.add_argument(
         "--test-type", 
-        choices=["emergency", "performance", "all"],
+        choices=["emergency", "performance", "ann", "all"],
         default="all",
         help="실행할 테스트 타입 (기본값: all)"
     )
@@ -65,6 +66,20 @@ def main():
             success = False
             print(f"❌ 성능 벤치마크 테스트 실행 오류: {str(e)}")
     
+    if args.test_type in ["ann", "all"]:
+        print("\n🧭 ANN 인덱스 재현율/지연 벤치마크 시작")
+        print("-" * 40)
+        try:
+            report = run_ann_benchmark()
+            if report is None:
+                success = False
+                print("❌ ANN 벤치마크 실패")
+            else:
+                print("✅ ANN 벤치마크 완료")
+        except Exception as e:
+            success = False
+            print(f"❌ ANN 벤치마크 실행 오류: {str(e)}")
+    
     print("\n" + "=" * 60)
     if success:
         print("🎉 모든 테스트 완료!")
@@ -3,7 +3,6 @@
 """
 
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 from langgraph.graph import StateGraph, START, END
 
@@ -12,16 +11,14 @@ from ...config.settings import DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE
 from ...prompts.templates import VehiclePromptTemplates
 from ...utils.answer_evaluator import AnswerEvaluator
 from ...utils.emergency_detector import EmergencyDetector
+from ...utils.llm_cache import create_chat_llm
 
 
 class AnswerGenerationSubGraph:
     """답변 생성 SubGraph"""
     
     def __init__(self):
-        self.llm = ChatOpenAI(
-            model=DEFAULT_LLM_MODEL,
-            temperature=DEFAULT_LLM_TEMPERATURE
-        )
+        self.llm = create_chat_llm(DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE)
         self.answer_evaluator = AnswerEvaluator()
         self.emergency_detector = EmergencyDetector()
         self.answer_prompt = VehiclePromptTemplates.get_answer_generation_prompt()
@@ -3,31 +3,32 @@
 """
 
 import re
-from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Tuple
 from langchain_core.output_parsers import StrOutputParser
 from langgraph.graph import StateGraph, START, END
 
 from ...models.states import SearchPipelineState
 from ...config.settings import DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE, DEFAULT_TOP_K
 from ...prompts.templates import VehiclePromptTemplates
+from ...retrievers.retrieval_pipeline import RetrievalPipeline
+from ...utils.llm_cache import create_chat_llm
+from ...utils.query_router import get_query_router
 from ...tools.search_tools import (
-    vector_store, bm25_retriever, multi_query_retriever,
-    cross_encoder_retriever, compression_retriever
+    document_to_result, dedupe_results, use_components
 )
 
 
 class SearchPipelineSubGraph:
     """검색 파이프라인 SubGraph"""
     
-    def __init__(self, search_options: Dict[str, Any], rerank_compression_options: Dict[str, Any]):
-        self.llm = ChatOpenAI(
-            model=DEFAULT_LLM_MODEL,
-            temperature=DEFAULT_LLM_TEMPERATURE
-        )
+    def __init__(self, search_options: Dict[str, Any], rerank_compression_options: Dict[str, Any],
+                 tool_components: Dict[str, Any] = None):
+        self.llm = create_chat_llm(DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE)
         self.search_options = search_options
         self.rerank_compression_options = rerank_compression_options
+        self.tool_components = tool_components  # 검색 도구가 사용할 매뉴얼 샤드 검색기 묶음
         self.analysis_prompt = VehiclePromptTemplates.get_query_analysis_prompt()
+        self.router = get_query_router()  # 검색 전략/방법 로컬 라우터 (LLM은 신뢰도가 낮을 때만)
     
     def query_analyzer(self, state: SearchPipelineState) -> Dict[str, Any]:
         """쿼리 분석 노드"""
@@ -51,29 +52,11 @@ class SearchPipelineSubGraph:
                     "compression_method": compression_method
                 }
             
-            # 일반 질문 처리
-            analysis_chain = self.analysis_prompt | self.llm | StrOutputParser()
-            analysis_result = analysis_chain.invoke({"query": query})
-            
-            # 결과 파싱
-            search_strategy = self._extract_field(analysis_result, "검색 전략")
-            search_method = self._extract_field(analysis_result, "검색 방법")
-            confidence_str = self._extract_field(analysis_result, "신뢰도")
-            
-            # 신뢰도 점수 변환
-            try:
-                confidence_score = float(confidence_str)
-            except:
-                confidence_score = 0.8
-            
-            # 쿼리 확장 및 다중 쿼리 로직
-            original_search_method = search_method
-            if any(keyword in query.lower() for keyword in ['교체', '문제', '고장', '이상']):
-                search_method = "expanded_query"
-                print(f"🔧 키워드 기반 검색 방법 변경: {original_search_method} → {search_method}")
-            elif len(query) > 20 and '?' in query:
-                search_method = "multi_query"
-                print(f"🔧 복잡한 질문 감지, 검색 방법 변경: {original_search_method} → {search_method}")
+            # 일반 질문은 로컬 라우터(규칙 + 분류기)로 결정, 신뢰도가 낮은 항목만 LLM 분석
+            decision = self.router.route(query, fallback=self._analyze_with_llm)
+            search_strategy = decision.strategy
+            search_method = decision.method
+            confidence_score = round(decision.confidence, 3)
             
             # 재순위화/압축 방법 선택
             compression_method = self._select_compression_method(search_strategy)
@@ -82,7 +65,7 @@ class SearchPipelineSubGraph:
             print(f"📋 쿼리 분석 결과:")
             print(f"   • 검색 전략: {search_strategy}")
             print(f"   • 검색 방법: {search_method}")
-            print(f"   • 신뢰도: {confidence_score}")
+            print(f"   • 신뢰도: {confidence_score} (결정: {decision.source})")
             print(f"   • 압축 방법: {compression_method}")
             
             return {
@@ -102,7 +85,12 @@ class SearchPipelineSubGraph:
             }
     
     def search_executor(self, state: SearchPipelineState) -> Dict[str, Any]:
-        """검색 실행 노드"""
+        """검색 실행 노드 (검색 도구는 이 SubGraph의 매뉴얼 샤드 검색기 사용)"""
+        with use_components(self.tool_components):
+            return self._execute_search(state)
+    
+    def _execute_search(self, state: SearchPipelineState) -> Dict[str, Any]:
+        """1차 검색 + 재순위화/압축 실행 (재순위화/압축은 1차 후보만 사용)"""
         query = state["query"]
         search_method = state.get("search_method", "hybrid_semantic")
         compression_method = state.get("compression_method", "rerank_compress_general")
@@ -112,44 +100,39 @@ class SearchPipelineSubGraph:
         print(f"   • 압축/재순위화 방법: {compression_method}")
         
         try:
-            # 1차 검색 수행
-            if search_method == "expanded_query":
-                print("🔎 확장 쿼리 검색 실행 중...")
-                from ...tools.search_tools import expanded_query_search
-                search_results = expanded_query_search.invoke({"query": query, "top_k": DEFAULT_TOP_K})
-            elif search_method == "multi_query":
-                print("🔎 다중 쿼리 검색 실행 중...")
-                from ...tools.search_tools import multi_query_search
-                search_results = multi_query_search.invoke({"query": query, "top_k": DEFAULT_TOP_K})
-            else:
-                # 기본 검색 수행
-                print(f"🔎 기본 검색 실행 중... (방법: {search_method})")
-                retriever = self.search_options.get(search_method)
-                if retriever:
-                    docs = retriever.invoke(query)
-                    search_results = [
-                        {
-                            "content": doc.page_content,
-                            "page": doc.metadata.get("page", 0),
-                            "source": doc.metadata.get("source", ""),
-                            "score": 1.0
-                        }
-                        for doc in docs[:DEFAULT_TOP_K]
-                    ]
-                else:
-                    print(f"❌ 검색 방법 '{search_method}'을 찾을 수 없습니다.")
-                    search_results = [{"content": "검색 방법을 찾을 수 없습니다.", "page": 0, "score": 0.0}]
-            
-            print(f"📊 1차 검색 결과: {len(search_results)}개 문서 발견")
+            # 1차 검색 (검색 + 융합): 재순위화 후보까지 한 번에 가져옴
+            retriever = self.search_options.get(search_method)
+            if retriever is None:
+                print(f"❌ 검색 방법 '{search_method}'을 찾을 수 없습니다.")
+                return {
+                    "search_results": [{"content": "검색 방법을 찾을 수 없습니다.", "page": 0, "score": 0.0}],
+                    "page_references": []
+                }
             
-            # 2차 재순위화/압축 적용
+            stages = []
             if compression_method and compression_method != "none":
+                stages = self.rerank_compression_options.get(compression_method, [])
+            pipeline = RetrievalPipeline(retriever=retriever, stages=stages, top_k=DEFAULT_TOP_K)
+            
+            # expanded_query 검색기는 전문 용어 확장을 내부에서 적용 (원본 질의로 검색)
+            print(f"🔎 1차 검색 실행 중... (방법: {search_method})")
+            candidates = pipeline.retrieve(query)
+            
+            print(f"📊 1차 검색 결과: {len(candidates)}개 후보 문서 발견")
+            
+            # 2차 재순위화/압축 적용 (1차 후보를 이어받음, 추가 검색 없음)
+            if stages:
                 print(f"🔄 재순위화/압축 적용 중... (방법: {compression_method})")
-                original_count = len(search_results)
-                search_results = self._apply_compression(query, search_results, compression_method)
-                print(f"✅ 재순위화 완료: {original_count}개 → {len(search_results)}개 문서")
+                docs = pipeline.refine(query, candidates)
+                print(f"✅ 재순위화 완료: {len(candidates)}개 → {len(docs)}개 문서")
             else:
                 print("⏭️  재순위화/압축 건너뜀")
+                docs = candidates
+            
+            search_results = [document_to_result(doc, doc.metadata.get("score")) for doc in docs]
+            
+            # 정규 청크 ID 기준 중복 제거 후 최종 개수로 자름
+            search_results = dedupe_results(search_results)[:DEFAULT_TOP_K]
             
             # 페이지 참조 추출
             page_references = list(set([
@@ -170,6 +153,25 @@ class SearchPipelineSubGraph:
                 "page_references": []
             }
     
+    def _analyze_with_llm(self, query: str) -> Tuple[str, str, float]:
+        """Few-shot LLM 쿼리 분석 → (검색 전략, 검색 방법, 신뢰도)"""
+        print("🤖 라우터 신뢰도 낮음, LLM 쿼리 분석 실행")
+        analysis_chain = self.analysis_prompt | self.llm | StrOutputParser()
+        analysis_result = analysis_chain.invoke({"query": query})
+        
+        # 결과 파싱
+        search_strategy = self._extract_field(analysis_result, "검색 전략")
+        search_method = self._extract_field(analysis_result, "검색 방법")
+        confidence_str = self._extract_field(analysis_result, "신뢰도")
+        
+        # 신뢰도 점수 변환
+        try:
+            confidence_score = float(confidence_str)
+        except:
+            confidence_score = 0.8
+        
+        return search_strategy, search_method, confidence_score
+    
     def _extract_field(self, text: str, field_name: str) -> str:
         """텍스트에서 특정 필드 값 추출"""
         pattern = rf"{field_name}:\s*(.+?)(?:\n|$)"
@@ -187,24 +189,6 @@ class SearchPipelineSubGraph:
         }
         return compression_map.get(search_strategy, "rerank_compress_general")
     
-    def _apply_compression(self, query: str, search_results: List[Dict], compression_method: str) -> List[Dict]:
-        """압축/재순위화 적용"""
-        try:
-            retriever = self.rerank_compression_options.get(compression_method)
-            if retriever:
-                # 압축 검색 수행
-                if compression_method.startswith("rerank_compress"):
-                    from ...tools.search_tools import cross_encoder_rerank_search
-                    return cross_encoder_rerank_search.invoke({"query": query, "top_k": DEFAULT_TOP_K})
-                else:
-                    from ...tools.search_tools import contextual_compression_search
-                    return contextual_compression_search.invoke({"query": query, "top_k": DEFAULT_TOP_K})
-            
-        except Exception as e:
-            print(f"압축 적용 오류: {str(e)}")
-        
-        return search_results
-    
     def create_graph(self) -> StateGraph:
         """검색 파이프라인 SubGraph 생성"""
         workflow = StateGraph(SearchPipelineState)
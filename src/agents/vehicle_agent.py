@@ -3,22 +3,29 @@
 """
 
 from typing import Dict, Any, List
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain.retrievers import EnsembleRetriever
+from langchain_openai import OpenAIEmbeddings
 from langgraph.graph import StateGraph, END
 
 from ..models.states import MainAgentState
 from ..config.settings import (
-    DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE, DEFAULT_TOP_K, WEIGHT_CONFIGS
+    DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE, CANDIDATE_DOCS_COUNT, WEIGHT_CONFIGS,
+    BACKGROUND_WARMUP, VEHICLE_MANUALS, DEFAULT_VEHICLE_ID, ANSWER_CACHE_ENABLED
 )
 from ..retrievers.vector_retriever import VectorStoreManager
 from ..retrievers.hybrid_retriever import HybridRetrieverManager
 from ..retrievers.compression_retriever import CompressionRetrieverManager
+from ..retrievers.fusion_retriever import FusionRetriever, ScoredVectorRetriever
+from ..retrievers.expanded_query_retriever import build_expanded_retriever
+from ..retrievers.page_index import PageIndex
+from ..retrievers.shard_manager import ManualShard, ShardManager, get_shard_dirs
+from ..utils.answer_cache import SemanticAnswerCache
 from ..utils.document_loader import DocumentLoader
-from ..tools.search_tools import (
-    vector_store, bm25_retriever, hybrid_retriever, multi_query_retriever,
-    cross_encoder_retriever, compression_retriever
-)
+from ..utils.emergency_detector import EmergencyDetector, emergency_severity
+from ..utils.embedding_cache import CachedEmbeddings, embedding_request_scope
+from ..utils.lazy import warm_up_in_background
+from ..utils.llm_cache import create_chat_llm, get_llm_cache
+from ..utils.startup_profiler import profile_section
+from ..tools.search_tools import document_to_result
 from .subgraphs import (
     EmergencyDetectionSubGraph,
     SearchPipelineSubGraph,
@@ -29,31 +36,39 @@ from .subgraphs import (
 
 
 class VehicleManualAgent:
-    """차량 매뉴얼 RAG 에이전트 - SubGraph 아키텍처"""
+    """차량 매뉴얼 RAG 에이전트 - SubGraph 아키텍처
     
-    def __init__(self, pdf_path: str):
-        # LLM 및 임베딩 모델 초기화
-        self.llm = ChatOpenAI(
-            model=DEFAULT_LLM_MODEL,
-            temperature=DEFAULT_LLM_TEMPERATURE
-        )
-        self.embeddings = OpenAIEmbeddings()
+    차량 매뉴얼마다 독립된 인덱스 샤드(벡터 + BM25)를 두고, 질의의 차량 ID로
+    샤드를 선택한다. 샤드는 첫 질의 시 로드되며 메모리 예산을 넘으면 LRU로 해제된다.
+    """
+    
+    def __init__(self, pdf_path: str = None, vehicle_id: str = None, catalog: Dict[str, Dict] = None):
+        # LLM 및 임베딩 모델 초기화 (모든 샤드 공유)
+        self.llm = create_chat_llm(DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE)
+        # 질의 임베딩은 요청 범위 + 프로세스 LRU 캐시로 중복 호출 제거
+        self.embeddings = CachedEmbeddings(OpenAIEmbeddings())
         
         # 문서 로더 초기화
         self.document_loader = DocumentLoader()
         
-        # 검색기 관리자들 초기화
-        self.vector_manager = VectorStoreManager(pdf_path)
-        self.hybrid_manager = None
-        self.compression_manager = None
+        # 의미 기반 답변 캐시 (차량 매뉴얼별 네임스페이스, 인덱스가 바뀌면 무효화)
+        self.answer_cache = SemanticAnswerCache() if ANSWER_CACHE_ENABLED else None
+        self.keyword_emergency_detector = EmergencyDetector()  # 답변 캐시 로컬 게이트 (LLM 감지 전 응급 단서 판단)
         
-        # 검색 옵션 설정
-        self.search_options = {}
-        self.rerank_compression_options = {}
+        # 차량 매뉴얼 카탈로그 (pdf_path가 주어지면 기본 차량의 매뉴얼로 사용)
+        self.catalog = dict(catalog or VEHICLE_MANUALS)
+        self.default_vehicle_id = vehicle_id or DEFAULT_VEHICLE_ID
+        if pdf_path:
+            self.catalog[self.default_vehicle_id] = {
+                **self.catalog.get(self.default_vehicle_id, {}), "pdf_path": pdf_path
+            }
+        # 기본 차량 샤드는 전역 검색 도구가 참조하므로 해제하지 않음
+        self.shard_manager = ShardManager(
+            self.catalog, self._build_shard, pinned=[self.default_vehicle_id]
+        )
         
-        # SubGraph 인스턴스들
+        # SubGraph 인스턴스들 (검색 파이프라인은 샤드별)
         self.emergency_subgraph = None
-        self.search_subgraph = None
         self.answer_subgraph = None
         self.driving_subgraph = None
         self.speech_subgraph = None
@@ -62,93 +77,158 @@ class VehicleManualAgent:
         self._initialize_system()
     
     def _initialize_system(self):
-        """시스템 전체 초기화"""
+        """시스템 전체 초기화 (공용 SubGraph + 기본 차량 샤드)"""
         print("🚀 차량 매뉴얼 RAG 시스템 초기화 중...")
+        print(f"🚘 등록 차량 매뉴얼: {len(self.catalog)}개 (기본: {self.default_vehicle_id})")
         
-        # 1. 벡터 저장소 초기화
-        vector_store_instance = self.vector_manager.initialize_vector_store()
-        if vector_store_instance is None:
-            raise Exception("벡터 저장소 초기화에 실패했습니다.")
+        # 1. 공용 SubGraph 인스턴스 초기화
+        with profile_section("SubGraph"):
+            self._initialize_subgraphs()
         
-        # 전역 변수 설정
-        global vector_store
-        vector_store = vector_store_instance
+        # 2. 기본 차량 샤드 로드 (나머지 차량은 첫 질의 시 로드)
+        default_shard = self.shard_manager.get(self.default_vehicle_id)
         
-        # 2. 문서 로드 (하이브리드 검색기용)
-        documents = self.document_loader.load_and_split_pdf(self.vector_manager.pdf_path)
+        # search_tools 모듈의 전역 변수 업데이트 (샤드를 지정하지 않은 도구 호출용)
+        import src.tools.search_tools as search_tools
+        for name, component in default_shard.tool_components.items():
+            setattr(search_tools, name, component)
+        
+        print("✅ 시스템 초기화 완료!")
+    
+    def _build_shard(self, vehicle_id: str, manual: Dict) -> ManualShard:
+        """차량 매뉴얼 샤드 생성 (문서 → 벡터 저장소 → BM25/다중 쿼리 → 압축/재순위화 → 검색 옵션)"""
+        shard = ManualShard(vehicle_id, manual)
+        shard_dirs = get_shard_dirs(vehicle_id, manual)
+        
+        # 1. 문서 로드 (청크 저장소 - 벡터/BM25 검색기 공용)
+        with profile_section("문서 로드"):
+            documents = self.document_loader.load_and_split_pdf(shard.pdf_path)
         if not documents:
-            raise Exception("문서 로딩에 실패했습니다.")
+            raise Exception(f"문서 로딩에 실패했습니다: {vehicle_id}")
+        shard.documents = documents
+        
+        # 페이지 → 청크 인덱스 (페이지 참조/인접 컨텍스트 조회용)
+        shard.page_index = PageIndex(documents)
+        
+        # 2. 벡터 저장소 초기화
+        with profile_section("벡터 저장소"):
+            shard.vector_manager = VectorStoreManager(
+                shard.pdf_path,
+                chroma_dir=shard_dirs["chroma_dir"],
+                vector_index_dir=shard_dirs["vector_index_dir"],
+                embeddings=self.embeddings
+            )
+            vector_store_instance = shard.vector_manager.initialize_vector_store(
+                documents, chunking=self.document_loader.last_chunking_config
+            )
+        if vector_store_instance is None:
+            raise Exception(f"벡터 저장소 초기화에 실패했습니다: {vehicle_id}")
+        manifest = shard.vector_manager.manifest
+        shard.index_fingerprint = manifest.fingerprint if manifest is not None else ""
         
         # 3. 하이브리드 검색기 초기화
-        self.hybrid_manager = HybridRetrieverManager(vector_store_instance, self.llm)
-        self.hybrid_manager.initialize_bm25_retriever(documents)
-        self.hybrid_manager.initialize_multi_query_retriever()
-        
-        # 전역 변수 설정
-        global bm25_retriever, multi_query_retriever
-        bm25_retriever = self.hybrid_manager.get_bm25_retriever()
-        multi_query_retriever = self.hybrid_manager.get_multi_query_retriever()
+        with profile_section("하이브리드 검색기"):
+            shard.hybrid_manager = HybridRetrieverManager(
+                vector_store_instance, self.llm, bm25_index_dir=shard_dirs["bm25_index_dir"]
+            )
+            shard.hybrid_manager.initialize_bm25_retriever(documents)
+            shard.hybrid_manager.initialize_multi_query_retriever()
         
         # 4. 압축/재순위화 검색기 초기화
-        self.compression_manager = CompressionRetrieverManager(
-            vector_store_instance, self.embeddings, self.llm
-        )
-        self.compression_manager.initialize_cross_encoder_retriever()
-        self.compression_manager.initialize_contextual_compression()
-        
-        # search_tools 모듈의 전역 변수 업데이트
-        import src.tools.search_tools as search_tools
-        search_tools.vector_store = vector_store
-        search_tools.bm25_retriever = bm25_retriever
-        search_tools.hybrid_retriever = None  # 하이브리드 검색기는 EnsembleRetriever로 동적 생성됨
-        search_tools.multi_query_retriever = multi_query_retriever
-        search_tools.cross_encoder_retriever = self.compression_manager.get_cross_encoder_retriever()
-        search_tools.compression_retriever = self.compression_manager.get_compression_retriever()
-        
-        # 5. 검색 옵션 설정
-        self._setup_search_options()
+        with profile_section("압축/재순위화 검색기"):
+            shard.compression_manager = CompressionRetrieverManager(
+                vector_store_instance, self.embeddings, self.llm
+            )
+            shard.compression_manager.initialize_cross_encoder_retriever()
+            shard.compression_manager.initialize_cascade_reranker(shard.hybrid_manager.get_bm25_retriever())
+            shard.compression_manager.initialize_contextual_compression()
+        
+        # 검색 도구가 사용할 샤드 검색기 묶음
+        shard.tool_components = {
+            "vector_store": vector_store_instance,
+            "bm25_retriever": shard.hybrid_manager.get_bm25_retriever(),
+            "hybrid_retriever": None,  # 검색 옵션 설정 시 융합 검색기로 지정됨
+            "expanded_query_retriever": None,  # 검색 옵션 설정 시 지정됨
+            "multi_query_retriever": shard.hybrid_manager.get_multi_query_retriever(),
+            "cross_encoder_retriever": shard.compression_manager.get_cross_encoder_retriever(),
+            "compression_retriever": shard.compression_manager.get_compression_retriever(),
+            "page_index": shard.page_index
+        }
         
-        # 6. SubGraph 인스턴스 초기화
-        self._initialize_subgraphs()
+        # 5. 검색 옵션 및 샤드 전용 검색 파이프라인
+        with profile_section("검색 옵션"):
+            self._setup_search_options(shard)
+            shard.search_subgraph = SearchPipelineSubGraph(
+                shard.search_options,
+                shard.rerank_compression_options,
+                tool_components=shard.tool_components
+            )
         
-        print("✅ 시스템 초기화 완료!")
+        # 6. 지연 검색기 백그라운드 워밍업 (응급 경로는 즉시 사용 가능)
+        if BACKGROUND_WARMUP:
+            shard.warmup_thread = warm_up_in_background([
+                shard.tool_components["multi_query_retriever"],
+                shard.compression_manager.get_reranker(),
+                shard.compression_manager.get_compressor()
+            ])
+        return shard
     
-    def _setup_search_options(self):
-        """검색 옵션 설정"""
-        semantic_retriever = vector_store.as_retriever(search_kwargs={"k": DEFAULT_TOP_K})
+    def _setup_search_options(self, shard: ManualShard):
+        """샤드의 검색 옵션 설정"""
+        vector_store = shard.tool_components["vector_store"]
+        bm25_retriever = shard.tool_components["bm25_retriever"]
+        multi_query_retriever = shard.tool_components["multi_query_retriever"]
+        # 1차 검색은 재순위화 후보 수만큼 가져옴 (최종 개수는 검색 파이프라인이 자름)
+        semantic_retriever = ScoredVectorRetriever(vector_store=vector_store, k=CANDIDATE_DOCS_COUNT)
+        
+        # 하이브리드 검색은 벡터/BM25를 동시에 실행하고 융합 점수를 metadata["score"]에 담음
+        def hybrid(weight_name: str) -> FusionRetriever:
+            return FusionRetriever.hybrid(
+                vector_store, bm25_retriever, WEIGHT_CONFIGS[weight_name], top_k=CANDIDATE_DOCS_COUNT
+            )
         
-        self.search_options = {
+        shard.search_options = {
             "vector_only": semantic_retriever,
-            "bm25_only": bm25_retriever,
-            "hybrid_semantic": EnsembleRetriever(
-                retrievers=[semantic_retriever, bm25_retriever],
-                weights=[WEIGHT_CONFIGS["hybrid_semantic"], 1 - WEIGHT_CONFIGS["hybrid_semantic"]]
-            ),
-            "hybrid_balanced": EnsembleRetriever(
-                retrievers=[semantic_retriever, bm25_retriever],
-                weights=[WEIGHT_CONFIGS["hybrid_balanced"], 1 - WEIGHT_CONFIGS["hybrid_balanced"]]
-            ),
-            "hybrid_keyword": EnsembleRetriever(
-                retrievers=[semantic_retriever, bm25_retriever],
-                weights=[WEIGHT_CONFIGS["hybrid_keyword"], 1 - WEIGHT_CONFIGS["hybrid_keyword"]]
-            ),
+            "bm25_only": bm25_retriever.copy(update={"k": CANDIDATE_DOCS_COUNT}),
+            "hybrid_semantic": hybrid("hybrid_semantic"),
+            "hybrid_balanced": hybrid("hybrid_balanced"),
+            "hybrid_keyword": hybrid("hybrid_keyword"),
             "multi_query": multi_query_retriever,
-            "expanded_query": EnsembleRetriever(
-                retrievers=[semantic_retriever, bm25_retriever],
-                weights=[WEIGHT_CONFIGS["hybrid_semantic"], 1 - WEIGHT_CONFIGS["hybrid_semantic"]]
+            # 확장 용어는 BM25 가중 질의 용어와 질의 벡터 평균으로 반영 (문자열 연결 없이 검색 1회)
+            "expanded_query": build_expanded_retriever(
+                vector_store, bm25_retriever, WEIGHT_CONFIGS["hybrid_semantic"], top_k=CANDIDATE_DOCS_COUNT
             )
         }
         
-        # 재순위화 및 압축 옵션
-        cross_encoder_ret = self.compression_manager.get_cross_encoder_retriever()
-        compression_ret = self.compression_manager.get_compression_retriever()
-        
-        self.rerank_compression_options = {
-            "rerank_only": cross_encoder_ret,
-            "compress_only": compression_ret,
-            "rerank_compress_general": cross_encoder_ret,
-            "rerank_compress_specific": compression_ret,
-            "rerank_compress_troubleshooting": cross_encoder_ret
+        # 검색 도구(hybrid_search/expanded_query_search)의 기본 검색기
+        shard.tool_components["hybrid_retriever"] = shard.search_options["hybrid_balanced"]
+        shard.tool_components["expanded_query_retriever"] = shard.search_options["expanded_query"]
+        
+        # 재순위화 및 압축 단계 (1차 검색 후보를 이어받아 처리, 추가 검색 없음)
+        # 재순위화는 캐스케이드(저비용 점수로 가지치기 → 애매한 구간만 Cross-Encoder)
+        rerank = ("rerank", shard.compression_manager.get_cascade_reranker())
+        compress = ("compress", shard.compression_manager.get_compressor())
+        
+        # 구체적 질문은 재순위화로 후보를 줄인 뒤 압축 (압축 LLM 호출을 상위 후보로 한정)
+        shard.rerank_compression_options = {
+            "rerank_only": [rerank],
+            "compress_only": [compress],
+            "rerank_compress_general": [rerank],
+            "rerank_compress_specific": [rerank, compress],
+            "rerank_compress_troubleshooting": [rerank]
+        }
+    
+    def get_shard(self, vehicle_id: str = None) -> ManualShard:
+        """차량 ID의 매뉴얼 샤드 반환 (필요 시 로드)"""
+        return self.shard_manager.get(vehicle_id or self.default_vehicle_id)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """답변/LLM 응답/질의 임베딩 캐시 적중 통계"""
+        llm_cache = get_llm_cache()
+        return {
+            "answer_cache": self.answer_cache.stats() if self.answer_cache else None,
+            "llm_cache": llm_cache.stats() if llm_cache else None,
+            "embedding_cache": self.embeddings.cache.stats()
         }
     
     def _initialize_subgraphs(self):
@@ -158,12 +238,6 @@ class VehicleManualAgent:
         # Emergency Detection SubGraph
         self.emergency_subgraph = EmergencyDetectionSubGraph()
         
-        # Search Pipeline SubGraph
-        self.search_subgraph = SearchPipelineSubGraph(
-            self.search_options, 
-            self.rerank_compression_options
-        )
-        
         # Answer Generation SubGraph
         self.answer_subgraph = AnswerGenerationSubGraph()
         
@@ -226,8 +300,9 @@ class VehicleManualAgent:
                     "compression_method": state.get("compression_method", "rerank_compress_troubleshooting")
                 }
             
-            # Search Pipeline SubGraph 실행
-            search_result = self.search_subgraph.invoke(
+            # 차량 샤드의 Search Pipeline SubGraph 실행
+            shard = self.get_shard(state.get("vehicle_id"))
+            search_result = shard.search_subgraph.invoke(
                 query, 
                 is_emergency=is_emergency, 
                 emergency_data=emergency_data
@@ -424,17 +499,12 @@ class VehicleManualAgent:
         
         try:
             # 응급 상황에서는 가장 빠른 BM25 키워드 검색만 사용
-            retriever = self.search_options["bm25_only"]
+            retriever = self.get_shard(state.get("vehicle_id")).search_options["bm25_only"]
             docs = retriever.invoke(query)
             
             # 최대 3개 문서만 사용 (속도 우선)
             search_results = [
-                {
-                    "content": doc.page_content,
-                    "page": doc.metadata.get("page", 0),
-                    "source": doc.metadata.get("source", ""),
-                    "score": 1.0  # 응급 상황에서는 점수 계산 생략
-                }
+                document_to_result(doc, doc.metadata.get("score", 1.0))  # BM25 점수
                 for doc in docs[:3]  # 3개로 제한
             ]
             
@@ -560,16 +630,80 @@ class VehicleManualAgent:
                 "evaluation_details": None
             }
     
+    def _lookup_cached_answer(self, query: str, shard: ManualShard):
+        """답변 캐시 조회 → (캐시 답변 또는 None, 질의 벡터)
+
+        LLM 응급 감지 전에 호출되므로 로컬 판단만으로 우회한다: 키워드 감지 수준이 NORMAL보다
+        높거나 고장/증상 단서(TROUBLESHOOTING_PATTERN)가 있는 질의는 조회하지 않는다.
+        우회하면 질의 벡터도 None이어서 답변이 저장되지 않는다.
+        """
+        if self.answer_cache is None:
+            return None, None
+        try:
+            keyword_level = self.keyword_emergency_detector.detect_emergency(query)["priority_level"]
+            if emergency_severity(keyword_level) > emergency_severity("NORMAL"):
+                self.answer_cache.record_bypass()
+                print(f"🚨 응급 단서 ({keyword_level}) - 답변 캐시 우회")
+                return None, None
+            if self.answer_cache.is_troubleshooting(query):
+                self.answer_cache.record_bypass()
+                print("🔧 고장/증상 질의 - 답변 캐시 우회")
+                return None, None
+            
+            query_vector = self.embeddings.embed_query(query)
+            hit = self.answer_cache.lookup(shard.vehicle_id, shard.index_fingerprint, query, query_vector,
+                                           emergency_level=keyword_level)
+            if hit is not None:
+                cached, similarity = hit
+                print(f"⚡ 답변 캐시 적중 (유사도 {similarity:.3f}): '{cached.query}'")
+                return cached, query_vector
+            return None, query_vector
+        except Exception as e:
+            print(f"⚠️ 답변 캐시 조회 오류: {str(e)}")
+            return None, None
+    
+    def _store_cached_answer(self, query: str, query_vector, shard: ManualShard, result: Dict[str, Any],
+                             emergency_level: str):
+        """검색 근거(참고 페이지)가 있는 일반 답변만 캐시 (주행 중 압축 답변, 응급 답변 제외)
+
+        emergency_level은 LLM 감지 결과이며, 그래프 안의 응급 감지 결과가 더 높으면 그 수준을 쓴다.
+        """
+        if self.answer_cache is None or query_vector is None:
+            return
+        final_answer = result.get("final_answer")
+        if not final_answer or not result.get("page_references") or result.get("compression_needed"):
+            return
+        emergency_level = max(emergency_level, result.get("emergency_level") or "NORMAL", key=emergency_severity)
+        try:
+            self.answer_cache.store(
+                shard.vehicle_id, shard.index_fingerprint, query, query_vector,
+                final_answer, result["page_references"], emergency_level=emergency_level
+            )
+        except Exception as e:
+            print(f"⚠️ 답변 캐시 저장 오류: {str(e)}")
+    
     def query(self, user_query: str = None, audio_data: bytes = None, 
-              audio_file_path: str = None, callbacks=None) -> str:
-        """사용자 쿼리 처리 - 응급 상황 감지 후 적절한 워크플로우 선택"""
+              audio_file_path: str = None, callbacks=None, vehicle_id: str = None) -> str:
+        """사용자 쿼리 처리 - 차량 샤드 선택, 응급 상황 감지 후 적절한 워크플로우 선택"""
         try:
-            # 1. 먼저 빠른 응급 상황 감지 (텍스트 쿼리가 있는 경우만)
+            # 0. 차량 매뉴얼 샤드 확인 (로드되지 않았으면 로드)
+            vehicle_id = vehicle_id or self.default_vehicle_id
+            shard = self.get_shard(vehicle_id)
+            query_vector = None
+            emergency_level = "NORMAL"
+            
+            # 1. 텍스트 쿼리는 로컬 게이트를 통과하면 LLM 호출 없이 답변 캐시부터 조회
             if user_query and user_query.strip():
-                # LLM 기반 응급 상황 감지 사용
+                cached, query_vector = self._lookup_cached_answer(user_query, shard)
+                if cached is not None:
+                    return cached.answer
+                
+                # 2. 캐시 미스일 때만 LLM 기반 응급 상황 감지
                 from ..utils.llm_emergency_detector import LLMEmergencyDetector
                 llm_emergency_detector = LLMEmergencyDetector()
                 emergency_result = llm_emergency_detector.detect_emergency(user_query)
+                if emergency_result["is_emergency"]:
+                    emergency_level = emergency_result["priority_level"]
                 
                 # CRITICAL 또는 HIGH 응급 상황이면 빠른 경로 사용
                 if emergency_result["is_emergency"] and emergency_result["priority_level"] in ["CRITICAL", "HIGH"]:
@@ -590,6 +724,7 @@ class VehicleManualAgent:
             initial_state = {
                 "messages": [],
                 "query": user_query or "",  # 텍스트 쿼리 (음성 인식 시 덮어씌워짐)
+                "vehicle_id": vehicle_id,
                 "search_results": [],
                 "context": "",
                 "final_answer": "",
@@ -635,9 +770,12 @@ class VehicleManualAgent:
             if callbacks:
                 config["callbacks"] = callbacks
             
-            # 그래프 실행
-            result = graph.invoke(initial_state, config=config)
+            # 그래프 실행 (요청 안의 모든 검색기가 질의 임베딩 공유)
+            with embedding_request_scope():
+                result = graph.invoke(initial_state, config=config)
             
+            # LLM이 확인한 응급 수준이 캐시 대상(NORMAL/LOW)인 답변만 저장
+            self._store_cached_answer(user_query, query_vector, shard, result, emergency_level)
             return result.get("final_answer", "답변을 생성할 수 없습니다.")
             
         except Exception as e:
@@ -13,17 +13,55 @@ load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 CHROMA_DB_DIR = PROJECT_ROOT / "chroma_db"
+CHUNK_STORE_DIR = PROJECT_ROOT / "chunk_store"
+BM25_INDEX_DIR = PROJECT_ROOT / "bm25_index"
+VECTOR_INDEX_DIR = PROJECT_ROOT / "vector_index"
+SHARD_DIR = PROJECT_ROOT / "shards"
 
 # PDF 파일 경로
 DEFAULT_PDF_PATH = DATA_DIR / "backup" / "kr_ko-KR_xc60_2026.pdf"
 
+# 차량 매뉴얼 카탈로그 (차량 ID → 매뉴얼 정보)
+# 차량별 인덱스(Chroma/BM25/벡터 행렬)는 index_root 아래에 저장 (없으면 SHARD_DIR/차량 ID)
+VEHICLE_MANUALS = {
+    "xc60_2026": {
+        "name": "볼보 XC60 2026",
+        "pdf_path": DEFAULT_PDF_PATH,
+        "index_root": PROJECT_ROOT  # 기존 단일 매뉴얼 인덱스 경로 유지
+    },
+}
+DEFAULT_VEHICLE_ID = "xc60_2026"
+
+# 매뉴얼 샤드 메모리 예산 (초과 시 가장 오래 사용하지 않은 샤드부터 해제)
+SHARD_MEMORY_BUDGET_MB = 2048
+
 # 모델 설정
 DEFAULT_LLM_MODEL = "gpt-4o-mini"
 DEFAULT_LLM_TEMPERATURE = 0
 DEFAULT_EMBEDDING_MODEL = "text-embedding-3-small"
 
+# LLM 응답 캐시 (temperature=0 호출은 같은 프롬프트면 같은 응답이므로 SQLite에 저장해 재사용)
+# 환경 변수 LLM_CACHE_ENABLED(true/false), LLM_CACHE_PATH로 변경 (기본 경로는 소스 트리 밖 사용자 캐시 디렉터리)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").strip().lower() not in ("0", "false", "no", "off")
+LLM_CACHE_PATH = Path(
+    os.getenv("LLM_CACHE_PATH") or Path.home() / ".cache" / "vehicle_manual_rag" / "llm_cache.sqlite3"
+).expanduser()
+LLM_CACHE_MAX_ENTRIES = 20000  # 초과 시 오래된 항목부터 삭제
+LLM_CACHE_TTL = 30 * 86400  # 초 (None이면 만료 없음, 모델 업데이트 후 오래된 응답 재사용 방지)
+
 # Cross-Encoder 모델
 CROSS_ENCODER_MODEL = "BAAI/bge-reranker-v2-m3"
+RERANKER_BACKEND = "torch"  # "torch", "int8"(동적 int8 양자화), "onnx"(ONNX Runtime CPU 추론)
+RERANKER_MODEL_PATH = None  # 내보낸 ONNX/양자화 모델 경로 (None이면 CROSS_ENCODER_MODEL)
+RERANKER_BATCH_SIZE = 16  # 길이순 정렬 후 한 번에 추론할 (질의, 문서) 쌍 수
+RERANKER_MAX_TOKENS = 384  # (질의 + 문서) 토큰 예산, 초과한 문서 뒷부분은 잘라냄
+RERANK_CACHE_SIZE = 8192  # (질의 해시, 청크 ID) → 점수 LRU 항목 수
+RERANK_CACHE_TTL = 3600  # 초 (None이면 만료 없음)
+
+# 캐스케이드 재순위화 (저비용 점수로 후보를 줄이고 애매한 상위 구간만 Cross-Encoder로 재채점)
+CASCADE_BAND_SIZE = 6  # Cross-Encoder로 재채점할 상위 후보 수
+CASCADE_DECISIVE_MARGIN = 0.1  # 질의 코사인 1, 2위 차이가 이 이상이고 BM25 1위와 같으면 Cross-Encoder 생략
+CASCADE_SEMANTIC_WEIGHT = 0.6  # 저비용 점수 중 임베딩 코사인 가중치 (나머지는 BM25)
 
 # 검색 설정
 DEFAULT_TOP_K = 5
@@ -32,6 +70,50 @@ CHUNK_SIZE = 300
 CHUNK_OVERLAP = 30
 BATCH_SIZE = 50
 
+# 청킹 설정
+CHUNKING_STRATEGY = "structure"  # "structure": 제목/목록/표/경고 상자 기반, "recursive": 고정 길이 문자 분할
+CHUNK_TARGET_TOKENS = 400  # 구조 청크 목표 토큰 수 (같은 섹션 블록을 이 크기까지 묶음)
+CHUNK_MAX_TOKENS = 800  # 단일 블록(표/경고 상자 등)이 이보다 크면 줄 단위로 분할
+HEADING_FONT_RATIO = 1.15  # 본문 글꼴 대비 이 비율 이상이면 제목으로 판단
+
+PAGE_CONTEXT_WINDOW = 1  # 페이지 컨텍스트 검색 시 포함할 앞뒤 페이지 수
+
+# 벡터 검색 백엔드 ("numpy": Chroma 임베딩을 내보낸 메모리 매핑 행렬로 검색, "chroma": Chroma 직접 검색)
+VECTOR_BACKEND = "numpy"
+VECTOR_INDEX_DTYPE = "float32"  # "float16"이면 디스크/메모리 절반 (검색 시 블록 단위 float32 변환으로 느려짐)
+VECTOR_INDEX_TYPE = "flat"  # "flat": 정확 검색, "ivf": 역색인 근사 검색 (매뉴얼이 많아 벡터가 수십만 개 이상일 때)
+IVF_NLIST = 0  # 역색인 리스트 수 (0이면 약 4√N 자동)
+IVF_NPROBE = 8  # 질의당 스캔할 리스트 수 (클수록 재현율↑ 지연↑, 리스트 수와 같으면 정확 검색)
+IVF_TRAIN_ITERATIONS = 10  # k-means 학습 반복 횟수
+
+# 인덱스 빌드 임베딩 설정
+EMBEDDING_MAX_WORKERS = 4  # 동시 임베딩 배치 수
+EMBEDDING_TOKENS_PER_MINUTE = 1_000_000  # 분당 토큰 예산 (OpenAI TPM 한도 이하로 설정)
+EMBEDDING_MAX_RETRIES = 5  # 배치당 최대 재시도 횟수
+EMBEDDING_RETRY_BASE_DELAY = 1.0  # 지수 백오프 기본 대기 시간 (초)
+
+# 질의 임베딩 캐시 (같은 질의는 요청당 한 번, 반복 질의는 캐시에서)
+EMBEDDING_CACHE_SIZE = 2048  # 프로세스 전역 LRU 항목 수
+EMBEDDING_CACHE_TTL = 3600  # 초 (None이면 만료 없음)
+
+# 다중 쿼리 검색 설정
+MULTI_QUERY_COUNT = 3  # LLM이 생성할 재작성 질의 수
+MULTI_QUERY_K = 3  # 원본/재작성 질의별 검색 문서 수
+
+# 의미 기반 답변 캐시 (비슷한 질의는 그래프 실행 없이 캐시된 최종 답변 반환)
+ANSWER_CACHE_ENABLED = True
+ANSWER_CACHE_SIMILARITY_THRESHOLD = 0.95  # 질의 임베딩 코사인 유사도 하한 (ada-002는 다른 질문도 0.9 이상이 흔함)
+ANSWER_CACHE_SIZE = 512  # 차량 매뉴얼별 최대 항목 수
+ANSWER_CACHE_TTL = 86400  # 초 (None이면 만료 없음)
+ANSWER_CACHE_LEVELS = ["NORMAL", "LOW"]  # 캐시를 조회/저장하는 응급 수준 (그 외 수준은 항상 우회)
+# 적중 시 일치를 요구하지 않는 용어 그룹 - 부품 그룹만 비교 (차량은 네임스페이스로 구분, 동작/증상 그룹은
+# "갈아요"처럼 사전에 없는 표현이 많아 제외하고 증상 여부는 TROUBLESHOOTING_PATTERN으로 따로 비교)
+ANSWER_CACHE_IGNORED_TERM_GROUPS = ["XC60", "교체", "문제"]
+
+# 지연 초기화 설정
+LAZY_RETRIEVER_INIT = True  # Cross-Encoder/맥락 압축/MultiQuery 검색기를 첫 사용 시 생성
+BACKGROUND_WARMUP = True  # 초기화 완료 후 지연 검색기를 백그라운드에서 미리 생성
+
 # 압축 설정
 SIMILARITY_THRESHOLD = 0.6  # 임베딩 필터링 임계값
 REDUNDANCY_THRESHOLD = 0.9  # 중복 제거 임계값
@@ -56,6 +138,14 @@ WEIGHT_CONFIGS = {
     "hybrid_keyword": 0.3      # 키워드 검색 우선
 }
 
+# 하이브리드 결과 융합 설정
+FUSION_METHOD = "rrf"  # "rrf"(가중 Reciprocal Rank Fusion) 또는 "score"(정규화 점수 가중 평균)
+RRF_K = 60  # RRF 순위 완화 상수
+
+# 전문 용어 확장 설정
+EXPANSION_TERM_WEIGHT = 0.3  # 확장 동의어의 BM25 질의 용어 가중치 (원본 용어는 1.0)
+EXPANSION_VECTOR_WEIGHT = 0.3  # 질의 벡터에 섞는 용어 그룹 평균 벡터 비율
+
 # 차량 전문 용어 매핑
 VEHICLE_TERMS = {
     '타이어': ['타이어', '타이어 압력', '공기압', '압력', 'PSI', 'bar', '휠', '바퀴'],
@@ -72,6 +162,35 @@ VEHICLE_TERMS = {
     '사륜구동': ['사륜구동', '4WD', 'AWD', '전륜구동', '후륜구동', '구동방식']
 }
 
+# 질의 라우터 (규칙 + 문자 n-gram 로지스틱 회귀, 신뢰도가 낮을 때만 LLM 쿼리 분석)
+QUERY_ROUTER_MODEL_PATH = Path(__file__).parent / "query_router_model.json"
+QUERY_ROUTER_EXAMPLES_PATH = Path(__file__).parent / "query_router_examples.json"
+QUERY_ROUTER_CONFIDENCE_THRESHOLD = 0.6  # 이보다 낮은 항목만 LLM 분석 결과 사용
+QUERY_ROUTER_RULE_CONFIDENCE = 0.95  # 규칙으로 정한 항목의 신뢰도
+
+# (정규식, 검색 전략, 검색 방법) - 항목별로 처음 일치한 규칙 적용, None이면 해당 항목은 정하지 않음
+# "이상"은 이상 증상 표현만 ("이상해요", "이상한", "이상이 있어요", "이상 증상"), 수량 뒤 "20km 이상"은 제외
+ABNORMALITY_PATTERN = r"(?<![0-9가-힣\s])이상|이상(?:하|한|해|했|\s?(?:증상|현상|징후|음)|[이을]\s?(?:있|생|발생|감지))"
+# 고장/증상 질의 단서 (troubleshooting 라우팅, 답변 캐시 증상 구분)
+TROUBLESHOOTING_PATTERN = rf"문제|고장|{ABNORMALITY_PATTERN}|오류|경고등|깜빡|안\s?(?:돼|되|켜|걸려)|소음|소리가|냄새|떨림|진동|누유|멈췄|꺼졌"
+QUERY_ROUTING_RULES = [
+    (rf"교체|문제|고장|{ABNORMALITY_PATTERN}", None, "expanded_query"),
+    (r"(?s)^(?=.{21}).*\?", None, "multi_query"),  # 20자 넘는 질문
+    (TROUBLESHOOTING_PATTERN, "troubleshooting", None),
+    (r"몇|얼마|용량|규격|사양|수치|크기|무게|psi|bar|km|리터", "specific", None),
+]
+
+# 검색 전략별 기본 검색 방법 (규칙이 검색 방법을 정하지 않은 경우)
+STRATEGY_SEARCH_METHODS = {
+    "general": "hybrid_semantic",
+    "specific": "hybrid_balanced",
+    "troubleshooting": "hybrid_keyword"
+}
+
+# Kiwi 토크나이저 설정
+KIWI_NUM_WORKERS = os.cpu_count() or 1  # 코퍼스 배치 분석 스레드 수
+QUERY_TOKEN_CACHE_SIZE = 4096  # 질의 토큰 LRU 캐시 크기
+
 # Kiwi 토크나이저 사용자 정의 단어
 CUSTOM_WORDS = [
     ('볼보', 'NNP'),
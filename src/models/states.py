@@ -73,6 +73,7 @@ class MainAgentState(TypedDict):
     """메인 에이전트 상태 (SubGraph 통합용)"""
     messages: List[BaseMessage]
     query: str
+    vehicle_id: str  # 검색할 차량 매뉴얼 샤드
     search_results: List[Dict[str, Any]]
     context: str
     final_answer: str
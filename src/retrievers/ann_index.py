@@ -0,0 +1,135 @@
+"""
+근사 최근접 이웃(ANN) 인덱스 - 구면 k-means 역색인(IVF) 기반 벡터 검색
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from ..config.settings import IVF_NLIST, IVF_NPROBE, IVF_TRAIN_ITERATIONS
+from .numpy_vector_store import FlatVectorIndex, normalize_rows, top_k_rows
+
+# k-means 학습에 사용할 리스트당 최대 표본 수
+TRAIN_SAMPLES_PER_LIST = 64
+
+# 벡터 할당 시 한 번에 처리할 행 수
+ASSIGN_BLOCK_ROWS = 16384
+
+
+def auto_nlist(num_vectors: int) -> int:
+    """벡터 수에 맞는 역색인 리스트 수 (약 4√N, 리스트당 최소 39개)"""
+    if num_vectors <= 0:
+        return 1
+    return max(1, min(int(4 * math.sqrt(num_vectors)), num_vectors // 39 or 1))
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """각 벡터를 내적이 가장 큰 중심에 할당"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = np.asarray(vectors[start:start + ASSIGN_BLOCK_ROWS], dtype=np.float32)
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = IVF_TRAIN_ITERATIONS,
+                    seed: int = 0) -> np.ndarray:
+    """정규화된 벡터 표본으로 구면 k-means 중심 학습"""
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), nlist * TRAIN_SAMPLES_PER_LIST)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    sample = np.asarray(sample, dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=nlist)
+        # 빈 리스트는 임의 표본으로 재시작
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+class IVFVectorIndex(FlatVectorIndex):
+    """역색인 근사 검색 인덱스
+
+    벡터를 리스트(중심)별로 재배열해 저장하고, 질의와 가까운 nprobe개 리스트만
+    스캔한다. nprobe를 키우면 재현율이 오르고 지연 시간이 늘어난다
+    (nprobe = 리스트 수이면 정확 검색과 동일). ids도 재배열된 행 순서를 따른다.
+    """
+
+    kind = "ivf"
+    array_names = ("vectors", "centroids", "list_offsets")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], ids: List[str], meta: Dict,
+                 nprobe: int = IVF_NPROBE):
+        super().__init__(arrays, ids, meta)
+        self.nprobe = nprobe
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls, ids: List[str], embeddings: np.ndarray, index_version: str,
+              dtype: str = "float32", nlist: int = IVF_NLIST,
+              iterations: int = IVF_TRAIN_ITERATIONS) -> "IVFVectorIndex":
+        """중심 학습 후 벡터를 리스트 순서로 재배열하여 인덱스 생성 (nlist=0이면 자동)"""
+        vectors = normalize_rows(embeddings)
+        num_lists = min(nlist or auto_nlist(len(ids)), max(len(ids), 1))
+        if len(ids):
+            centroids = train_centroids(vectors, num_lists, iterations)
+            labels = _assign(vectors, centroids)
+        else:
+            centroids = np.zeros((1, vectors.shape[1] if vectors.ndim == 2 else 0), dtype=np.float32)
+            labels = np.zeros(0, dtype=np.int64)
+
+        order = np.argsort(labels, kind="stable")
+        counts = np.bincount(labels, minlength=len(centroids))
+        list_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+        vectors = vectors[order].astype(dtype)
+        meta = cls._make_meta(ids, vectors, index_version, dtype,
+                              {"nlist": nlist, "iterations": iterations})
+        meta["num_lists"] = len(centroids)
+        return cls(
+            {"vectors": vectors, "centroids": centroids.astype(np.float32), "list_offsets": list_offsets},
+            [ids[i] for i in order], meta
+        )
+
+    def _probe_rows(self, centroid_scores: np.ndarray, nprobe: int) -> np.ndarray:
+        """중심 점수 상위 nprobe개 리스트에 속한 행 위치"""
+        nprobe = min(nprobe, self.nlist)
+        lists = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        return np.concatenate([
+            np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in lists
+        ])
+
+    def search(self, query_vectors: np.ndarray, k: int, mask: Optional[np.ndarray] = None,
+               nprobe: Optional[int] = None) -> List[List[Tuple[int, float]]]:
+        """질의별로 가까운 nprobe개 리스트만 스캔하여 상위 k개 (행 위치, 점수)
+
+        mask로 걸러낸 뒤 후보가 k개보다 적으면 전체 리스트를 스캔한다.
+        """
+        queries = normalize_rows(np.atleast_2d(query_vectors))
+        if self.num_vectors == 0:
+            return [[] for _ in range(len(queries))]
+        nprobe = nprobe or self.nprobe
+        if mask is not None:
+            k = min(k, int(mask.sum()))
+
+        results = []
+        for query, centroid_scores in zip(queries, queries @ self.centroids.T):
+            rows = self._probe_rows(centroid_scores, nprobe)
+            if mask is not None:
+                rows = rows[mask[rows]]
+            if len(rows) < k:
+                rows = np.flatnonzero(mask) if mask is not None else np.arange(self.num_vectors)
+            scores = self._score_rows(query[None, :], rows)
+            hits = top_k_rows(scores, k)[0]
+            results.append([(int(rows[position]), score) for position, score in hits])
+        return results
@@ -0,0 +1,208 @@
+"""
+BM25 역색인 - 토큰화 코퍼스와 용어 통계의 배열 기반 직렬화
+"""
+
+import os
+import json
+import heapq
+import shutil
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+
+from ..utils.chunk_ids import compute_chunk_hash
+
+# 저장 포맷이 바뀌면 증가시켜 기존 인덱스를 무효화
+BM25_INDEX_VERSION = 1
+
+# BM25 파라미터 (rank_bm25 BM25Okapi 기본값과 동일)
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 메모리 매핑으로 로드하는 배열 파일들
+_ARRAY_NAMES = (
+    "term_offsets", "postings_docs", "postings_tfs",
+    "doc_freqs", "doc_lengths", "token_offsets", "token_ids"
+)
+
+
+def compute_corpus_version(documents: List[Document]) -> str:
+    """청크 집합 버전 (순서 포함 콘텐츠 해시)"""
+    digest = hashlib.sha256()
+    for doc in documents:
+        digest.update(compute_chunk_hash(doc).encode("ascii"))
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """CSR 형태의 포스팅 배열과 문서 길이/빈도 통계를 가진 BM25 역색인
+
+    - term_offsets[t]:term_offsets[t+1] 구간이 용어 t의 포스팅
+    - postings_docs / postings_tfs: 포스팅별 문서 번호와 용어 빈도
+    - token_offsets / token_ids: 문서별 토큰 ID 시퀀스 (토큰화 코퍼스)
+    """
+
+    def __init__(self, terms: List[str], arrays: Dict[str, np.ndarray], meta: Dict):
+        self.terms = terms
+        self.vocab = {term: i for i, term in enumerate(terms)}
+        self.meta = meta
+        for name in _ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+        self._prepare_scoring()
+
+    def _prepare_scoring(self, k1: float = BM25_K1, b: float = BM25_B):
+        """질의 시 재사용할 IDF와 문서 길이 정규화 값 미리 계산"""
+        n = float(self.num_docs)
+        df = np.asarray(self.doc_freqs, dtype=np.float32)
+        self.k1 = k1
+        self.idf = np.log1p((n - df + 0.5) / (df + 0.5)).astype(np.float32)
+        avgdl = self.avgdl or 1.0
+        self.length_norms = (
+            k1 * (1.0 - b + b * np.asarray(self.doc_lengths, dtype=np.float32) / avgdl)
+        ).astype(np.float32)
+
+    @property
+    def num_docs(self) -> int:
+        return int(self.meta["num_docs"])
+
+    @property
+    def avgdl(self) -> float:
+        return float(self.meta["avgdl"])
+
+    @classmethod
+    def build(cls, tokenized_docs: List[List[str]], corpus_version: str,
+              tokenizer_name: str) -> "BM25Index":
+        """토큰화된 문서들로 역색인 생성"""
+        vocab: Dict[str, int] = {}
+        token_ids = []
+        token_offsets = [0]
+        posting_terms, posting_docs, posting_tfs = [], [], []
+
+        for doc_id, tokens in enumerate(tokenized_docs):
+            ids = [vocab.setdefault(token, len(vocab)) for token in tokens]
+            token_ids.extend(ids)
+            token_offsets.append(len(token_ids))
+            for term_id, tf in Counter(ids).items():
+                posting_terms.append(term_id)
+                posting_docs.append(doc_id)
+                posting_tfs.append(tf)
+
+        posting_terms = np.asarray(posting_terms, dtype=np.int32)
+        posting_docs = np.asarray(posting_docs, dtype=np.int32)
+        posting_tfs = np.asarray(posting_tfs, dtype=np.int32)
+
+        # 용어 번호 → 문서 번호 순으로 정렬하여 CSR 구성
+        order = np.lexsort((posting_docs, posting_terms))
+        posting_terms = posting_terms[order]
+        doc_freqs = np.bincount(posting_terms, minlength=len(vocab)).astype(np.int32)
+        term_offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(doc_freqs, out=term_offsets[1:])
+
+        token_offsets = np.asarray(token_offsets, dtype=np.int64)
+        doc_lengths = np.diff(token_offsets).astype(np.int32)
+
+        arrays = {
+            "term_offsets": term_offsets,
+            "postings_docs": posting_docs[order],
+            "postings_tfs": posting_tfs[order],
+            "doc_freqs": doc_freqs,
+            "doc_lengths": doc_lengths,
+            "token_offsets": token_offsets,
+            "token_ids": np.asarray(token_ids, dtype=np.int32),
+        }
+        meta = {
+            "version": BM25_INDEX_VERSION,
+            "corpus_version": corpus_version,
+            "tokenizer": tokenizer_name,
+            "num_docs": len(tokenized_docs),
+            "avgdl": float(doc_lengths.mean()) if len(doc_lengths) else 0.0,
+        }
+        terms = [None] * len(vocab)
+        for term, term_id in vocab.items():
+            terms[term_id] = term
+        return cls(terms, arrays, meta)
+
+    def save(self, index_dir: str):
+        """인덱스를 디렉터리에 저장 (임시 디렉터리 작성 후 교체)"""
+        index_dir = Path(index_dir)
+        tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        for name in _ARRAY_NAMES:
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with open(tmp_dir / "terms.json", "w", encoding="utf-8") as f:
+            json.dump(self.terms, f, ensure_ascii=False)
+        # meta.json은 마지막에 기록 (완전한 인덱스의 표식)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+
+        if index_dir.exists():
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    @classmethod
+    def load(cls, index_dir: str, corpus_version: str, tokenizer_name: str,
+             mmap: bool = True) -> Optional["BM25Index"]:
+        """저장된 인덱스 로드 (청크 집합/토크나이저가 다르면 None)"""
+        index_dir = Path(index_dir)
+        meta_path = index_dir / "meta.json"
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (meta.get("version") != BM25_INDEX_VERSION
+                    or meta.get("corpus_version") != corpus_version
+                    or meta.get("tokenizer") != tokenizer_name):
+                return None
+
+            mmap_mode = "r" if mmap else None
+            arrays = {
+                name: np.load(index_dir / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in _ARRAY_NAMES
+            }
+            with open(index_dir / "terms.json", "r", encoding="utf-8") as f:
+                terms = json.load(f)
+            return cls(terms, arrays, meta)
+
+        except Exception as e:
+            print(f"⚠️ BM25 인덱스 로드 오류: {str(e)}")
+            return None
+
+    def score_terms(self, term_weights: Dict[str, float]) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 용어의 포스팅만 순회하여 (문서 번호, BM25 점수) 계산"""
+        doc_parts, score_parts = [], []
+        for term, weight in term_weights.items():
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = np.asarray(self.postings_docs[start:end])
+            tfs = np.asarray(self.postings_tfs[start:end], dtype=np.float32)
+            contrib = (weight * self.idf[term_id]) * tfs * (self.k1 + 1.0) / (tfs + self.length_norms[docs])
+            doc_parts.append(docs)
+            score_parts.append(contrib)
+
+        if not doc_parts:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+        # 여러 용어에 걸친 같은 문서의 점수 합산
+        all_docs = np.concatenate(doc_parts)
+        doc_ids, inverse = np.unique(all_docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(score_parts)).astype(np.float32)
+        return doc_ids, scores
+
+    def search(self, query_tokens: List[str], k: int = 5) -> List[Tuple[int, float]]:
+        """질의 토큰으로 상위 k개 (문서 번호, 점수) 반환"""
+        return self.search_weighted(Counter(query_tokens), k)
+
+    def search_weighted(self, term_weights: Dict[str, float], k: int = 5) -> List[Tuple[int, float]]:
+        """용어별 가중치가 있는 질의로 상위 k개 (문서 번호, 점수) 반환"""
+        doc_ids, scores = self.score_terms(term_weights)
+        top = heapq.nlargest(k, zip(scores.tolist(), doc_ids.tolist()))
+        return [(doc_id, score) for score, doc_id in top]
@@ -0,0 +1,69 @@
+"""
+역색인 기반 BM25 리트리버 (실제 BM25 점수 반환)
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..utils.chunk_ids import get_chunk_id
+from .bm25_index import BM25Index
+
+
+class InvertedIndexBM25Retriever(BaseRetriever):
+    """BM25Index의 질의 용어 포스팅만 점수화하는 BM25 리트리버
+
+    반환 문서의 metadata["score"]에 BM25 점수를 담는다.
+    """
+
+    index: Any
+    docs: List[Document]
+    preprocess_func: Callable[[str], List[str]]
+    k: int = 5
+    chunk_positions: Dict[str, int] = {}
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def from_index(cls, index: BM25Index, docs: List[Document],
+                   preprocess_func: Callable[[str], List[str]], k: int = 5) -> "InvertedIndexBM25Retriever":
+        """역색인과 원본 문서로 리트리버 생성"""
+        if index.num_docs != len(docs):
+            raise ValueError(f"BM25 인덱스 문서 수({index.num_docs})와 문서 수({len(docs)})가 다릅니다.")
+        chunk_positions = {get_chunk_id(doc): doc_id for doc_id, doc in enumerate(docs) if get_chunk_id(doc)}
+        return cls(index=index, docs=docs, preprocess_func=preprocess_func, k=k,
+                   chunk_positions=chunk_positions)
+
+    def _scored_documents(self, hits: List[Tuple[int, float]]) -> List[Tuple[Document, float]]:
+        return [
+            (Document(page_content=self.docs[doc_id].page_content,
+                      metadata={**self.docs[doc_id].metadata, "score": score}), score)
+            for doc_id, score in hits
+        ]
+
+    def search_with_scores(self, query: str, k: int = None) -> List[Tuple[Document, float]]:
+        """(문서, BM25 점수) 목록 반환"""
+        hits = self.index.search(self.preprocess_func(query), k or self.k)
+        return self._scored_documents(hits)
+
+    def search_weighted_with_scores(self, term_weights: Dict[str, float], k: int = None) -> List[Tuple[Document, float]]:
+        """용어별 가중치 질의(토큰 → 가중치)로 (문서, BM25 점수) 목록 반환"""
+        hits = self.index.search_weighted(term_weights, k or self.k)
+        return self._scored_documents(hits)
+
+    def score_documents(self, query: str, documents: Sequence[Document]) -> List[float]:
+        """주어진 문서들의 BM25 점수 (코퍼스에 없거나 질의 용어가 없으면 0)"""
+        doc_ids, scores = self.index.score_terms(Counter(self.preprocess_func(query)))
+        scores_by_doc = dict(zip(doc_ids.tolist(), scores.tolist()))
+        return [
+            scores_by_doc.get(self.chunk_positions.get(get_chunk_id(doc)), 0.0)
+            for doc in documents
+        ]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [doc for doc, _ in self.search_with_scores(query)]
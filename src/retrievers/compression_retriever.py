@@ -2,86 +2,148 @@
 압축 및 재순위화 리트리버
 """
 
-from langchain.retrievers import ContextualCompressionRetriever
-from langchain.retrievers.document_compressors import (
-    CrossEncoderReranker,
-    LLMChainExtractor,
-    DocumentCompressorPipeline,
-    EmbeddingsFilter
-)
-from langchain_community.cross_encoders import HuggingFaceCrossEncoder
-from langchain_community.document_transformers import EmbeddingsRedundantFilter
+import threading
 
 from ..config.settings import (
-    CROSS_ENCODER_MODEL, CANDIDATE_DOCS_COUNT, 
-    SIMILARITY_THRESHOLD, REDUNDANCY_THRESHOLD
+    CROSS_ENCODER_MODEL, RERANKER_BACKEND, RERANKER_BATCH_SIZE, RERANKER_MAX_TOKENS,
+    CANDIDATE_DOCS_COUNT, DEFAULT_TOP_K, CASCADE_BAND_SIZE, CASCADE_DECISIVE_MARGIN,
+    SIMILARITY_THRESHOLD, REDUNDANCY_THRESHOLD, LAZY_RETRIEVER_INIT
 )
+from ..utils.lazy import LazyComponent
+from .reranker import CrossEncoderRerankEngine, CrossEncoderRerankCompressor, CascadeRerankCompressor
+from .retrieval_pipeline import RetrievalPipeline
+
+# Cross-Encoder 재순위화 엔진(모델 + 점수 캐시)은 차량(매뉴얼 샤드)과 무관하므로 프로세스에서 한 번만 로드
+_rerank_engine = None
+_rerank_engine_lock = threading.Lock()
+
+
+def get_rerank_engine() -> CrossEncoderRerankEngine:
+    """공용 Cross-Encoder 재순위화 엔진 반환 (첫 호출 시 설정된 백엔드로 로드)"""
+    global _rerank_engine
+    if _rerank_engine is None:
+        with _rerank_engine_lock:
+            if _rerank_engine is None:
+                _rerank_engine = CrossEncoderRerankEngine.load()
+    return _rerank_engine
 
 
 class CompressionRetrieverManager:
-    """압축 및 재순위화 리트리버 관리 클래스"""
+    """압축 및 재순위화 리트리버 관리 클래스
+    
+    재순위화기/압축기는 검색 파이프라인의 단계(BaseDocumentCompressor)로 제공되어
+    1차 검색 후보를 그대로 이어받는다. 검색 도구용 리트리버는 같은 단계를 벡터 후보에 적용한다.
+    """
     
     def __init__(self, vector_store, embeddings, llm):
         self.vector_store = vector_store
         self.embeddings = embeddings
         self.llm = llm
+        self.reranker = None
+        self.cascade_reranker = None
+        self.compressor = None
         self.cross_encoder_retriever = None
         self.compression_retriever = None
     
-    def initialize_cross_encoder_retriever(self):
-        """Cross-Encoder 모델을 사용한 재순위화 검색기 초기화"""
+    def initialize_cross_encoder_retriever(self, lazy: bool = LAZY_RETRIEVER_INIT):
+        """Cross-Encoder 모델을 사용한 재순위화 단계 초기화 (기본: 첫 사용 시 로드)"""
         if self.vector_store is None:
             print("⚠️ 벡터 저장소가 없어 Cross-Encoder 재순위화기를 초기화할 수 없습니다.")
             return
         
+        if lazy:
+            self.reranker = LazyComponent("Cross-Encoder 재순위화 시스템", self._build_reranker)
+            print("⏳ Cross-Encoder 재순위화 시스템: 첫 사용 시 로드")
+        else:
+            self.reranker = self._build_reranker()
+        
+        # 검색 도구용: 벡터 후보(더 많은 후보 문서) → 재순위화
+        self.cross_encoder_retriever = RetrievalPipeline(
+            retriever=self.vector_store.as_retriever(search_kwargs={"k": CANDIDATE_DOCS_COUNT}),
+            stages=[("rerank", self.reranker)],
+            top_k=DEFAULT_TOP_K
+        )
+    
+    def _build_reranker(self):
+        """Cross-Encoder 재순위화 단계 생성"""
         try:
             print("🔄 Cross-Encoder 재순위화 시스템 초기화 중...")
             
-            # Cross-Encoder 모델 로드 (경량화된 모델 사용)
-            cross_encoder_model = HuggingFaceCrossEncoder(
-                model_name=CROSS_ENCODER_MODEL  # 다국어 지원 모델
-            )
+            # 재순위화 엔진 로드 (모든 매뉴얼 샤드가 모델과 점수 캐시를 공유)
+            engine = get_rerank_engine()
             
             # 재순위화 컴프레서 생성
-            reranker = CrossEncoderReranker(
-                model=cross_encoder_model,
-                top_n=5  # 상위 5개 문서만 반환
-            )
-            
-            # 베이스 리트리버 생성 (더 많은 후보 문서 검색)
-            base_retriever = self.vector_store.as_retriever(search_kwargs={"k": CANDIDATE_DOCS_COUNT})
-            
-            # 컨텍스츄얼 컴프레션 리트리버 생성
-            self.cross_encoder_retriever = ContextualCompressionRetriever(
-                base_compressor=reranker,
-                base_retriever=base_retriever
+            reranker = CrossEncoderRerankCompressor(
+                engine=engine,
+                top_n=DEFAULT_TOP_K  # 상위 5개 문서만 반환
             )
             
             print("✅ Cross-Encoder 재순위화 시스템 초기화 완료")
-            print(f"   모델: {CROSS_ENCODER_MODEL}")
-            print(f"   후보 문서: {CANDIDATE_DOCS_COUNT}개 -> 상위 5개 선별")
+            print(f"   모델: {CROSS_ENCODER_MODEL} (백엔드: {RERANKER_BACKEND})")
+            print(f"   배치: {RERANKER_BATCH_SIZE}쌍 길이순 정렬, 토큰 예산 {RERANKER_MAX_TOKENS}")
+            print(f"   1차 검색 후보 -> 상위 {DEFAULT_TOP_K}개 선별")
+            return reranker
             
         except Exception as e:
             print(f"Cross-Encoder 재순위화 초기화 오류: {str(e)}")
-            self.cross_encoder_retriever = None
+            return None
     
-    def initialize_contextual_compression(self):
-        """맥락 압축 검색기 초기화"""
+    def initialize_cascade_reranker(self, bm25_retriever=None):
+        """캐스케이드 재순위화 단계 초기화 (저비용 점수 → 애매한 상위 구간만 Cross-Encoder)"""
+        if self.vector_store is None:
+            print("⚠️ 벡터 저장소가 없어 캐스케이드 재순위화기를 초기화할 수 없습니다.")
+            return
+        
+        self.cascade_reranker = CascadeRerankCompressor(
+            vector_store=self.vector_store,
+            embeddings=self.embeddings,
+            reranker=self.reranker,
+            bm25_retriever=bm25_retriever,
+            top_n=DEFAULT_TOP_K
+        )
+        print(f"✅ 캐스케이드 재순위화 설정 완료 (임베딩 코사인{' + BM25' if bm25_retriever else ''} → "
+              f"상위 {CASCADE_BAND_SIZE}개만 Cross-Encoder, 점수 차 ≥ {CASCADE_DECISIVE_MARGIN} 시 생략)")
+    
+    def initialize_contextual_compression(self, lazy: bool = LAZY_RETRIEVER_INIT):
+        """맥락 압축 단계 초기화 (기본: 첫 사용 시 생성)"""
         if self.vector_store is None:
             print("⚠️ 벡터 저장소가 없어 맥락 압축기를 초기화할 수 없습니다.")
             return
         
+        if lazy:
+            self.compressor = LazyComponent("맥락 압축 시스템", self._build_compressor)
+            print("⏳ 맥락 압축 시스템: 첫 사용 시 생성")
+        else:
+            self.compressor = self._build_compressor()
+        
+        # 검색 도구용: 벡터 후보 15개 → 압축
+        self.compression_retriever = RetrievalPipeline(
+            retriever=self.vector_store.as_retriever(search_kwargs={"k": 15}),
+            stages=[("compress", self.compressor)],
+            top_k=DEFAULT_TOP_K
+        )
+    
+    def _build_compressor(self):
+        """맥락 압축 단계 생성"""
         try:
+            from langchain.retrievers.document_compressors import (
+                LLMChainExtractor,
+                DocumentCompressorPipeline
+            )
+            from .stored_embedding_filters import StoredEmbeddingsFilter, StoredEmbeddingsRedundantFilter
+            
             print("📝 맥락 압축 시스템 초기화 중...")
             
-            # 1. 임베딩 기반 필터링 (유사도 임계값 설정)
-            embeddings_filter = EmbeddingsFilter(
+            # 1. 임베딩 기반 필터링 (저장된 청크 벡터 사용, 질의만 임베딩)
+            embeddings_filter = StoredEmbeddingsFilter(
+                vector_store=self.vector_store,
                 embeddings=self.embeddings,
                 similarity_threshold=SIMILARITY_THRESHOLD  # 60% 이상 유사한 문서만 통과
             )
             
-            # 2. 중복 제거 필터
-            redundant_filter = EmbeddingsRedundantFilter(
+            # 2. 중복 제거 필터 (저장된 청크 벡터 간 유사도)
+            redundant_filter = StoredEmbeddingsRedundantFilter(
+                vector_store=self.vector_store,
                 embeddings=self.embeddings,
                 similarity_threshold=REDUNDANCY_THRESHOLD  # 90% 이상 유사한 문서 제거
             )
@@ -98,23 +160,27 @@ class CompressionRetrieverManager:
                 ]
             )
             
-            # 베이스 리트리버 생성
-            base_retriever = self.vector_store.as_retriever(search_kwargs={"k": 15})  # 15개 후보 검색
-            
-            # 컨텍스츄얼 컴프레션 리트리버 생성
-            self.compression_retriever = ContextualCompressionRetriever(
-                base_compressor=pipeline_compressor,
-                base_retriever=base_retriever
-            )
-            
             print("✅ 맥락 압축 시스템 초기화 완료")
-            print(f"   1단계: 임베딩 필터링 (유사도 > {SIMILARITY_THRESHOLD*100}%)")
-            print(f"   2단계: 중복 제거 (유사도 > {REDUNDANCY_THRESHOLD*100}%)")
+            print(f"   1단계: 임베딩 필터링 (유사도 > {SIMILARITY_THRESHOLD*100}%, 저장 벡터)")
+            print(f"   2단계: 중복 제거 (유사도 > {REDUNDANCY_THRESHOLD*100}%, 저장 벡터)")
             print(f"   3단계: LLM 기반 핵심 정보 추출")
+            return pipeline_compressor
             
         except Exception as e:
             print(f"맥락 압축 초기화 오류: {str(e)}")
-            self.compression_retriever = None
+            return None
+    
+    def get_reranker(self):
+        """재순위화 단계 (Cross-Encoder 컴프레서) 반환"""
+        return self.reranker
+    
+    def get_cascade_reranker(self):
+        """캐스케이드 재순위화 단계 반환"""
+        return self.cascade_reranker
+    
+    def get_compressor(self):
+        """맥락 압축 단계 (다단계 컴프레서) 반환"""
+        return self.compressor
     
     def get_cross_encoder_retriever(self):
         """Cross-Encoder 재순위화 검색기 반환"""
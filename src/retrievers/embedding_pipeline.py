@@ -0,0 +1,219 @@
+"""
+벌크 임베딩 파이프라인 - 동시 배치 임베딩, 토큰 예산 제한, 재시도 및 체크포인트
+"""
+
+import os
+import json
+import time
+import random
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Set, Tuple, Type
+import openai
+from langchain_core.documents import Document
+
+from ..config.settings import (
+    BATCH_SIZE, EMBEDDING_MAX_WORKERS, EMBEDDING_TOKENS_PER_MINUTE,
+    EMBEDDING_MAX_RETRIES, EMBEDDING_RETRY_BASE_DELAY
+)
+from ..utils.token_counter import estimate_tokens
+
+CHECKPOINT_FILENAME = "ingest_checkpoint.jsonl"
+
+# 재시도하면 성공할 수 있는 오류 (요청 한도 초과, 시간 초과, 연결 오류) - 그 외(400 등)는 즉시 실패
+RETRYABLE_EMBEDDING_ERRORS: Tuple[Type[BaseException], ...] = (
+    openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+    TimeoutError, ConnectionError
+)
+
+
+class EmbeddingIngestionError(Exception):
+    """재시도 후에도 임베딩에 실패한 배치가 있을 때 발생"""
+
+    def __init__(self, failed_ids: List[str], last_error: str):
+        self.failed_ids = failed_ids
+        super().__init__(f"{len(failed_ids)}개 청크 임베딩 실패: {last_error}")
+
+
+class TokenBudgetLimiter:
+    """분당 토큰 예산을 지키는 토큰 버킷"""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = float(tokens_per_minute)
+        self.refill_per_second = tokens_per_minute / 60.0
+        self.available = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: int):
+        """토큰 예산이 확보될 때까지 대기"""
+        tokens = min(float(tokens), self.capacity)
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.available = min(
+                    self.capacity,
+                    self.available + (now - self.last_refill) * self.refill_per_second
+                )
+                self.last_refill = now
+                if self.available >= tokens:
+                    self.available -= tokens
+                    return
+                wait_seconds = (tokens - self.available) / self.refill_per_second
+            time.sleep(min(wait_seconds, 1.0))
+
+
+class IngestionCheckpoint:
+    """완료된 청크 ID를 기록하여 중단된 빌드를 이어서 진행"""
+
+    def __init__(self, index_dir: str, embedding_model: str):
+        self.path = Path(index_dir) / CHECKPOINT_FILENAME
+        self.embedding_model = embedding_model
+
+    def load(self) -> Dict[str, str]:
+        """이전 실행에서 완료된 {청크 ID: 콘텐츠 해시} (모델이 다르면 무시)"""
+        completed = {}
+        if not self.path.exists():
+            return completed
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("embedding_model") != self.embedding_model:
+                    return {}
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        completed[entry["id"]] = entry["hash"]
+        except Exception as e:
+            print(f"⚠️ 임베딩 체크포인트 로드 오류: {str(e)}")
+        return completed
+
+    def start(self):
+        """체크포인트 파일 준비 (다른 모델의 체크포인트면 새로 작성)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                try:
+                    header = json.loads(f.readline() or "{}")
+                except ValueError:
+                    header = {}
+            if header.get("embedding_model") == self.embedding_model:
+                return
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"embedding_model": self.embedding_model}) + "\n")
+
+    def record(self, chunk_hashes: Dict[str, str]):
+        """완료된 배치 기록"""
+        with open(self.path, "a", encoding="utf-8") as f:
+            for chunk_id, content_hash in chunk_hashes.items():
+                f.write(json.dumps({"id": chunk_id, "hash": content_hash}) + "\n")
+            f.flush()
+
+    def clear(self):
+        """빌드 완료 후 체크포인트 제거"""
+        if self.path.exists():
+            os.remove(self.path)
+
+
+class EmbeddingIngestionPipeline:
+    """동시 배치 임베딩 후 벡터 저장소에 기록하는 인덱스 빌드 파이프라인"""
+
+    def __init__(self, embeddings, vector_store, index_dir: str, embedding_model: str,
+                 batch_size: int = BATCH_SIZE, max_workers: int = EMBEDDING_MAX_WORKERS,
+                 tokens_per_minute: int = EMBEDDING_TOKENS_PER_MINUTE,
+                 max_retries: int = EMBEDDING_MAX_RETRIES,
+                 retry_base_delay: float = EMBEDDING_RETRY_BASE_DELAY,
+                 retryable_errors: Tuple[Type[BaseException], ...] = RETRYABLE_EMBEDDING_ERRORS):
+        self.embeddings = embeddings
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retryable_errors = retryable_errors
+        self.limiter = TokenBudgetLimiter(tokens_per_minute)
+        self.checkpoint = IngestionCheckpoint(index_dir, embedding_model)
+        self.retry_count = 0
+        self._retry_lock = threading.Lock()
+
+    def _embed_with_retry(self, texts: List[str]) -> List[List[float]]:
+        """일시적 오류만 지수 백오프로 재시도하며 배치 임베딩 (시도마다 토큰 예산 차감)"""
+        batch_tokens = sum(estimate_tokens(text) for text in texts)
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(batch_tokens)
+            try:
+                return self.embeddings.embed_documents(texts)
+            except self.retryable_errors:
+                if attempt >= self.max_retries:
+                    raise
+                with self._retry_lock:
+                    self.retry_count += 1
+                delay = self.retry_base_delay * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay / 2))
+
+    def _write_batch(self, ids: List[str], docs: List[Document], vectors: List[List[float]]):
+        """임베딩 결과를 벡터 저장소에 기록 (같은 ID는 덮어쓰기)"""
+        self.vector_store._collection.upsert(
+            ids=ids,
+            embeddings=vectors,
+            metadatas=[doc.metadata for doc in docs],
+            documents=[doc.page_content for doc in docs]
+        )
+
+    def run(self, docs_by_id: Dict[str, Document], chunk_hashes: Dict[str, str]) -> Set[str]:
+        """대상 청크를 모두 임베딩하고 완료된 청크 ID 집합 반환
+
+        재시도 후에도 실패한 배치가 있으면 EmbeddingIngestionError를 발생시킨다.
+        완료된 배치는 즉시 체크포인트에 기록되어 중단 후 재실행 시 건너뛸 수 있다.
+        """
+        completed = set()
+        pending_ids = list(docs_by_id)
+        self.checkpoint.start()
+        if not pending_ids:
+            return completed
+
+        batches = [
+            pending_ids[i:i+self.batch_size]
+            for i in range(0, len(pending_ids), self.batch_size)
+        ]
+        print(f"총 {len(pending_ids)}개 문서를 {self.batch_size}개씩 {len(batches)}개 배치로 "
+              f"동시 임베딩 (작업자 {self.max_workers}개)")
+
+        start_time = time.time()
+        total_tokens = 0
+        failed_ids = []
+        last_error = ""
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for batch_ids in batches:
+                texts = [docs_by_id[chunk_id].page_content for chunk_id in batch_ids]
+                futures[executor.submit(self._embed_with_retry, texts)] = batch_ids
+
+            for done, future in enumerate(as_completed(futures), 1):
+                batch_ids = futures[future]
+                try:
+                    vectors = future.result()
+                    batch_docs = [docs_by_id[chunk_id] for chunk_id in batch_ids]
+                    self._write_batch(batch_ids, batch_docs, vectors)
+                    self.checkpoint.record({chunk_id: chunk_hashes[chunk_id] for chunk_id in batch_ids})
+                    completed.update(batch_ids)
+                    total_tokens += sum(estimate_tokens(doc.page_content) for doc in batch_docs)
+                    print(f"배치 {done}/{len(batches)} 완료")
+                except Exception as batch_error:
+                    failed_ids.extend(batch_ids)
+                    last_error = str(batch_error)
+                    print(f"❌ 배치 {done}/{len(batches)} 최종 실패: {last_error}")
+
+        elapsed = max(time.time() - start_time, 1e-6)
+        embedded_count = len(pending_ids) - len(failed_ids)
+        print(f"📈 임베딩 처리량: {embedded_count}개 청크 / {elapsed:.1f}초 "
+              f"({embedded_count / elapsed:.1f} 청크/초, 약 {total_tokens / elapsed:,.0f} 토큰/초, "
+              f"재시도 {self.retry_count}회)")
+
+        if failed_ids:
+            raise EmbeddingIngestionError(failed_ids, last_error)
+
+        return completed
@@ -0,0 +1,70 @@
+"""
+전문 용어 확장 리트리버 - 확장 용어를 BM25 가중 질의와 질의 벡터에 반영해 한 번만 검색
+"""
+
+from typing import Any, List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..utils.term_expansion import VehicleTermExpander, get_vehicle_term_expander
+from .fusion_retriever import FusionRetriever
+
+
+class ExpandedVectorRetriever(BaseRetriever):
+    """용어 그룹 평균 벡터를 섞은 질의 벡터로 검색 (관련성 점수를 metadata["score"]에 담음)"""
+
+    vector_store: Any
+    expander: Any = None
+    k: int = 5
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        expander = self.expander or get_vehicle_term_expander()
+        vector = expander.expanded_vector(query, self.vector_store.embeddings)
+        if hasattr(self.vector_store, "similarity_search_with_score_by_vector"):
+            results = self.vector_store.similarity_search_with_score_by_vector(vector, k=self.k)
+        else:
+            # Chroma는 거리 반환
+            results = self.vector_store.similarity_search_by_vector_with_relevance_scores(vector, k=self.k)
+        relevance = self.vector_store._select_relevance_score_fn()
+        return [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "score": float(relevance(score))})
+            for doc, score in results
+        ]
+
+
+class ExpandedBM25Retriever(BaseRetriever):
+    """확장 동의어를 가중 질의 용어로 더한 BM25 검색 (질의 문자열 연결 없음)"""
+
+    bm25_retriever: Any
+    expander: Any = None
+    k: int = 5
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        expander = self.expander or get_vehicle_term_expander()
+        term_weights = expander.bm25_term_weights(query, self.bm25_retriever.preprocess_func)
+        return [doc for doc, _ in self.bm25_retriever.search_weighted_with_scores(term_weights, k=self.k)]
+
+
+def build_expanded_retriever(vector_store, bm25_retriever, semantic_weight: float, top_k: int = 5,
+                             expander: VehicleTermExpander = None, **kwargs) -> FusionRetriever:
+    """전문 용어 확장 벡터 + 가중 BM25 융합 리트리버 생성"""
+    return FusionRetriever(
+        retrievers=[
+            ExpandedVectorRetriever(vector_store=vector_store, expander=expander, k=top_k),
+            ExpandedBM25Retriever(bm25_retriever=bm25_retriever, expander=expander, k=top_k)
+        ],
+        weights=[semantic_weight, 1.0 - semantic_weight],
+        names=["vector", "bm25"],
+        **kwargs
+    )
@@ -0,0 +1,157 @@
+"""
+융합 리트리버 - 여러 검색기(벡터/BM25)를 동시에 실행하고 가중 RRF 또는 정규화 점수로 결합
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict, List, Optional
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..config.settings import FUSION_METHOD, RRF_K
+from ..utils.chunk_ids import get_chunk_id
+
+FUSION_METHODS = ("rrf", "score")
+
+
+def _doc_key(doc: Document) -> str:
+    """중복 제거 키 (정규 청크 ID, 없으면 내용)"""
+    return get_chunk_id(doc) or doc.page_content
+
+
+def _normalized_leg_scores(docs: List[Document]) -> List[float]:
+    """한 검색기 결과의 원점수를 [0, 1]로 min-max 정규화 (점수가 없으면 순위 기반)"""
+    raw = [doc.metadata.get("score") for doc in docs]
+    if not docs or any(score is None for score in raw):
+        return [1.0 - rank / max(len(docs), 1) for rank in range(len(docs))]
+    low, high = min(raw), max(raw)
+    if high - low <= 1e-12:
+        return [1.0] * len(docs)
+    return [(score - low) / (high - low) for score in raw]
+
+
+def fuse_rankings(rankings: List[List[Document]], weights: List[float], names: List[str],
+                  method: str = FUSION_METHOD, rrf_k: int = RRF_K,
+                  k: Optional[int] = None) -> List[Document]:
+    """검색기별 순위 목록을 청크 ID 기준으로 합쳐 융합 점수 순으로 반환
+
+    융합 점수는 [0, 1]로 보정되어 metadata["score"]에 담긴다.
+    - rrf: Σ w / (rrf_k + 순위)를 모든 검색기 1위일 때의 값으로 나눈 값
+    - score: 검색기별 min-max 정규화 점수의 가중 평균
+    검색기별 원점수는 metadata["retrieval_scores"]에 남긴다.
+    """
+    if method not in FUSION_METHODS:
+        raise ValueError(f"지원하지 않는 융합 방법입니다: {method}")
+    total_weight = sum(weights) or 1.0
+    max_rrf = total_weight / (rrf_k + 1)
+
+    fused: Dict[str, float] = {}
+    first_docs: Dict[str, Document] = {}
+    leg_scores: Dict[str, Dict[str, Any]] = {}
+    for docs, weight, name in zip(rankings, weights, names):
+        normalized = _normalized_leg_scores(docs) if method == "score" else None
+        seen = set()
+        for rank, doc in enumerate(docs):
+            key = _doc_key(doc)
+            if key in seen:
+                continue
+            seen.add(key)
+            first_docs.setdefault(key, doc)
+            leg_scores.setdefault(key, {})[name] = doc.metadata.get("score")
+            if method == "rrf":
+                contribution = weight / (rrf_k + rank + 1) / max_rrf
+            else:
+                contribution = weight * normalized[rank] / total_weight
+            fused[key] = fused.get(key, 0.0) + contribution
+
+    ordered = sorted(fused, key=lambda key: fused[key], reverse=True)
+    if k is not None:
+        ordered = ordered[:k]
+    return [
+        Document(page_content=first_docs[key].page_content,
+                 metadata={**first_docs[key].metadata, "score": round(fused[key], 6),
+                           "retrieval_scores": leg_scores[key]})
+        for key in ordered
+    ]
+
+
+class ScoredVectorRetriever(BaseRetriever):
+    """벡터 저장소 검색기 - 관련성 점수(클수록 관련성 높음)를 metadata["score"]에 담음"""
+
+    vector_store: Any
+    k: int = 5
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        results = self.vector_store.similarity_search_with_relevance_scores(query, k=self.k)
+        return [
+            Document(page_content=doc.page_content, metadata={**doc.metadata, "score": float(score)})
+            for doc, score in results
+        ]
+
+
+class FusionRetriever(BaseRetriever):
+    """여러 검색기를 동시에 실행해 결과를 융합하는 리트리버 (EnsembleRetriever 대체)
+
+    검색기마다 스레드에서 실행하므로 지연 시간은 가장 느린 검색기 수준이다.
+    요청 범위 상태(질의 임베딩 캐시, 샤드 검색기 묶음)는 각 스레드로 복사된다.
+    실패한 검색기는 건너뛰고 나머지 결과로 융합한다.
+    """
+
+    retrievers: List[BaseRetriever]
+    weights: List[float]
+    names: Optional[List[str]] = None
+    method: str = FUSION_METHOD
+    rrf_k: int = RRF_K
+    k: Optional[int] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    @classmethod
+    def hybrid(cls, vector_store, bm25_retriever, semantic_weight: float, top_k: int = 5,
+               **kwargs) -> "FusionRetriever":
+        """벡터 + BM25 하이브리드 융합 리트리버 생성 (두 검색기 모두 top_k개 후보)"""
+        if getattr(bm25_retriever, "k", top_k) != top_k:
+            bm25_retriever = bm25_retriever.copy(update={"k": top_k})
+        return cls(
+            retrievers=[ScoredVectorRetriever(vector_store=vector_store, k=top_k), bm25_retriever],
+            weights=[semantic_weight, 1.0 - semantic_weight],
+            names=["vector", "bm25"],
+            **kwargs
+        )
+
+    def _leg_names(self) -> List[str]:
+        return self.names or [f"retriever_{i}" for i in range(len(self.retrievers))]
+
+    def _run_leg(self, index: int, query: str, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        try:
+            return self.retrievers[index].invoke(
+                query, config={"callbacks": run_manager.get_child(tag=f"retriever_{index + 1}")}
+            )
+        except Exception as e:
+            print(f"⚠️ 융합 검색기 '{self._leg_names()[index]}' 오류: {str(e)}")
+            return []
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        if len(self.retrievers) == 1:
+            rankings = [self._run_leg(0, query, run_manager)]
+        else:
+            # 첫 검색기는 호출 스레드에서, 나머지는 요청 컨텍스트를 복사한 스레드에서 실행
+            with ThreadPoolExecutor(max_workers=len(self.retrievers) - 1) as executor:
+                futures = [
+                    executor.submit(copy_context().run, self._run_leg, index, query, run_manager)
+                    for index in range(1, len(self.retrievers))
+                ]
+                rankings = [self._run_leg(0, query, run_manager)]
+                rankings.extend(future.result() for future in futures)
+
+        return fuse_rankings(rankings, self.weights, self._leg_names(),
+                             method=self.method, rrf_k=self.rrf_k, k=self.k)
@@ -3,101 +3,94 @@
 """
 
 from typing import List
-from langchain_community.retrievers import BM25Retriever
-from langchain.retrievers.multi_query import MultiQueryRetriever
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import BaseOutputParser
 from langchain_core.documents import Document
 
-from ..config.settings import CUSTOM_WORDS
-
-try:
-    from kiwipiepy import Kiwi
-    KIWI_AVAILABLE = True
-except ImportError:
-    KIWI_AVAILABLE = False
-    print("⚠️ Kiwi 토크나이저가 설치되지 않았습니다. 기본 토크나이저를 사용합니다.")
+from ..config.settings import BM25_INDEX_DIR, LAZY_RETRIEVER_INIT, MULTI_QUERY_COUNT, MULTI_QUERY_K
+from ..utils.korean_tokenizer import KoreanTokenizer
+from ..utils.lazy import LazyComponent
+from .bm25_index import BM25Index, compute_corpus_version
+from .bm25_retriever import InvertedIndexBM25Retriever
 
 
 class HybridRetrieverManager:
     """하이브리드 검색 리트리버 관리 클래스"""
     
-    def __init__(self, vector_store, llm):
+    def __init__(self, vector_store, llm, bm25_index_dir: str = None):
         self.vector_store = vector_store
         self.llm = llm
-        self.kiwi_model = None
+        self.bm25_index_dir = str(bm25_index_dir or BM25_INDEX_DIR)
+        self.tokenizer = None
+        self.bm25_index = None
         self.bm25_retriever = None
         self.multi_query_retriever = None
         
-    def _setup_korean_tokenizer(self):
-        """한국어 토크나이저 설정"""
-        if not KIWI_AVAILABLE:
-            return None
-            
-        try:
-            self.kiwi_model = Kiwi()
-            # 사용자 정의 단어 추가
-            for word, pos in CUSTOM_WORDS:
-                self.kiwi_model.add_user_word(word, pos)
-                
-            print(f"✅ 한국어 토크나이저 설정 완료: {len(CUSTOM_WORDS)}개 사용자 단어 추가")
-            return self.kiwi_model
-            
-        except Exception as e:
-            print(f"한국어 토크나이저 설정 오류: {str(e)}")
-            return None
-    
-    def _korean_tokenizer(self, text: str) -> List[str]:
-        """한국어 텍스트 토크나이징"""
-        if self.kiwi_model is None:
-            # Kiwi가 없으면 기본 공백 분리
-            return text.split()
+    def _load_or_build_bm25_index(self, documents: List[Document]) -> BM25Index:
+        """저장된 BM25 인덱스 로드 (청크 집합이 바뀌었으면 토큰화 후 재생성)"""
+        corpus_version = compute_corpus_version(documents)
+        tokenizer_name = self.tokenizer.name
+        
+        index = BM25Index.load(self.bm25_index_dir, corpus_version, tokenizer_name)
+        if index is not None:
+            print(f"📦 저장된 BM25 인덱스 로드: {index.num_docs}개 문서, {len(index.terms)}개 용어")
+            return index
         
+        print(f"🔤 BM25 인덱스 생성 중: {len(documents)}개 문서 토큰화")
+        tokenized_docs = self.tokenizer.tokenize_batch(doc.page_content for doc in documents)
+        index = BM25Index.build(tokenized_docs, corpus_version, tokenizer_name)
         try:
-            # Kiwi로 토크나이징
-            tokens = []
-            for token, pos, _, _ in self.kiwi_model.analyze(text):
-                # 명사, 동사, 형용사, 고유명사만 추출
-                if pos.startswith(('NN', 'VV', 'VA', 'NP')):
-                    tokens.append(token)
-            return tokens if tokens else text.split()
-        except:
-            return text.split()
+            index.save(self.bm25_index_dir)
+        except Exception as e:
+            print(f"⚠️ BM25 인덱스 저장 오류: {str(e)}")
+        return index
     
     def initialize_bm25_retriever(self, documents: List[Document]):
-        """BM25 검색기 초기화"""
+        """BM25 검색기 초기화 (저장된 역색인 기반)"""
         try:
-            # 한국어 토크나이저 설정
-            self._setup_korean_tokenizer()
+            # 한국어 토크나이저 설정 (코퍼스는 배치 분석, 질의는 캐시 사용)
+            if self.tokenizer is None:
+                self.tokenizer = KoreanTokenizer()
+            
+            # 역색인 로드 또는 생성
+            self.bm25_index = self._load_or_build_bm25_index(documents)
             
-            # BM25 검색기 생성
-            if KIWI_AVAILABLE and self.kiwi_model is not None:
-                # 한국어 토크나이저 사용
-                self.bm25_retriever = BM25Retriever.from_documents(
-                    documents=documents,
-                    preprocess_func=self._korean_tokenizer,
-                    k=5
-                )
+            # 질의 용어의 포스팅만 점수화하는 BM25 검색기 생성
+            self.bm25_retriever = InvertedIndexBM25Retriever.from_index(
+                self.bm25_index,
+                docs=documents,
+                preprocess_func=self.tokenizer.tokenize_query,
+                k=5
+            )
+            
+            if self.tokenizer.kiwi_model is not None:
                 print("✅ BM25 검색기 생성 완료 (한국어 토크나이저 적용)")
             else:
-                # 기본 토크나이저 사용
-                self.bm25_retriever = BM25Retriever.from_documents(
-                    documents=documents,
-                    k=5
-                )
                 print("✅ BM25 검색기 생성 완료 (기본 토크나이저)")
                 
         except Exception as e:
             print(f"BM25 검색기 초기화 오류: {str(e)}")
             self.bm25_retriever = None
     
-    def initialize_multi_query_retriever(self):
-        """MultiQueryRetriever 초기화"""
+    def initialize_multi_query_retriever(self, lazy: bool = LAZY_RETRIEVER_INIT):
+        """다중 쿼리 검색기 초기화 (기본: 첫 사용 시 생성)"""
         if self.vector_store is None:
-            print("⚠️ 벡터 저장소가 없어 MultiQueryRetriever를 초기화할 수 없습니다.")
+            print("⚠️ 벡터 저장소가 없어 다중 쿼리 검색기를 초기화할 수 없습니다.")
             return
         
+        if lazy:
+            self.multi_query_retriever = LazyComponent(
+                "다중 쿼리 검색기", self._build_multi_query_retriever
+            )
+            print("⏳ 다중 쿼리 검색기: 첫 사용 시 생성")
+        else:
+            self.multi_query_retriever = self._build_multi_query_retriever()
+    
+    def _build_multi_query_retriever(self):
+        """병렬 다중 쿼리 검색기 생성"""
         try:
+            from .parallel_multi_query import ParallelMultiQueryRetriever
+            
             # 차량 매뉴얼 전용 다중 쿼리 생성 프롬프트
             vehicle_prompt = ChatPromptTemplate.from_template(
                 """차량 매뉴얼 검색을 위해 주어진 질문을 3개의 다른 관점에서 다시 작성해주세요.
@@ -122,19 +115,24 @@ class HybridRetrieverManager:
             # 다중 쿼리 체인 생성
             multi_query_chain = vehicle_prompt | self.llm | LineListOutputParser()
             
-            # MultiQueryRetriever 생성
-            base_retriever = self.vector_store.as_retriever(search_kwargs={"k": 3})
-            self.multi_query_retriever = MultiQueryRetriever(
-                retriever=base_retriever,
+            # 원본 질의 검색과 질의 생성을 겹쳐 실행하는 다중 쿼리 검색기
+            multi_query_retriever = ParallelMultiQueryRetriever(
+                vector_store=self.vector_store,
                 llm_chain=multi_query_chain,
-                parser_key="lines"
+                k=MULTI_QUERY_K,
+                max_queries=MULTI_QUERY_COUNT
             )
             
-            print("✅ MultiQueryRetriever 초기화 완료")
+            print("✅ 다중 쿼리 검색기 초기화 완료 (병렬 검색 + RRF 융합)")
+            return multi_query_retriever
             
         except Exception as e:
-            print(f"MultiQueryRetriever 초기화 오류: {str(e)}")
-            self.multi_query_retriever = None
+            print(f"다중 쿼리 검색기 초기화 오류: {str(e)}")
+            return None
+    
+    def get_bm25_index(self):
+        """BM25 역색인 반환"""
+        return self.bm25_index
     
     def get_bm25_retriever(self):
         """BM25 검색기 반환"""
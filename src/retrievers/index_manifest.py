@@ -0,0 +1,94 @@
+"""
+벡터 인덱스 매니페스트 - 청크별 콘텐츠 해시 기반 증분 인덱싱
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from langchain_core.documents import Document
+
+from ..utils.chunk_ids import assign_chunk_ids, compute_chunk_hash, get_chunk_id
+
+# 매니페스트 포맷/청크 ID 체계가 바뀌면 증가시켜 전체 재색인 유도
+MANIFEST_VERSION = 2
+MANIFEST_FILENAME = "index_manifest.json"
+
+
+def build_chunk_hashes(documents: List[Document]) -> Dict[str, str]:
+    """문서 조각별 {정규 청크 ID: 콘텐츠 해시} 생성 (ID가 없으면 부여)"""
+    if any(get_chunk_id(doc) is None for doc in documents):
+        assign_chunk_ids(documents)
+    return {get_chunk_id(doc): compute_chunk_hash(doc) for doc in documents}
+
+
+class IndexManifest:
+    """벡터 인덱스에 반영된 청크 목록과 인덱싱 설정 기록"""
+
+    def __init__(self, index_dir: str):
+        self.path = Path(index_dir) / MANIFEST_FILENAME
+        self.data = self._load()
+
+    def _load(self) -> Optional[Dict]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ 인덱스 매니페스트 로드 오류: {str(e)}")
+            return None
+
+    def is_compatible(self, embedding_model: str) -> bool:
+        """기존 인덱스 재사용 가능 여부 (포맷 버전 및 임베딩 모델 일치)"""
+        return (
+            self.data is not None
+            and self.data.get("version") == MANIFEST_VERSION
+            and self.data.get("embedding_model") == embedding_model
+        )
+
+    def get_indexed_chunks(self, embedding_model: str) -> Dict[str, str]:
+        """인덱스에 반영된 {청크 ID: 콘텐츠 해시} (호환되지 않으면 빈 dict)"""
+        if not self.is_compatible(embedding_model):
+            return {}
+        return dict(self.data.get("chunks", {}))
+
+    @staticmethod
+    def diff(indexed: Dict[str, str], current: Dict[str, str]) -> Tuple[List[str], List[str]]:
+        """추가(신규/변경)할 청크 ID와 삭제할 청크 ID 계산"""
+        to_add = [
+            chunk_id for chunk_id, content_hash in current.items()
+            if indexed.get(chunk_id) != content_hash
+        ]
+        to_delete = [
+            chunk_id for chunk_id, content_hash in indexed.items()
+            if current.get(chunk_id) != content_hash
+        ]
+        return to_add, to_delete
+
+    def save(self, embedding_model: str, chunking: Dict, chunks: Dict[str, str]):
+        """매니페스트 기록 (임시 파일 작성 후 교체)"""
+        self.data = {
+            "version": MANIFEST_VERSION,
+            "embedding_model": embedding_model,
+            "chunking": chunking,
+            "chunks": chunks
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    @property
+    def fingerprint(self) -> str:
+        """인덱스 상태 지문 (청크 집합 변경 감지용)"""
+        if not self.data:
+            return ""
+        digest = hashlib.sha256()
+        digest.update(str(self.data.get("embedding_model", "")).encode("utf-8"))
+        for chunk_id in sorted(self.data.get("chunks", {})):
+            digest.update(chunk_id.encode("utf-8"))
+            digest.update(self.data["chunks"][chunk_id].encode("utf-8"))
+        return digest.hexdigest()
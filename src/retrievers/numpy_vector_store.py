@@ -0,0 +1,293 @@
+"""
+NumPy 벡터 저장소 - 메모리 매핑된 정규화 임베딩 행렬 기반 정확(브루트포스) 검색
+"""
+
+import os
+import json
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+
+from ..config.settings import BATCH_SIZE
+
+# 저장 포맷이 바뀌면 증가시켜 기존 인덱스를 무효화
+VECTOR_INDEX_VERSION = 1
+
+# 행렬-벡터 곱을 나눠 계산할 행 블록 크기 (float16 행렬의 float32 변환 메모리 제한)
+SEARCH_BLOCK_ROWS = 65536
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (내적 = 코사인 유사도)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+    """(질의 수, 후보 수) 점수 행렬에서 질의별 상위 k개 (위치, 점수)"""
+    k = min(k, scores.shape[1])
+    if k <= 0:
+        return [[] for _ in range(scores.shape[0])]
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    results = []
+    for row, candidates in enumerate(top):
+        order = candidates[np.argsort(-scores[row, candidates])]
+        results.append([(int(i), float(scores[row, i])) for i in order])
+    return results
+
+
+def export_chroma_embeddings(chroma_store, ids: List[str], batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """Chroma 컬렉션에서 ids 순서대로 저장된 임베딩 추출 (재임베딩 없음)"""
+    vectors: Dict[str, Any] = {}
+    for i in range(0, len(ids), batch_size):
+        batch = chroma_store._collection.get(ids=ids[i:i + batch_size], include=["embeddings"])
+        vectors.update(zip(batch["ids"], batch["embeddings"]))
+    missing = [chunk_id for chunk_id in ids if chunk_id not in vectors]
+    if missing:
+        raise ValueError(f"Chroma에 임베딩이 없는 청크 {len(missing)}개 (예: {missing[0]})")
+    return np.asarray([vectors[chunk_id] for chunk_id in ids], dtype=np.float32)
+
+
+class FlatVectorIndex:
+    """정규화된 임베딩 행렬과 행별 청크 ID 배열을 가진 정확 검색 인덱스"""
+
+    kind = "flat"
+    array_names = ("vectors",)
+
+    def __init__(self, arrays: Dict[str, np.ndarray], ids: List[str], meta: Dict):
+        for name in self.array_names:
+            setattr(self, name, arrays[name])
+        self.ids = ids
+        self.meta = meta
+        self._positions: Optional[Dict[str, int]] = None
+
+    @property
+    def num_vectors(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return int(self.vectors.shape[1]) if self.vectors.ndim == 2 else 0
+
+    @classmethod
+    def _make_meta(cls, ids: List[str], vectors: np.ndarray, index_version: str,
+                   dtype: str, params: Dict) -> Dict:
+        return {
+            "version": VECTOR_INDEX_VERSION,
+            "kind": cls.kind,
+            "index_version": index_version,
+            "dtype": dtype,
+            "params": params,
+            "num_vectors": len(ids),
+            "dim": int(vectors.shape[1]) if len(ids) else 0
+        }
+
+    @classmethod
+    def build(cls, ids: List[str], embeddings: np.ndarray, index_version: str,
+              dtype: str = "float32", **params) -> "FlatVectorIndex":
+        """임베딩을 정규화하여 인덱스 생성 (index_version: 청크/모델 지문)"""
+        vectors = normalize_rows(embeddings).astype(dtype)
+        meta = cls._make_meta(ids, vectors, index_version, dtype, params)
+        return cls({"vectors": vectors}, list(ids), meta)
+
+    def _score_rows(self, queries: np.ndarray, rows) -> np.ndarray:
+        """정규화된 질의와 지정 행(슬라이스 또는 위치 배열)의 내적"""
+        vectors = self.vectors[rows]
+        if vectors.dtype != np.float32:
+            vectors = vectors.astype(np.float32)
+        return queries @ vectors.T
+
+    def positions(self, ids: List[Optional[str]]) -> np.ndarray:
+        """청크 ID들의 행 위치 (인덱스에 없으면 -1)"""
+        if self._positions is None:
+            self._positions = {chunk_id: i for i, chunk_id in enumerate(self.ids)}
+        return np.fromiter((self._positions.get(chunk_id, -1) for chunk_id in ids),
+                           dtype=np.int64, count=len(ids))
+
+    def get_vectors(self, positions: np.ndarray) -> np.ndarray:
+        """행 위치의 정규화된 벡터 (float32)"""
+        return np.asarray(self.vectors[positions], dtype=np.float32)
+
+    def search(self, query_vectors: np.ndarray, k: int,
+               mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """질의 벡터 배치의 코사인 유사도 상위 k개 (행 위치, 점수), mask가 False인 행은 제외"""
+        queries = normalize_rows(np.atleast_2d(query_vectors))
+        if self.num_vectors == 0:
+            return [[] for _ in range(len(queries))]
+        scores = np.empty((len(queries), self.num_vectors), dtype=np.float32)
+        for start in range(0, self.num_vectors, SEARCH_BLOCK_ROWS):
+            end = min(start + SEARCH_BLOCK_ROWS, self.num_vectors)
+            scores[:, start:end] = self._score_rows(queries, slice(start, end))
+        if mask is not None:
+            scores[:, ~mask] = -np.inf
+            k = min(k, int(mask.sum()))
+        return top_k_rows(scores, k)
+
+    def save(self, index_dir: str):
+        """인덱스를 디렉터리에 저장 (임시 디렉터리 작성 후 교체)"""
+        index_dir = Path(index_dir)
+        tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+
+        for name in self.array_names:
+            np.save(tmp_dir / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with open(tmp_dir / "ids.json", "w", encoding="utf-8") as f:
+            json.dump(self.ids, f)
+        # meta.json은 마지막에 기록 (완전한 인덱스의 표식)
+        with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f)
+
+        if index_dir.exists():
+            shutil.rmtree(index_dir)
+        os.replace(tmp_dir, index_dir)
+
+    @classmethod
+    def load(cls, index_dir: str, index_version: str, dtype: str = "float32",
+             mmap: bool = True, **params) -> Optional["FlatVectorIndex"]:
+        """저장된 인덱스 로드 (청크/모델 지문, dtype, 빌드 파라미터가 다르면 None)"""
+        index_dir = Path(index_dir)
+        meta_path = index_dir / "meta.json"
+        if not meta_path.exists():
+            return None
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if (meta.get("version") != VECTOR_INDEX_VERSION
+                    or meta.get("kind") != cls.kind
+                    or meta.get("index_version") != index_version
+                    or meta.get("dtype") != dtype
+                    or meta.get("params", {}) != params):
+                return None
+
+            mmap_mode = "r" if mmap else None
+            arrays = {
+                name: np.load(index_dir / f"{name}.npy", mmap_mode=mmap_mode)
+                for name in cls.array_names
+            }
+            with open(index_dir / "ids.json", "r", encoding="utf-8") as f:
+                ids = json.load(f)
+            return cls(arrays, ids, meta)
+
+        except Exception as e:
+            print(f"⚠️ 벡터 인덱스 로드 오류: {str(e)}")
+            return None
+
+
+class ReadOnlyVectorStoreError(NotImplementedError):
+    """쓰기 경로(Chroma 동기화)가 연결되지 않은 NumpyVectorStore에 쓰기를 시도한 경우"""
+
+
+class NumpyVectorStore(VectorStore):
+    """인메모리 벡터 인덱스를 LangChain VectorStore로 노출
+
+    점수는 코사인 유사도(클수록 관련성 높음)이며, 반환 문서의 metadata["score"]에도 담는다.
+    문서는 정규 청크 ID로 인덱스 행과 연결된다.
+
+    인덱스는 Chroma에서 내보내 만들므로 직접 쓰지 않는다. add_texts는 on_add
+    (VectorStoreManager.add_documents: Chroma 증분 동기화 후 인덱스 재생성)로 전달하며,
+    on_add가 없거나 from_texts로 생성하려 하면 ReadOnlyVectorStoreError를 발생시킨다.
+    """
+
+    def __init__(self, index, documents: Iterable[Document], embedding: Embeddings,
+                 on_add: Optional[Callable[[List[Document]], List[str]]] = None):
+        self.embedding = embedding
+        self.on_add = on_add
+        self.reset(index, documents)
+
+    def reset(self, index, documents: Iterable[Document]):
+        """재생성된 인덱스와 문서로 교체 (검색기가 잡고 있는 저장소 객체는 유지)"""
+        self.index = index
+        docs_by_id = {doc.metadata.get("chunk_id"): doc for doc in documents}
+        self.documents: List[Optional[Document]] = [docs_by_id.get(chunk_id) for chunk_id in index.ids]
+        self._has_orphans = any(doc is None for doc in self.documents)
+
+    @property
+    def embeddings(self) -> Optional[Embeddings]:
+        return self.embedding
+
+    def _filter_mask(self, filter: Optional[Dict]) -> np.ndarray:
+        """메타데이터 동등 조건을 만족하고 문서가 연결된 행의 마스크"""
+        return np.fromiter(
+            (
+                doc is not None and (not filter or all(
+                    doc.metadata.get(key) == value for key, value in filter.items()
+                ))
+                for doc in self.documents
+            ),
+            dtype=bool, count=len(self.documents)
+        )
+
+    def get_vectors_by_ids(self, chunk_ids: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+        """저장된 정규화 벡터 조회 - (벡터 행렬, 발견 여부), 없는 청크의 행은 0"""
+        positions = self.index.positions(chunk_ids)
+        found = positions >= 0
+        vectors = np.zeros((len(chunk_ids), self.index.dim), dtype=np.float32)
+        if found.any():
+            vectors[found] = self.index.get_vectors(positions[found])
+        return vectors, found
+
+    def similarity_search_with_score_by_vectors(
+        self, embeddings: List[List[float]], k: int = 4, filter: Optional[Dict] = None
+    ) -> List[List[Tuple[Document, float]]]:
+        """여러 질의 벡터를 한 번의 행렬 곱으로 검색"""
+        mask = self._filter_mask(filter) if filter or self._has_orphans else None
+        batched_hits = self.index.search(np.asarray(embeddings, dtype=np.float32), k, mask=mask)
+        return [
+            [
+                (Document(page_content=self.documents[position].page_content,
+                          metadata={**self.documents[position].metadata, "score": score}), score)
+                for position, score in hits
+            ]
+            for hits in batched_hits
+        ]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Optional[Dict] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vectors([embedding], k=k, filter=filter)[0]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, filter: Optional[Dict] = None, **kwargs: Any
+    ) -> List[Tuple[Document, float]]:
+        return self.similarity_search_with_score_by_vector(
+            self.embedding.embed_query(query), k=k, filter=filter
+        )
+
+    def similarity_search_by_vector(
+        self, embedding: List[float], k: int = 4, filter: Optional[Dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k, filter)]
+
+    def similarity_search(
+        self, query: str, k: int = 4, filter: Optional[Dict] = None, **kwargs: Any
+    ) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k=k, filter=filter)]
+
+    def _select_relevance_score_fn(self):
+        # 코사인 유사도를 [0, 1] 관련성 점수로 변환
+        return lambda score: (score + 1.0) / 2.0
+
+    def add_texts(self, texts: Iterable[str], metadatas: Optional[List[dict]] = None,
+                  **kwargs: Any) -> List[str]:
+        """텍스트를 Chroma 동기화 경로로 추가하고 부여된 청크 ID 반환"""
+        if self.on_add is None:
+            raise ReadOnlyVectorStoreError("Chroma 동기화 경로가 연결되지 않은 NumpyVectorStore는 읽기 전용입니다.")
+        texts = list(texts)
+        metadatas = metadatas or [{} for _ in texts]
+        documents = [Document(page_content=text, metadata=dict(metadata))
+                     for text, metadata in zip(texts, metadatas)]
+        return self.on_add(documents)
+
+    @classmethod
+    def from_texts(cls, texts: List[str], embedding: Embeddings,
+                   metadatas: Optional[List[dict]] = None, **kwargs: Any) -> "NumpyVectorStore":
+        raise ReadOnlyVectorStoreError("NumpyVectorStore는 Chroma 인덱스에서 내보내 생성합니다 "
+                                       "(VectorStoreManager.initialize_vector_store 사용).")
@@ -0,0 +1,38 @@
+"""
+페이지 인덱스 - 페이지 번호로 청크를 O(1) 조회하고 인접 페이지 컨텍스트를 중복 없이 수집
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List
+from langchain_core.documents import Document
+
+from ..config.settings import PAGE_CONTEXT_WINDOW
+
+
+class PageIndex:
+    """{페이지: 청크 위치 목록} 메모리 인덱스 (여러 페이지에 걸친 청크는 각 페이지에 등록)"""
+
+    def __init__(self, documents: List[Document]):
+        self.documents = documents
+        self._pages: Dict[int, List[int]] = defaultdict(list)
+        for position, doc in enumerate(documents):
+            start_page = int(doc.metadata.get("page", 0))
+            end_page = int(doc.metadata.get("end_page", start_page))
+            for page in range(start_page, max(start_page, end_page) + 1):
+                self._pages[page].append(position)
+
+    @property
+    def num_pages(self) -> int:
+        return len(self._pages)
+
+    def get_page(self, page: int) -> List[Document]:
+        """해당 페이지의 청크 목록"""
+        return [self.documents[position] for position in self._pages.get(page, [])]
+
+    def get_context(self, page_numbers: Iterable[int], window: int = PAGE_CONTEXT_WINDOW) -> List[Document]:
+        """요청 페이지와 앞뒤 window 페이지의 청크를 문서 순서대로 중복 없이 반환"""
+        positions = set()
+        for page_num in page_numbers:
+            for target_page in range(page_num - window, page_num + window + 1):
+                positions.update(self._pages.get(target_page, ()))
+        return [self.documents[position] for position in sorted(positions)]
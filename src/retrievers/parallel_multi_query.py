@@ -0,0 +1,97 @@
+"""
+병렬 다중 쿼리 리트리버 - 재작성 질의 생성과 원본 질의 검색을 겹쳐 실행하고 순위 융합
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..config.settings import MULTI_QUERY_COUNT, MULTI_QUERY_K, RRF_K
+from ..utils.embedding_cache import normalize_query_text
+from .fusion_retriever import fuse_rankings
+
+
+def embed_queries(embeddings, texts: List[str]) -> List[List[float]]:
+    """여러 질의를 한 번의 배치 호출로 임베딩 (캐시 임베딩이면 미적중분만)"""
+    if hasattr(embeddings, "embed_queries"):
+        return embeddings.embed_queries(texts)
+    return embeddings.embed_documents(texts)
+
+
+def search_by_vectors(vector_store, vectors: List[List[float]], k: int) -> List[List[Document]]:
+    """질의 벡터별 검색 (NumPy 저장소는 한 번의 행렬 곱, 그 외는 동시 실행)"""
+    if not vectors:
+        return []
+    if hasattr(vector_store, "similarity_search_with_score_by_vectors"):
+        batched = vector_store.similarity_search_with_score_by_vectors(vectors, k=k)
+        return [[doc for doc, _ in hits] for hits in batched]
+
+    with ThreadPoolExecutor(max_workers=len(vectors)) as executor:
+        futures = [
+            executor.submit(copy_context().run, vector_store.similarity_search_by_vector, vector, k)
+            for vector in vectors
+        ]
+        return [future.result() for future in futures]
+
+
+class ParallelMultiQueryRetriever(BaseRetriever):
+    """다중 쿼리 리트리버 (MultiQueryRetriever 대체)
+
+    LLM이 재작성 질의를 만드는 동안 원본 질의를 먼저 검색하고, 재작성 질의는 중복을
+    제거한 뒤 한 번의 배치 호출로 임베딩해 함께 검색한다. 결과는 청크 ID 기준 가중
+    RRF로 융합한다. 질의 생성이 실패하면 원본 질의 결과만 반환한다.
+    """
+
+    vector_store: Any
+    llm_chain: Any
+    k: int = MULTI_QUERY_K
+    max_queries: int = MULTI_QUERY_COUNT
+    original_weight: float = 1.0
+    rrf_k: int = RRF_K
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def generate_queries(self, query: str, callbacks=None) -> List[str]:
+        """재작성 질의 생성 (정규화 기준 중복/원본과 같은 질의 제외)"""
+        try:
+            lines = self.llm_chain.invoke({"question": query}, config={"callbacks": callbacks})
+        except Exception as e:
+            print(f"⚠️ 다중 쿼리 생성 오류, 원본 질의만 사용: {str(e)}")
+            return []
+
+        seen = {normalize_query_text(query)}
+        queries = []
+        for line in lines:
+            normalized = normalize_query_text(line)
+            if normalized and normalized not in seen:
+                seen.add(normalized)
+                queries.append(normalized)
+        return queries[:self.max_queries]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        embeddings = self.vector_store.embeddings
+
+        # 재작성 질의 생성(LLM)과 원본 질의 검색을 동시에 진행
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending_queries = executor.submit(
+                copy_context().run, self.generate_queries, query, run_manager.get_child()
+            )
+            original = search_by_vectors(self.vector_store, [embeddings.embed_query(query)], self.k)[0]
+            sub_queries = pending_queries.result()
+
+        sub_results = search_by_vectors(self.vector_store, embed_queries(embeddings, sub_queries), self.k)
+        if sub_queries:
+            print(f"🔀 다중 쿼리 {len(sub_queries)}개 생성: {' | '.join(sub_queries)}")
+
+        return fuse_rankings(
+            [original] + sub_results,
+            weights=[self.original_weight] + [1.0] * len(sub_results),
+            names=["original"] + [f"query_{i + 1}" for i in range(len(sub_results))],
+            method="rrf", rrf_k=self.rrf_k
+        )
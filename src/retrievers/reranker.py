@@ -0,0 +1,289 @@
+"""
+Cross-Encoder 재순위화 엔진 - 길이 버킷 배치 추론, 토큰 예산 절단, (질의, 청크) 점수 캐시,
+저비용 점수로 Cross-Encoder 호출을 줄이는 캐스케이드 재순위화
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from langchain_core.callbacks import Callbacks
+from langchain_core.documents import Document
+from langchain_core.documents.compressor import BaseDocumentCompressor
+from langchain_core.embeddings import Embeddings
+
+from ..config.settings import (
+    CROSS_ENCODER_MODEL, RERANKER_BACKEND, RERANKER_MODEL_PATH, RERANKER_BATCH_SIZE,
+    RERANKER_MAX_TOKENS, RERANK_CACHE_SIZE, RERANK_CACHE_TTL, DEFAULT_TOP_K,
+    CASCADE_BAND_SIZE, CASCADE_DECISIVE_MARGIN, CASCADE_SEMANTIC_WEIGHT
+)
+from ..utils.cache import LRUCache
+from ..utils.chunk_ids import get_chunk_id
+from ..utils.embedding_cache import normalize_query_text
+from ..utils.token_counter import estimate_tokens
+from .numpy_vector_store import normalize_rows
+from .stored_embedding_filters import document_vectors
+
+RERANKER_BACKENDS = ("torch", "int8", "onnx")
+
+# 문서에 최소한 남길 토큰 수 (질의가 예산을 거의 차지해도 문서가 비지 않도록)
+MIN_DOCUMENT_TOKENS = 32
+
+ScoreBatch = Callable[[List[Tuple[str, str]]], Sequence[float]]
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 예산을 넘으면 앞부분만 남김 (estimate_tokens 기준)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text.encode("utf-8")[:max(max_tokens - 1, 0) * 3].decode("utf-8", errors="ignore")
+
+
+def length_buckets(lengths: Sequence[int], batch_size: int) -> List[List[int]]:
+    """길이순으로 정렬한 위치를 batch_size개씩 묶음 (배치 내 패딩 최소화)"""
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
+def query_hash(query: str) -> str:
+    """점수 캐시 키용 질의 해시 (정규화 후)"""
+    return hashlib.sha1(normalize_query_text(query).encode("utf-8")).hexdigest()[:16]
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-logits))
+
+
+def _relevance_column(scores) -> np.ndarray:
+    """모델 출력에서 관련성 점수 열 선택 (이진 분류 모델은 양성 클래스)"""
+    scores = np.asarray(scores, dtype=np.float32)
+    if scores.ndim == 2:
+        return scores[:, 1] if scores.shape[1] > 1 else scores[:, 0]
+    return scores
+
+
+def load_score_batch(model_name: str = CROSS_ENCODER_MODEL, backend: str = RERANKER_BACKEND,
+                     model_path: Optional[str] = None, max_tokens: int = RERANKER_MAX_TOKENS) -> ScoreBatch:
+    """백엔드별 배치 점수 함수 로드 (점수는 [0, 1] 관련성)
+
+    - torch: sentence-transformers CrossEncoder
+    - int8: torch 모델의 Linear 계층을 동적 int8 양자화 (CPU 추론 가속)
+    - onnx: optimum ONNX Runtime 모델 (model_path가 없으면 로드 시 내보내기)
+    """
+    if backend not in RERANKER_BACKENDS:
+        raise ValueError(f"지원하지 않는 재순위화 백엔드입니다: {backend}")
+    source = model_path or model_name
+
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(source)
+        model = ORTModelForSequenceClassification.from_pretrained(source, export=model_path is None)
+
+        def score_batch(pairs: List[Tuple[str, str]]) -> Sequence[float]:
+            inputs = tokenizer(
+                [query for query, _ in pairs], [text for _, text in pairs],
+                padding=True, truncation="only_second", max_length=max_tokens, return_tensors="np"
+            )
+            logits = _relevance_column(model(**inputs).logits)
+            return _sigmoid(logits)
+
+        return score_batch
+
+    from sentence_transformers import CrossEncoder
+
+    cross_encoder = CrossEncoder(source, max_length=max_tokens, device="cpu")
+    if backend == "int8":
+        import torch
+        cross_encoder.model = torch.quantization.quantize_dynamic(
+            cross_encoder.model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+    def score_batch(pairs: List[Tuple[str, str]]) -> Sequence[float]:
+        # 단일 출력 모델은 CrossEncoder 기본 활성화(sigmoid)로 [0, 1] 점수를 반환
+        return _relevance_column(
+            cross_encoder.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        )
+
+    return score_batch
+
+
+class CrossEncoderRerankEngine:
+    """(질의, 문서) 쌍 점수 계산 엔진
+
+    캐시에 없는 쌍만 모델에 보내며, 문서는 토큰 예산에 맞게 자른 뒤 길이순으로 정렬해
+    batch_size개씩 추론한다(비슷한 길이끼리 묶여 패딩 낭비가 줄어든다). 점수는
+    (질의 해시, 청크 ID) 키로 LRU 캐시에 저장되어 같은 질의의 반복 재순위화는 모델을 거치지 않는다.
+    """
+
+    def __init__(self, score_batch: ScoreBatch, name: str = CROSS_ENCODER_MODEL,
+                 batch_size: int = RERANKER_BATCH_SIZE, max_tokens: int = RERANKER_MAX_TOKENS,
+                 cache_size: int = RERANK_CACHE_SIZE, cache_ttl: Optional[float] = RERANK_CACHE_TTL):
+        self.score_batch = score_batch
+        self.name = name
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.cache = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self.batches = 0
+        self.scored_pairs = 0
+
+    @classmethod
+    def load(cls, model_name: str = CROSS_ENCODER_MODEL, backend: str = RERANKER_BACKEND,
+             model_path: Optional[str] = RERANKER_MODEL_PATH, **kwargs) -> "CrossEncoderRerankEngine":
+        """설정된 백엔드로 모델을 로드하여 엔진 생성"""
+        max_tokens = kwargs.get("max_tokens", RERANKER_MAX_TOKENS)
+        score_batch = load_score_batch(model_name, backend, model_path, max_tokens)
+        return cls(score_batch, name=f"{model_path or model_name} ({backend})", **kwargs)
+
+    @staticmethod
+    def _document_key(doc: Document) -> str:
+        return get_chunk_id(doc) or hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()[:16]
+
+    def score(self, query: str, documents: Sequence[Document]) -> List[float]:
+        """문서별 관련성 점수 (캐시 우선, 나머지는 길이 버킷 배치 추론)"""
+        qhash = query_hash(query)
+        keys = [(qhash, self._document_key(doc)) for doc in documents]
+        scores: List[Optional[float]] = [self.cache.get(key) for key in keys]
+
+        # 캐시에 없는 쌍 (같은 청크가 여러 번 나오면 한 번만 추론)
+        pending: Dict[Tuple[str, str], List[int]] = {}
+        for i, (key, score) in enumerate(zip(keys, scores)):
+            if score is None:
+                pending.setdefault(key, []).append(i)
+
+        if pending:
+            document_budget = max(self.max_tokens - estimate_tokens(query), MIN_DOCUMENT_TOKENS)
+            pending_keys = list(pending)
+            texts = [
+                truncate_to_token_budget(documents[pending[key][0]].page_content, document_budget)
+                for key in pending_keys
+            ]
+            for bucket in length_buckets([len(text) for text in texts], self.batch_size):
+                batch_scores = self.score_batch([(query, texts[i]) for i in bucket])
+                self.batches += 1
+                self.scored_pairs += len(bucket)
+                for i, score in zip(bucket, batch_scores):
+                    key = pending_keys[i]
+                    self.cache.set(key, float(score))
+                    for position in pending[key]:
+                        scores[position] = float(score)
+
+        return scores
+
+    def stats(self) -> Dict[str, Any]:
+        """모델 호출 및 점수 캐시 통계"""
+        return {"model": self.name, "batches": self.batches, "scored_pairs": self.scored_pairs,
+                "cache": self.cache.stats()}
+
+
+class CrossEncoderRerankCompressor(BaseDocumentCompressor):
+    """재순위화 엔진 점수로 정렬해 상위 top_n개 반환 (CrossEncoderReranker 대체)
+
+    점수는 metadata["rerank_score"]와 metadata["score"]에 담긴다.
+    """
+
+    engine: Any
+    top_n: int = 5
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        if not documents:
+            return []
+        scores = self.engine.score(query, documents)
+        ranked = sorted(zip(documents, scores), key=lambda pair: pair[1], reverse=True)[:self.top_n]
+        return [
+            Document(page_content=doc.page_content,
+                     metadata={**doc.metadata, "rerank_score": score, "score": score})
+            for doc, score in ranked
+        ]
+
+
+class CascadeRerankCompressor(BaseDocumentCompressor):
+    """2단계 캐스케이드 재순위화
+
+    1단계는 저장된 청크 벡터의 질의 코사인과 후보 내 최대값으로 정규화한 BM25 점수를
+    가중 합산한 저비용 점수다. 코사인 1, 2위 차이가 decisive_margin 이상이고 코사인 1위가
+    BM25 1위이기도 하면 Cross-Encoder 없이 저비용 순위로 끝내고, 아니면 상위 band_size개
+    (애매한 구간)만 Cross-Encoder로 재채점한다. 정규화 BM25 점수 차는 후보 구성에 따라
+    달라지므로 조기 종료 판단에는 쓰지 않는다.
+    Cross-Encoder를 쓸 수 없으면 저비용 순위를 반환한다. 저비용 점수는
+    metadata["cheap_score"], 사용한 단계는 metadata["rerank_stage"]에 남긴다.
+    """
+
+    vector_store: Any
+    embeddings: Embeddings
+    reranker: Any = None
+    bm25_retriever: Optional[Any] = None
+    top_n: int = DEFAULT_TOP_K
+    band_size: int = CASCADE_BAND_SIZE
+    decisive_margin: float = CASCADE_DECISIVE_MARGIN
+    semantic_weight: float = CASCADE_SEMANTIC_WEIGHT
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def _signals(self, query: str, documents: Sequence[Document]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """(질의 코사인, BM25 점수 - 검색기가 없으면 None)"""
+        vectors = document_vectors(self.vector_store, self.embeddings, documents)
+        query_vector = normalize_rows(np.atleast_2d(self.embeddings.embed_query(query)))[0]
+        semantic = vectors @ query_vector
+        if self.bm25_retriever is None:
+            return semantic, None
+        return semantic, np.asarray(self.bm25_retriever.score_documents(query, documents), dtype=np.float32)
+
+    def _combine(self, semantic: np.ndarray, bm25: Optional[np.ndarray]) -> np.ndarray:
+        semantic = np.clip(semantic, 0.0, 1.0)
+        if bm25 is None:
+            return semantic
+        if bm25.max() > 0:
+            bm25 = bm25 / bm25.max()
+        return self.semantic_weight * semantic + (1.0 - self.semantic_weight) * bm25
+
+    def cheap_scores(self, query: str, documents: Sequence[Document]) -> np.ndarray:
+        """저비용 점수 (임베딩 코사인 + 정규화 BM25, [0, 1])"""
+        return self._combine(*self._signals(query, documents))
+
+    def is_decisive(self, semantic: np.ndarray, bm25: Optional[np.ndarray]) -> bool:
+        """코사인 1, 2위 차이가 decisive_margin 이상이고 BM25도 같은 문서를 1위로 보는지"""
+        if len(semantic) < 2:
+            return True
+        first, second = np.argsort(-semantic, kind="stable")[:2]
+        if float(semantic[first] - semantic[second]) < self.decisive_margin:
+            return False
+        return bm25 is None or bool(bm25[first] >= bm25.max())
+
+    @staticmethod
+    def _with_scores(doc: Document, cheap_score: float, stage: str, score: float = None) -> Document:
+        return Document(page_content=doc.page_content, metadata={
+            **doc.metadata, "cheap_score": cheap_score, "rerank_stage": stage,
+            "score": cheap_score if score is None else score
+        })
+
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        if not documents:
+            return []
+        semantic, bm25 = self._signals(query, documents)
+        cheap = self._combine(semantic, bm25)
+        order = np.argsort(-cheap, kind="stable")
+        cheap_ranked = [
+            self._with_scores(documents[i], round(float(cheap[i]), 6), "cheap") for i in order
+        ]
+
+        if self.reranker is None or self.is_decisive(semantic, bm25):
+            return cheap_ranked[:self.top_n]
+
+        # 애매한 상위 구간만 Cross-Encoder로 재채점
+        band = cheap_ranked[:max(self.band_size, self.top_n)]
+        try:
+            reranked = self.reranker.compress_documents(band, query, callbacks=callbacks)
+        except Exception as e:
+            print(f"⚠️ Cross-Encoder 재채점 실패, 저비용 순위 사용: {str(e)}")
+            return cheap_ranked[:self.top_n]
+        return [
+            self._with_scores(doc, doc.metadata["cheap_score"], "cross_encoder", doc.metadata.get("score"))
+            for doc in reranked[:self.top_n]
+        ]
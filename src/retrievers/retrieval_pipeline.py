@@ -0,0 +1,58 @@
+"""
+단계형 검색 파이프라인 - 1차 검색(검색 + 융합) 후보를 재순위화/압축 단계가 차례로 이어받아 처리
+"""
+
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from ..config.settings import DEFAULT_TOP_K
+
+
+class RetrievalPipeline(BaseRetriever):
+    """retrieve → fuse → rerank → compress 단계형 검색 파이프라인
+
+    1차 검색기(FusionRetriever면 검색과 융합까지)가 후보를 한 번만 가져오고, 이후 단계는
+    (이름, BaseDocumentCompressor) 목록으로 앞 단계의 후보만 입력받는다. 단계를 추가해도
+    검색 왕복은 늘지 않는다. 실패하거나 초기화되지 않은 단계는 건너뛰고 이전 후보를 유지한다.
+    """
+
+    retriever: Optional[Any] = None
+    stages: List[Tuple[str, Any]] = []
+    top_k: int = DEFAULT_TOP_K
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def retrieve(self, query: str, callbacks=None) -> List[Document]:
+        """1차 후보 검색"""
+        if self.retriever is None:
+            raise ValueError("1차 검색기가 지정되지 않았습니다.")
+        return self.retriever.invoke(query, config={"callbacks": callbacks})
+
+    def refine(self, query: str, documents: Sequence[Document], callbacks=None) -> List[Document]:
+        """1차 후보에 재순위화/압축 단계를 순서대로 적용"""
+        documents = list(documents)
+        for name, stage in self.stages:
+            if not documents:
+                break
+            if stage is None:
+                print(f"⚠️ '{name}' 단계가 초기화되지 않아 건너뜁니다.")
+                continue
+            start_time = time.time()
+            try:
+                refined = list(stage.compress_documents(documents, query, callbacks=callbacks))
+            except Exception as e:
+                print(f"⚠️ '{name}' 단계 오류로 이전 후보 유지: {str(e)}")
+                continue
+            print(f"   • {name}: {len(documents)}개 → {len(refined)}개 ({(time.time() - start_time) * 1000:.0f}ms)")
+            documents = refined
+        return documents
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        candidates = self.retrieve(query, callbacks=run_manager.get_child())
+        return self.refine(query, candidates, callbacks=run_manager.get_child())[:self.top_k]
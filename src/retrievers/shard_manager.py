@@ -0,0 +1,168 @@
+"""
+매뉴얼 샤드 관리 - 차량별 인덱스를 필요할 때 로드하고 메모리 예산 초과 시 LRU 해제
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+
+import numpy as np
+
+from ..config.settings import SHARD_DIR, SHARD_MEMORY_BUDGET_MB
+
+_MB = 1024 * 1024
+
+
+def get_shard_dirs(vehicle_id: str, manual: Dict) -> Dict[str, Path]:
+    """차량 매뉴얼 샤드의 인덱스 디렉터리 (index_root가 없으면 SHARD_DIR/차량 ID)"""
+    root = Path(manual.get("index_root") or Path(SHARD_DIR) / vehicle_id)
+    return {
+        "chroma_dir": root / "chroma_db",
+        "bm25_index_dir": root / "bm25_index",
+        "vector_index_dir": root / "vector_index"
+    }
+
+
+def _arrays_nbytes(obj: Any, names: List[str]) -> int:
+    """객체 속성 중 NumPy 배열의 바이트 수 합계"""
+    return sum(
+        getattr(obj, name).nbytes for name in names
+        if isinstance(getattr(obj, name, None), np.ndarray)
+    )
+
+
+class ManualShard:
+    """한 차량 매뉴얼의 검색 구성요소 묶음 (문서, 벡터/BM25 검색기, 검색 옵션)"""
+
+    def __init__(self, vehicle_id: str, manual: Dict):
+        self.vehicle_id = vehicle_id
+        self.name = manual.get("name", vehicle_id)
+        self.pdf_path = str(manual["pdf_path"])
+        self.documents = []
+        self.page_index = None
+        self.index_fingerprint = ""  # 인덱스 매니페스트 지문 (답변 캐시 무효화 기준)
+        self.vector_manager = None
+        self.hybrid_manager = None
+        self.compression_manager = None
+        self.search_options: Dict[str, Any] = {}
+        self.rerank_compression_options: Dict[str, Any] = {}
+        self.search_subgraph = None
+        self.tool_components: Dict[str, Any] = {}
+        self.warmup_thread = None
+        self.loaded_at = time.time()
+
+    def estimate_memory_mb(self) -> float:
+        """샤드가 점유하는 메모리 추정치 (청크 텍스트 + 벡터 행렬 + BM25 배열)"""
+        total = sum(
+            len(doc.page_content.encode("utf-8")) + len(str(doc.metadata))
+            for doc in self.documents
+        )
+        search_store = self.vector_manager.get_search_store() if self.vector_manager else None
+        index = getattr(search_store, "index", None)
+        if index is not None:
+            total += _arrays_nbytes(index, list(index.array_names))
+        bm25_index = self.hybrid_manager.get_bm25_index() if self.hybrid_manager else None
+        if bm25_index is not None:
+            total += _arrays_nbytes(bm25_index, [
+                "term_offsets", "postings_docs", "postings_tfs", "doc_freqs",
+                "doc_lengths", "token_offsets", "token_ids", "idf", "length_norms"
+            ])
+            total += sum(len(term.encode("utf-8")) for term in bm25_index.terms)
+        return total / _MB
+
+
+class ShardManager:
+    """차량 ID로 매뉴얼 샤드를 지연 로드하고 메모리 예산 내에서 LRU로 유지
+
+    같은 샤드를 동시에 요청하면 한 번만 로드하며, 다른 샤드의 로드나 조회는 막지 않는다.
+    예산을 넘으면 방금 사용한 샤드와 고정(pinned) 샤드를 제외하고 가장 오래 사용하지
+    않은 샤드부터 해제한다.
+    """
+
+    def __init__(self, catalog: Dict[str, Dict], build_shard: Callable[[str, Dict], ManualShard],
+                 memory_budget_mb: float = SHARD_MEMORY_BUDGET_MB, pinned: Iterable[str] = ()):
+        self.catalog = catalog
+        self.build_shard = build_shard
+        self.memory_budget_mb = memory_budget_mb
+        self.pinned = set(pinned)
+        self._shards: "OrderedDict[str, ManualShard]" = OrderedDict()
+        self._memory_mb: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, vehicle_id: str) -> ManualShard:
+        """차량 샤드 반환 (로드되어 있지 않으면 로드 후 필요 시 다른 샤드 해제)"""
+        if vehicle_id not in self.catalog:
+            raise ValueError(f"등록되지 않은 차량 ID입니다: {vehicle_id}")
+
+        with self._lock:
+            shard = self._shards.get(vehicle_id)
+            if shard is not None:
+                self._shards.move_to_end(vehicle_id)
+                return shard
+            load_lock = self._load_locks.setdefault(vehicle_id, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                shard = self._shards.get(vehicle_id)
+                if shard is not None:
+                    self._shards.move_to_end(vehicle_id)
+                    return shard
+
+            start_time = time.time()
+            print(f"📂 매뉴얼 샤드 로드 중: {vehicle_id}")
+            shard = self.build_shard(vehicle_id, self.catalog[vehicle_id])
+            memory_mb = shard.estimate_memory_mb()
+            print(f"✅ 매뉴얼 샤드 로드 완료: {shard.name} "
+                  f"({memory_mb:.1f}MB, {time.time() - start_time:.2f}초)")
+
+            with self._lock:
+                self._shards[vehicle_id] = shard
+                self._memory_mb[vehicle_id] = memory_mb
+                self._evict_over_budget(keep=vehicle_id)
+            return shard
+
+    def _evict_over_budget(self, keep: str):
+        """메모리 예산을 넘는 동안 가장 오래된 샤드 해제 (잠금 보유 상태에서 호출)"""
+        while self.memory_usage_mb() > self.memory_budget_mb:
+            candidates = [
+                vehicle_id for vehicle_id in self._shards
+                if vehicle_id != keep and vehicle_id not in self.pinned
+            ]
+            if not candidates:
+                break
+            self._remove(candidates[0])
+
+    def _remove(self, vehicle_id: str):
+        self._shards.pop(vehicle_id, None)
+        memory_mb = self._memory_mb.pop(vehicle_id, 0.0)
+        print(f"♻️ 매뉴얼 샤드 해제: {vehicle_id} ({memory_mb:.1f}MB)")
+
+    def evict(self, vehicle_id: str):
+        """샤드 명시적 해제"""
+        with self._lock:
+            if vehicle_id in self._shards:
+                self._remove(vehicle_id)
+
+    def is_loaded(self, vehicle_id: str) -> bool:
+        return vehicle_id in self._shards
+
+    def loaded_vehicle_ids(self) -> List[str]:
+        """로드된 차량 ID (오래 사용하지 않은 순)"""
+        with self._lock:
+            return list(self._shards)
+
+    def memory_usage_mb(self) -> float:
+        return sum(self._memory_mb.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """샤드 로드 현황"""
+        with self._lock:
+            return {
+                "catalog_size": len(self.catalog),
+                "loaded": list(self._shards),
+                "memory_mb": round(self.memory_usage_mb(), 1),
+                "memory_budget_mb": self.memory_budget_mb
+            }
@@ -0,0 +1,104 @@
+"""
+저장 임베딩 기반 압축 필터 - 후보 청크를 재임베딩하지 않고 벡터 저장소의 벡터로 유사도/중복 계산
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+import numpy as np
+from langchain_core.callbacks import Callbacks
+from langchain_core.documents import Document
+from langchain_core.documents.compressor import BaseDocumentCompressor
+from langchain_core.embeddings import Embeddings
+
+from ..utils.chunk_ids import get_chunk_id
+from .numpy_vector_store import normalize_rows
+
+
+def lookup_stored_vectors(vector_store, chunk_ids: List[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """벡터 저장소에서 청크 ID로 벡터 조회 - (벡터 행렬, 발견 여부)
+
+    NumPy 저장소는 메모리 행렬에서, Chroma는 컬렉션에 저장된 임베딩에서 가져온다.
+    """
+    if hasattr(vector_store, "get_vectors_by_ids"):
+        return vector_store.get_vectors_by_ids(chunk_ids)
+
+    found = np.zeros(len(chunk_ids), dtype=bool)
+    collection = getattr(vector_store, "_collection", None)
+    known_ids = [chunk_id for chunk_id in chunk_ids if chunk_id]
+    if collection is None or not known_ids:
+        return np.zeros((len(chunk_ids), 0), dtype=np.float32), found
+
+    batch = collection.get(ids=known_ids, include=["embeddings"])
+    stored = dict(zip(batch["ids"], batch["embeddings"]))
+    dim = len(next(iter(stored.values()))) if stored else 0
+    vectors = np.zeros((len(chunk_ids), dim), dtype=np.float32)
+    for i, chunk_id in enumerate(chunk_ids):
+        if chunk_id in stored:
+            vectors[i] = stored[chunk_id]
+            found[i] = True
+    return normalize_rows(vectors), found
+
+
+def document_vectors(vector_store, embeddings: Embeddings, documents: Sequence[Document]) -> np.ndarray:
+    """문서들의 정규화 벡터 (저장 벡터 우선, 저장소에 없는 청크만 임베딩)"""
+    vectors, found = lookup_stored_vectors(vector_store, [get_chunk_id(doc) for doc in documents])
+    if not found.all():
+        missing = np.flatnonzero(~found)
+        embedded = normalize_rows(embeddings.embed_documents([documents[i].page_content for i in missing]))
+        if vectors.shape[1] == 0:
+            vectors = np.zeros((len(documents), embedded.shape[1]), dtype=np.float32)
+        vectors[missing] = embedded
+    return vectors
+
+
+class StoredEmbeddingsFilter(BaseDocumentCompressor):
+    """질의 유사도가 임계값 이하인 문서 제거 (EmbeddingsFilter 대체, 문서 재임베딩 없음)"""
+
+    vector_store: Any
+    embeddings: Embeddings
+    similarity_threshold: float = 0.6
+    k: Optional[int] = None
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        if not documents:
+            return []
+        vectors = document_vectors(self.vector_store, self.embeddings, documents)
+        query_vector = normalize_rows(np.atleast_2d(self.embeddings.embed_query(query)))[0]
+        similarity = vectors @ query_vector
+
+        included = np.arange(len(documents))
+        if self.k is not None:
+            included = np.argsort(-similarity)[:self.k]
+        included = included[similarity[included] > self.similarity_threshold]
+        return [
+            Document(page_content=documents[i].page_content,
+                     metadata={**documents[i].metadata, "query_similarity_score": float(similarity[i])})
+            for i in included
+        ]
+
+
+class StoredEmbeddingsRedundantFilter(BaseDocumentCompressor):
+    """앞선 문서와 유사도가 임계값을 넘는 문서 제거 (EmbeddingsRedundantFilter 대체)"""
+
+    vector_store: Any
+    embeddings: Embeddings
+    similarity_threshold: float = 0.95
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        if len(documents) < 2:
+            return list(documents)
+        vectors = document_vectors(self.vector_store, self.embeddings, documents)
+        similarity = vectors @ vectors.T
+
+        kept: List[int] = []
+        for i in range(len(documents)):
+            if not kept or similarity[i, kept].max() <= self.similarity_threshold:
+                kept.append(i)
+        return [documents[i] for i in kept]
@@ -3,89 +3,221 @@
 """
 
 import os
-from typing import List
+from typing import Dict, List
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
 from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from ..config.settings import (
-    DEFAULT_PDF_PATH, CHROMA_DB_DIR, CHUNK_SIZE, CHUNK_OVERLAP, BATCH_SIZE
+    DEFAULT_PDF_PATH, CHROMA_DB_DIR, BATCH_SIZE,
+    VECTOR_BACKEND, VECTOR_INDEX_DIR, VECTOR_INDEX_DTYPE, VECTOR_INDEX_TYPE,
+    IVF_NLIST, IVF_NPROBE, IVF_TRAIN_ITERATIONS
 )
+from ..utils.document_loader import DocumentLoader, get_chunking_config
+from ..utils.chunk_ids import assign_chunk_ids
+from .index_manifest import IndexManifest, build_chunk_hashes
+from .embedding_pipeline import EmbeddingIngestionPipeline, EmbeddingIngestionError
+from .numpy_vector_store import FlatVectorIndex, NumpyVectorStore, export_chroma_embeddings
+from .ann_index import IVFVectorIndex
+
+
+def get_vector_index_spec(index_type: str = VECTOR_INDEX_TYPE):
+    """인덱스 유형별 (인덱스 클래스, 빌드 파라미터) 반환"""
+    if index_type == "flat":
+        return FlatVectorIndex, {}
+    if index_type == "ivf":
+        return IVFVectorIndex, {"nlist": IVF_NLIST, "iterations": IVF_TRAIN_ITERATIONS}
+    raise ValueError(f"지원하지 않는 벡터 인덱스 유형: {index_type}")
 
 
 class VectorStoreManager:
     """벡터 저장소 관리 클래스"""
     
-    def __init__(self, pdf_path: str = None):
+    def __init__(self, pdf_path: str = None, chroma_dir: str = None, vector_index_dir: str = None,
+                 embeddings=None):
         self.pdf_path = pdf_path or str(DEFAULT_PDF_PATH)
-        self.embeddings = OpenAIEmbeddings()
+        self.chroma_dir = str(chroma_dir or CHROMA_DB_DIR)
+        self.vector_index_dir = str(vector_index_dir or VECTOR_INDEX_DIR)
+        self.embeddings = embeddings or OpenAIEmbeddings()
         self.vector_store = None
+        self.search_store = None
+        self.manifest = None
+        self.documents: List[Document] = []
+        self.chunking: Dict = None
         
-    def initialize_vector_store(self):
-        """벡터 저장소 초기화 및 PDF 문서 로드"""
+    def initialize_vector_store(self, documents: List[Document] = None,
+                                backend: str = VECTOR_BACKEND, chunking: Dict = None):
+        """벡터 저장소 초기화 후 검색용 저장소 반환 (청크 저장소의 분할 문서 사용)
+        
+        Chroma는 임베딩 원본 저장소로 항상 동기화하고, backend가 "numpy"이면
+        Chroma 임베딩을 내보낸 메모리 매핑 행렬로 검색한다. chunking은 documents를
+        실제로 만든 청킹 설정이며 매니페스트에 기록된다 (없으면 기본 설정).
+        """
         try:
             # PDF 파일 존재 확인
             if not os.path.exists(self.pdf_path):
                 print(f"경고: PDF 파일을 찾을 수 없습니다: {self.pdf_path}")
                 return None
             
-            print(f"PDF 파일 로딩 중: {self.pdf_path}")
-            
-            # PDF 로더로 문서 로드
-            loader = PyPDFLoader(self.pdf_path)
-            documents = loader.load()
+            # 분할 문서가 전달되지 않으면 청크 저장소에서 로드
+            split_docs = documents
+            if split_docs is None:
+                loader = DocumentLoader()
+                split_docs = loader.load_and_split_pdf(self.pdf_path)
+                chunking = loader.last_chunking_config
+            print(f"벡터 저장소 대상 문서 조각 수: {len(split_docs)}")
             
-            print(f"로드된 페이지 수: {len(documents)}")
-            
-            # 텍스트 분할 (토큰 제한을 고려하여 더 작은 청크로 분할)
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=CHUNK_SIZE,
-                chunk_overlap=CHUNK_OVERLAP,
-                length_function=len,
+            # 벡터 저장소 열기 (없으면 생성)
+            persist_directory = self.chroma_dir
+            self.vector_store = Chroma(
+                persist_directory=persist_directory,
+                embedding_function=self.embeddings
             )
             
-            split_docs = text_splitter.split_documents(documents)
-            print(f"분할된 문서 조각 수: {len(split_docs)}")
-            
-            # 벡터 저장소 생성
-            persist_directory = str(CHROMA_DB_DIR)
+            # 매니페스트와 현재 청크 해시를 비교하여 증분 인덱싱
+            self.chunking = chunking or get_chunking_config()
+            self._sync_index(split_docs, persist_directory, self.chunking)
+            self.documents = list(split_docs)
             
-            # 기존 데이터베이스가 있는지 확인
-            if os.path.exists(persist_directory) and os.listdir(persist_directory):
-                print("기존 벡터 데이터베이스 로드 중...")
-                self.vector_store = Chroma(
-                    persist_directory=persist_directory,
-                    embedding_function=self.embeddings
-                )
-            else:
-                print("새로운 벡터 데이터베이스 생성 중...")
-                
-                # 배치 처리로 문서 추가 (토큰 제한 회피)
-                self.vector_store = Chroma(
-                    persist_directory=persist_directory,
-                    embedding_function=self.embeddings
-                )
-                
-                print(f"총 {len(split_docs)}개 문서를 {BATCH_SIZE}개씩 배치 처리...")
-                
-                for i in range(0, len(split_docs), BATCH_SIZE):
-                    batch = split_docs[i:i+BATCH_SIZE]
-                    try:
-                        self.vector_store.add_documents(batch)
-                        print(f"배치 {i//BATCH_SIZE + 1}/{(len(split_docs)-1)//BATCH_SIZE + 1} 완료")
-                    except Exception as batch_error:
-                        print(f"배치 {i//BATCH_SIZE + 1} 오류: {str(batch_error)}")
-                        continue
+            self.search_store = self.vector_store
+            if backend == "numpy":
+                numpy_store = self._load_or_build_numpy_store(split_docs)
+                if numpy_store is not None:
+                    self.search_store = numpy_store
             
             print("벡터 저장소 초기화 완료!")
-            return self.vector_store
+            return self.search_store
             
         except Exception as e:
             print(f"벡터 저장소 초기화 오류: {str(e)}")
             return None
     
+    def _sync_index(self, split_docs: List[Document], persist_directory: str, chunking: Dict):
+        """신규/변경 청크만 임베딩하고 제거된 청크는 삭제"""
+        embedding_model = getattr(self.embeddings, "model", "unknown")
+        manifest = IndexManifest(persist_directory)
+        
+        current_chunks = build_chunk_hashes(split_docs)
+        docs_by_id = dict(zip(current_chunks.keys(), split_docs))
+        
+        pipeline = EmbeddingIngestionPipeline(
+            embeddings=self.embeddings,
+            vector_store=self.vector_store,
+            index_dir=persist_directory,
+            embedding_model=embedding_model
+        )
+        
+        # 매니페스트에 기록된 청크 + 중단된 빌드의 체크포인트 청크는 이미 인덱스에 존재
+        indexed_chunks = manifest.get_indexed_chunks(embedding_model)
+        resumed_chunks = pipeline.checkpoint.load()
+        if resumed_chunks:
+            print(f"⏯️  중단된 인덱스 빌드 이어서 진행: {len(resumed_chunks)}개 청크 완료 상태")
+            indexed_chunks.update(resumed_chunks)
+        
+        if not manifest.is_compatible(embedding_model):
+            # 매니페스트가 없거나 임베딩 모델이 바뀐 경우 출처를 알 수 없는 기존 벡터 폐기
+            stale_ids = [
+                chunk_id for chunk_id in self.vector_store.get(include=[]).get("ids", [])
+                if chunk_id not in indexed_chunks
+            ]
+            if stale_ids:
+                print(f"호환되지 않는 기존 인덱스 발견: {len(stale_ids)}개 벡터 삭제 후 재색인")
+                self._delete_ids(stale_ids)
+        
+        to_add, to_delete = IndexManifest.diff(indexed_chunks, current_chunks)
+        print(f"인덱스 동기화: 추가 {len(to_add)}개, 삭제 {len(to_delete)}개, "
+              f"유지 {len(current_chunks) - len(to_add)}개")
+        
+        if to_delete:
+            self._delete_ids(to_delete)
+            for chunk_id in to_delete:
+                indexed_chunks.pop(chunk_id, None)
+        
+        # 동시 배치 임베딩 (토큰 예산 제한 + 재시도 + 체크포인트)
+        ingestion_error = None
+        try:
+            completed_ids = pipeline.run(
+                {chunk_id: docs_by_id[chunk_id] for chunk_id in to_add},
+                {chunk_id: current_chunks[chunk_id] for chunk_id in to_add}
+            )
+        except EmbeddingIngestionError as e:
+            ingestion_error = e
+            completed_ids = set(to_add) - set(e.failed_ids)
+        
+        for chunk_id in completed_ids:
+            indexed_chunks[chunk_id] = current_chunks[chunk_id]
+        
+        # 성공한 청크만 매니페스트에 반영 (실패분은 다음 실행에서 재시도)
+        manifest.save(
+            embedding_model=embedding_model,
+            chunking=chunking,
+            chunks=indexed_chunks
+        )
+        self.manifest = manifest
+        
+        if ingestion_error is not None:
+            raise ingestion_error
+        pipeline.checkpoint.clear()
+    
+    def _load_or_build_numpy_store(self, split_docs: List[Document]):
+        """NumPy 인덱스를 준비해 검색용 저장소 생성 (실패하면 None)"""
+        try:
+            index = self._load_or_build_numpy_index(split_docs)
+            return NumpyVectorStore(index, split_docs, self.embeddings, on_add=self.add_documents)
+        
+        except Exception as e:
+            print(f"⚠️ NumPy 벡터 인덱스 준비 오류, Chroma 검색으로 대체: {str(e)}")
+            return None
+    
+    def _load_or_build_numpy_index(self, split_docs: List[Document]):
+        """매니페스트 지문과 인덱스 설정이 같으면 저장된 인덱스를 메모리 매핑, 다르면 Chroma에서 내보내 재생성"""
+        index_version = self.manifest.fingerprint
+        index_cls, params = get_vector_index_spec(VECTOR_INDEX_TYPE)
+        index = index_cls.load(self.vector_index_dir, index_version, dtype=VECTOR_INDEX_DTYPE, **params)
+        if index is not None:
+            print(f"📦 저장된 벡터 인덱스 로드 ({index.kind}): "
+                  f"{index.num_vectors}개 x {index.dim}차원 ({VECTOR_INDEX_DTYPE})")
+        else:
+            ids = [doc.metadata["chunk_id"] for doc in split_docs]
+            print(f"🧮 Chroma 임베딩 내보내는 중: {len(ids)}개 청크")
+            embeddings = export_chroma_embeddings(self.vector_store, ids)
+            index = index_cls.build(ids, embeddings, index_version, dtype=VECTOR_INDEX_DTYPE, **params)
+            index.save(self.vector_index_dir)
+            index = index_cls.load(self.vector_index_dir, index_version, dtype=VECTOR_INDEX_DTYPE, **params) or index
+        if isinstance(index, IVFVectorIndex):
+            index.nprobe = IVF_NPROBE
+        return index
+    
+    def add_documents(self, documents: List[Document]) -> List[str]:
+        """문서를 Chroma에 증분 색인하고 NumPy 검색 인덱스를 재생성한 뒤 부여된 청크 ID 반환
+        
+        기존 청크 뒤에 이어 붙여 ID를 부여하므로 기존 청크의 ID는 바뀌지 않는다.
+        """
+        all_docs = self.documents + list(documents)
+        assign_chunk_ids(all_docs)
+        self._sync_index(all_docs, self.chroma_dir, self.chunking or get_chunking_config())
+        self.documents = all_docs
+        
+        if isinstance(self.search_store, NumpyVectorStore):
+            self.search_store.reset(self._load_or_build_numpy_index(all_docs), all_docs)
+        return [doc.metadata["chunk_id"] for doc in documents]
+    
+    def _delete_ids(self, ids: List[str]):
+        """벡터 ID 목록을 배치 단위로 삭제"""
+        for i in range(0, len(ids), BATCH_SIZE):
+            self.vector_store.delete(ids=ids[i:i+BATCH_SIZE])
+    
     def get_vector_store(self):
-        """벡터 저장소 반환"""
+        """벡터 저장소 반환 (Chroma 원본)"""
         return self.vector_store
+    
+    def set_search_params(self, nprobe: int = None):
+        """근사 인덱스의 재현율/지연 파라미터 조정 (정확 검색 인덱스면 무시)"""
+        index = getattr(self.search_store, "index", None)
+        if isinstance(index, IVFVectorIndex) and nprobe:
+            index.nprobe = nprobe
+            print(f"🎚️ IVF nprobe = {nprobe} / {index.nlist}")
+    
+    def get_search_store(self):
+        """검색용 저장소 반환 (NumPy 백엔드 또는 Chroma)"""
+        return self.search_store
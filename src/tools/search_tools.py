@@ -2,38 +2,94 @@
 검색 관련 도구들
 """
 
-from typing import List, Dict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, List, Dict, Optional
 from langchain_core.tools import tool
-from ..config.settings import VEHICLE_TERMS
 
-# 전역 변수로 검색기들 관리
+# 전역 변수로 검색기들 관리 (기본 차량 매뉴얼)
 vector_store = None
 bm25_retriever = None
 hybrid_retriever = None
+expanded_query_retriever = None
 multi_query_retriever = None
 cross_encoder_retriever = None
 compression_retriever = None
+page_index = None
+
+# 요청별 검색기 묶음 (차량 매뉴얼 샤드, 없으면 전역 변수 사용)
+_active_components: ContextVar[Optional[Dict[str, Any]]] = ContextVar("search_components", default=None)
+
+
+@contextmanager
+def use_components(components: Optional[Dict[str, Any]]):
+    """현재 요청의 검색 도구가 사용할 검색기 묶음 지정 (None이면 전역 변수 유지)"""
+    if components is None:
+        yield
+        return
+    token = _active_components.set(components)
+    try:
+        yield
+    finally:
+        _active_components.reset(token)
+
+
+def get_component(name: str) -> Any:
+    """현재 요청의 검색기 반환 (샤드 묶음 우선, 없으면 전역 변수)"""
+    components = _active_components.get()
+    if components is not None:
+        return components.get(name)
+    return globals()[name]
+
+
+def _set_component(name: str, value: Any):
+    components = _active_components.get()
+    if components is not None:
+        components[name] = value
+    else:
+        globals()[name] = value
+
+
+def document_to_result(doc, score: float = None) -> Dict:
+    """검색 결과 dict 변환 (정규 청크 ID 포함)"""
+    result = {
+        "content": doc.page_content,
+        "page": doc.metadata.get("page", 0),
+        "source": doc.metadata.get("source", ""),
+        "chunk_id": doc.metadata.get("chunk_id")
+    }
+    if score is not None:
+        result["score"] = score
+    return result
+
+
+def dedupe_results(results: List[Dict]) -> List[Dict]:
+    """청크 ID 기준 중복 제거 (ID가 없으면 내용 기준, 먼저 나온 결과 유지)"""
+    seen = set()
+    unique_results = []
+    for result in results:
+        key = result.get("chunk_id") or result.get("content")
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_results.append(result)
+    return unique_results
 
 
 @tool
 def vector_search(query: str, top_k: int = 5) -> List[Dict]:
     """벡터 유사도 검색으로 관련 문서 찾기"""
-    global vector_store
+    vector_store = get_component("vector_store")
     if vector_store is None:
         return [{"content": "벡터 저장소가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
     
     try:
-        # 벡터 검색 수행
-        results = vector_store.similarity_search_with_score(query, k=top_k)
+        # 벡터 검색 수행 (백엔드와 무관하게 [0, 1] 관련성 점수, 클수록 관련성 높음)
+        results = vector_store.similarity_search_with_relevance_scores(query, k=top_k)
         
         search_results = []
         for doc, score in results:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": float(score)
-            })
+            search_results.append(document_to_result(doc, float(score)))
         
         return search_results
     except Exception as e:
@@ -43,7 +99,7 @@ def vector_search(query: str, top_k: int = 5) -> List[Dict]:
 @tool  
 def keyword_search(query: str, keywords: List[str] = None) -> List[Dict]:
     """키워드 기반 정확한 검색"""
-    global vector_store
+    vector_store = get_component("vector_store")
     if vector_store is None:
         return [{"content": "벡터 저장소가 초기화되지 않았습니다.", "page": 0}]
     
@@ -58,11 +114,7 @@ def keyword_search(query: str, keywords: List[str] = None) -> List[Dict]:
         
         search_results = []
         for doc in results:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", "")
-            })
+            search_results.append(document_to_result(doc))
         
         return search_results
     except Exception as e:
@@ -72,27 +124,13 @@ def keyword_search(query: str, keywords: List[str] = None) -> List[Dict]:
 @tool
 def page_context_search(page_numbers: List[int]) -> List[Dict]:
     """특정 페이지 주변 컨텍스트 수집"""
-    global vector_store
-    if vector_store is None:
-        return [{"content": "벡터 저장소가 초기화되지 않았습니다.", "page": 0}]
+    page_index = get_component("page_index")
+    if page_index is None:
+        return [{"content": "페이지 인덱스가 초기화되지 않았습니다.", "page": 0}]
     
     try:
-        results = []
-        for page_num in page_numbers:
-            # 특정 페이지와 인접 페이지 검색
-            for offset in [-1, 0, 1]:  # 이전, 현재, 다음 페이지
-                target_page = page_num + offset
-                if target_page > 0:
-                    # 페이지 번호로 필터링하여 검색
-                    page_docs = vector_store.get(where={"page": target_page})
-                    if page_docs and 'documents' in page_docs:
-                        for i, content in enumerate(page_docs['documents']):
-                            metadata = page_docs.get('metadatas', [{}])[i] if page_docs.get('metadatas') else {}
-                            results.append({
-                                "content": content,
-                                "page": target_page,
-                                "source": metadata.get("source", "")
-                            })
+        # 페이지 인덱스에서 이전/현재/다음 페이지 청크를 중복 없이 조회
+        results = [document_to_result(doc) for doc in page_index.get_context(page_numbers)]
         
         return results if results else [{"content": "해당 페이지를 찾을 수 없습니다.", "page": 0}]
     except Exception as e:
@@ -102,7 +140,7 @@ def page_context_search(page_numbers: List[int]) -> List[Dict]:
 @tool
 def bm25_search(query: str, top_k: int = 5) -> List[Dict]:
     """키워드 기반 BM25 검색"""
-    global bm25_retriever
+    bm25_retriever = get_component("bm25_retriever")
     if bm25_retriever is None:
         return [{"content": "BM25 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
     
@@ -112,12 +150,7 @@ def bm25_search(query: str, top_k: int = 5) -> List[Dict]:
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": 1.0  # BM25는 점수를 직접 반환하지 않음
-            })
+            search_results.append(document_to_result(doc, doc.metadata.get("score", 0.0)))  # 역색인 BM25 점수
         
         return search_results
     except Exception as e:
@@ -127,27 +160,26 @@ def bm25_search(query: str, top_k: int = 5) -> List[Dict]:
 @tool
 def hybrid_search(query: str, top_k: int = 5, semantic_weight: float = 0.5) -> List[Dict]:
     """하이브리드 검색 (벡터 + BM25)"""
-    global hybrid_retriever, vector_store, bm25_retriever
+    hybrid_retriever = get_component("hybrid_retriever")
+    vector_store = get_component("vector_store")
+    bm25_retriever = get_component("bm25_retriever")
     
-    # 하이브리드 검색기가 없거나 가중치가 다른 경우 재생성
-    if (hybrid_retriever is None or 
-        getattr(hybrid_retriever, '_weights', [0.5, 0.5])[0] != semantic_weight):
+    # 하이브리드 검색기가 없거나 가중치/개수가 다른 경우 재생성
+    if (hybrid_retriever is None or
+        hybrid_retriever.weights[0] != semantic_weight or
+        getattr(hybrid_retriever.retrievers[0], "k", top_k) != top_k):
         
         if vector_store is None or bm25_retriever is None:
             return [{"content": "벡터 저장소 또는 BM25 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
         
         try:
-            from langchain.retrievers import EnsembleRetriever
+            from ..retrievers.fusion_retriever import FusionRetriever
             
-            # 하이브리드 검색기 생성
-            semantic_retriever = vector_store.as_retriever(search_kwargs={"k": top_k})
-            keyword_weight = 1.0 - semantic_weight
-            
-            hybrid_retriever = EnsembleRetriever(
-                retrievers=[semantic_retriever, bm25_retriever],
-                weights=[semantic_weight, keyword_weight]
+            # 벡터/BM25를 동시에 실행하는 융합 검색기 생성
+            hybrid_retriever = FusionRetriever.hybrid(
+                vector_store, bm25_retriever, semantic_weight, top_k=top_k
             )
-            hybrid_retriever._weights = [semantic_weight, keyword_weight]  # 가중치 저장
+            _set_component("hybrid_retriever", hybrid_retriever)
             
         except Exception as e:
             return [{"content": f"하이브리드 검색기 생성 오류: {str(e)}", "page": 0, "score": 0.0}]
@@ -158,12 +190,7 @@ def hybrid_search(query: str, top_k: int = 5, semantic_weight: float = 0.5) -> L
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": 1.0  # 하이브리드는 점수를 직접 반환하지 않음
-            })
+            search_results.append(document_to_result(doc, doc.metadata.get("score")))  # 융합 점수 [0, 1]
         
         return search_results
     except Exception as e:
@@ -173,7 +200,7 @@ def hybrid_search(query: str, top_k: int = 5, semantic_weight: float = 0.5) -> L
 @tool
 def multi_query_search(query: str, top_k: int = 5) -> List[Dict]:
     """다중 쿼리 생성 후 검색"""
-    global multi_query_retriever
+    multi_query_retriever = get_component("multi_query_retriever")
     
     if multi_query_retriever is None:
         return [{"content": "다중 쿼리 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
@@ -184,12 +211,7 @@ def multi_query_search(query: str, top_k: int = 5) -> List[Dict]:
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": 1.0
-            })
+            search_results.append(document_to_result(doc, doc.metadata.get("score")))  # 벡터 저장소 점수 (있는 경우)
         
         return search_results
     except Exception as e:
@@ -199,37 +221,36 @@ def multi_query_search(query: str, top_k: int = 5) -> List[Dict]:
 @tool
 def expanded_query_search(query: str, top_k: int = 5) -> List[Dict]:
     """차량 전문 용어로 쿼리 확장 후 검색"""
-    global hybrid_retriever
-    
-    if hybrid_retriever is None:
-        return [{"content": "하이브리드 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
+    expanded_query_retriever = get_component("expanded_query_retriever")
     
-    try:
-        # 쿼리 확장
-        expanded_terms = []
-        query_lower = query.lower()
-        
-        for key, synonyms in VEHICLE_TERMS.items():
-            if key in query_lower:
-                expanded_terms.extend(synonyms)
+    # 확장 검색기가 없거나 개수가 다른 경우 재생성
+    if (expanded_query_retriever is None or
+        getattr(expanded_query_retriever.retrievers[0], "k", top_k) != top_k):
+        vector_store = get_component("vector_store")
+        bm25_retriever = get_component("bm25_retriever")
         
-        # 기본 쿼리에 확장 용어 추가
-        if expanded_terms:
-            expanded_query = f"{query} {' '.join(expanded_terms)}"
-        else:
-            expanded_query = query
+        if vector_store is None or bm25_retriever is None:
+            return [{"content": "벡터 저장소 또는 BM25 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
         
-        # 확장된 쿼리로 검색
-        results = hybrid_retriever.invoke(expanded_query)
+        try:
+            from ..config.settings import WEIGHT_CONFIGS
+            from ..retrievers.expanded_query_retriever import build_expanded_retriever
+            
+            # 동의어는 BM25 가중 질의 용어로, 용어 그룹은 질의 벡터 평균으로 반영 (검색 1회)
+            expanded_query_retriever = build_expanded_retriever(
+                vector_store, bm25_retriever, WEIGHT_CONFIGS["hybrid_semantic"], top_k=top_k
+            )
+            _set_component("expanded_query_retriever", expanded_query_retriever)
+            
+        except Exception as e:
+            return [{"content": f"확장 쿼리 검색기 생성 오류: {str(e)}", "page": 0, "score": 0.0}]
+    
+    try:
+        results = expanded_query_retriever.invoke(query)
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": 1.0
-            })
+            search_results.append(document_to_result(doc, doc.metadata.get("score")))  # 융합 점수 [0, 1]
         
         return search_results
     except Exception as e:
@@ -239,7 +260,7 @@ def expanded_query_search(query: str, top_k: int = 5) -> List[Dict]:
 @tool
 def cross_encoder_rerank_search(query: str, top_k: int = 5) -> List[Dict]:
     """Cross-Encoder 모델을 사용한 재순위화 검색"""
-    global cross_encoder_retriever
+    cross_encoder_retriever = get_component("cross_encoder_retriever")
     
     if cross_encoder_retriever is None:
         return [{"content": "Cross-Encoder 재순위화 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
@@ -250,12 +271,7 @@ def cross_encoder_rerank_search(query: str, top_k: int = 5) -> List[Dict]:
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": getattr(doc, 'score', 1.0)  # Cross-Encoder 점수
-            })
+            search_results.append(document_to_result(doc, doc.metadata.get("score")))  # 1차 검색 점수 (있는 경우)
         
         return search_results
     except Exception as e:
@@ -265,7 +281,7 @@ def cross_encoder_rerank_search(query: str, top_k: int = 5) -> List[Dict]:
 @tool
 def contextual_compression_search(query: str, top_k: int = 5) -> List[Dict]:
     """맥락 압축을 사용한 검색 (관련 정보만 추출)"""
-    global compression_retriever
+    compression_retriever = get_component("compression_retriever")
     
     if compression_retriever is None:
         return [{"content": "맥락 압축 검색기가 초기화되지 않았습니다.", "page": 0, "score": 0.0}]
@@ -276,12 +292,9 @@ def contextual_compression_search(query: str, top_k: int = 5) -> List[Dict]:
         
         search_results = []
         for doc in results[:top_k]:
-            search_results.append({
-                "content": doc.page_content,
-                "page": doc.metadata.get("page", 0),
-                "source": doc.metadata.get("source", ""),
-                "score": 1.0  # 압축된 문서는 모두 관련성 높음
-            })
+            search_results.append(document_to_result(  # 임베딩 필터의 질의 유사도
+                doc, doc.metadata.get("query_similarity_score", doc.metadata.get("score"))
+            ))
         
         return search_results
     except Exception as e:
@@ -0,0 +1,196 @@
+"""
+의미 기반 답변 캐시 - 질의 임베딩이 충분히 가까운 이전 질의의 최종 답변 재사용
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import numpy as np
+
+from ..config.settings import (
+    ANSWER_CACHE_SIMILARITY_THRESHOLD, ANSWER_CACHE_SIZE, ANSWER_CACHE_TTL,
+    ANSWER_CACHE_LEVELS, ANSWER_CACHE_IGNORED_TERM_GROUPS, TROUBLESHOOTING_PATTERN
+)
+from .embedding_cache import normalize_query_text
+from .term_expansion import get_vehicle_term_expander
+
+
+@dataclass
+class CachedAnswer:
+    """캐시된 최종 답변 (답변 본문에 참고 페이지 포함)"""
+    query: str
+    answer: str
+    page_references: List[int] = field(default_factory=list)
+    emergency_level: str = "NORMAL"
+    term_groups: FrozenSet[str] = frozenset()
+    troubleshooting: bool = False
+    created_at: float = field(default_factory=time.time)
+
+
+class _Namespace:
+    """한 매뉴얼 인덱스 버전의 캐시 항목 (정규화 질의 → 항목, LRU 순서)"""
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.entries: "OrderedDict[str, Tuple[CachedAnswer, np.ndarray, Optional[float]]]" = OrderedDict()
+        self._keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None  # _keys 순서대로 쌓은 정규화 질의 벡터
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """(키 목록, 질의 벡터 행렬) - 항목이 추가/삭제될 때만 다시 쌓음"""
+        if self._matrix is None:
+            self._keys = list(self.entries)
+            self._matrix = np.stack([self.entries[key][1] for key in self._keys])
+        return self._keys, self._matrix
+
+    def mark_dirty(self):
+        self._matrix = None
+
+
+class SemanticAnswerCache:
+    """질의 임베딩 코사인 유사도 기반 답변 캐시
+
+    차량 매뉴얼(namespace)별로 항목을 따로 두고, 각 네임스페이스는 인덱스 지문이 바뀌면
+    통째로 비운다. 조회는 저장된 질의 벡터 행렬과의 한 번의 행렬-벡터 곱이며, 부품 용어
+    그룹(엔진/브레이크/타이어 등)과 고장/증상 질의 여부가 같은 항목 중 가장 가까운 질의의
+    유사도가 threshold 이상이면 적중이다. 임베딩 유사도만으로는 "엔진 오일 교체"와
+    "브레이크 오일 교체"처럼 부품만 다른 질문이나 "브레이크 패드 교체"와 "브레이크 패드
+    소음"처럼 증상 여부만 다른 질문을 가르지 못하기 때문이다. 응급 수준이 levels 밖인 질의는 조회도
+    저장도 하지 않는다. 항목은 TTL로 만료되고 maxsize를 넘으면 가장 오래 사용하지 않은
+    항목부터 제거한다.
+    """
+
+    def __init__(self, threshold: float = ANSWER_CACHE_SIMILARITY_THRESHOLD,
+                 maxsize: int = ANSWER_CACHE_SIZE, ttl: Optional[float] = ANSWER_CACHE_TTL,
+                 levels: List[str] = ANSWER_CACHE_LEVELS, term_expander=None,
+                 ignored_term_groups: List[str] = ANSWER_CACHE_IGNORED_TERM_GROUPS,
+                 troubleshooting_pattern: str = TROUBLESHOOTING_PATTERN):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.levels = set(levels)
+        self.term_expander = term_expander or get_vehicle_term_expander()
+        self.ignored_term_groups = set(ignored_term_groups)
+        self.troubleshooting_pattern = re.compile(troubleshooting_pattern, re.IGNORECASE)
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        return array / max(float(np.linalg.norm(array)), 1e-12)
+
+    def accepts(self, emergency_level: str) -> bool:
+        """응급 수준이 캐시 대상인지 (대상이 아니면 우회로 집계)"""
+        if emergency_level in self.levels:
+            return True
+        self.record_bypass()
+        return False
+
+    def record_bypass(self):
+        """조회하지 않고 우회한 요청 집계 (호출자의 응급/고장 단서 판단 포함)"""
+        with self._lock:
+            self.bypassed += 1
+
+    def term_groups(self, query: str) -> FrozenSet[str]:
+        """적중 조건으로 비교하는 질의의 부품 용어 그룹"""
+        return frozenset(self.term_expander.expand(query).groups) - self.ignored_term_groups
+
+    def is_troubleshooting(self, query: str) -> bool:
+        """고장/증상 질의인지 (적중 조건으로 비교)"""
+        return bool(self.troubleshooting_pattern.search(query))
+
+    def _get_namespace(self, namespace: str, fingerprint: str) -> _Namespace:
+        """네임스페이스 반환 (인덱스 지문이 바뀌었으면 기존 항목 폐기)"""
+        current = self._namespaces.get(namespace)
+        if current is None or current.fingerprint != fingerprint:
+            if current is not None and current.entries:
+                print(f"♻️ 답변 캐시 무효화 ({namespace}): 인덱스 변경으로 {len(current.entries)}개 항목 삭제")
+            current = _Namespace(fingerprint)
+            self._namespaces[namespace] = current
+        return current
+
+    def _purge_expired(self, space: _Namespace):
+        now = time.monotonic()
+        expired = [key for key, (_, _, expires_at) in space.entries.items()
+                   if expires_at is not None and expires_at <= now]
+        for key in expired:
+            del space.entries[key]
+        if expired:
+            space.mark_dirty()
+
+    def lookup(self, namespace: str, fingerprint: str, query: str, query_vector: List[float],
+               emergency_level: str = "NORMAL") -> Optional[Tuple[CachedAnswer, float]]:
+        """부품 그룹과 증상 여부가 같은 가장 가까운 캐시 질의의 (답변, 유사도) 반환 (threshold 미만이거나 응급이면 None)"""
+        if not self.accepts(emergency_level):
+            return None
+        vector = self._normalize(query_vector)
+        groups = self.term_groups(query)
+        troubleshooting = self.is_troubleshooting(query)
+        with self._lock:
+            space = self._get_namespace(namespace, fingerprint)
+            self._purge_expired(space)
+            if not space.entries:
+                self.misses += 1
+                return None
+
+            keys, matrix = space.matrix()
+            same_groups = np.fromiter(
+                (space.entries[key][0].term_groups == groups
+                 and space.entries[key][0].troubleshooting == troubleshooting for key in keys),
+                dtype=bool, count=len(keys)
+            )
+            similarities = np.where(same_groups, matrix @ vector, -np.inf)
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            key = keys[best]
+            space.entries.move_to_end(key)
+            self.hits += 1
+            return space.entries[key][0], similarity
+
+    def store(self, namespace: str, fingerprint: str, query: str, query_vector: List[float],
+              answer: str, page_references: List[int] = None, emergency_level: str = "NORMAL"):
+        """답변 저장 (응급 답변은 저장하지 않음, 같은 정규화 질의는 덮어씀, 용량 초과 시 LRU 제거)"""
+        if emergency_level not in self.levels:
+            return
+        entry = CachedAnswer(query=query, answer=answer, page_references=list(page_references or []),
+                             emergency_level=emergency_level, term_groups=self.term_groups(query),
+                             troubleshooting=self.is_troubleshooting(query))
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        key = normalize_query_text(query)
+        with self._lock:
+            space = self._get_namespace(namespace, fingerprint)
+            space.entries[key] = (entry, self._normalize(query_vector), expires_at)
+            space.entries.move_to_end(key)
+            while len(space.entries) > self.maxsize:
+                space.entries.popitem(last=False)
+            space.mark_dirty()
+
+    def invalidate(self, namespace: str = None):
+        """네임스페이스(없으면 전체) 항목 삭제"""
+        with self._lock:
+            if namespace is None:
+                self._namespaces.clear()
+            else:
+                self._namespaces.pop(namespace, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 통계와 네임스페이스별 항목 수"""
+        total = self.hits + self.misses
+        return {
+            "namespaces": {name: len(space.entries) for name, space in self._namespaces.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
@@ -0,0 +1,49 @@
+"""
+청크 식별자 - 모든 인덱스(Chroma/BM25/페이지/캐시)가 공유하는 정규 청크 ID와 페이지 체계
+"""
+
+import hashlib
+from typing import List, Optional
+from langchain_core.documents import Document
+
+
+def canonical_page(metadata: dict) -> int:
+    """정규 페이지 번호 (1부터 시작하는 정수, 알 수 없으면 0)"""
+    try:
+        return max(int(metadata.get("page", 0)), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def compute_chunk_hash(doc: Document) -> str:
+    """청크 내용과 페이지 정보로 콘텐츠 해시 계산"""
+    digest = hashlib.sha256()
+    digest.update(str(doc.metadata.get("page", "")).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(doc.page_content.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def assign_chunk_ids(documents: List[Document]) -> List[Document]:
+    """페이지를 정규화하고 metadata["chunk_id"]에 정규 청크 ID 부여
+
+    ID는 "p{페이지}-{콘텐츠 해시 16자}" 형식이며, 같은 페이지에 동일 내용이 있으면
+    "-{순번}"을 붙인다. 내용과 페이지가 같으면 재분할해도 ID가 유지된다.
+    """
+    seen = set()
+    for doc in documents:
+        page = canonical_page(doc.metadata)
+        doc.metadata["page"] = page
+        base_id = f"p{page:04d}-{compute_chunk_hash(doc)[:16]}"
+        chunk_id, suffix = base_id, 1
+        while chunk_id in seen:
+            chunk_id = f"{base_id}-{suffix}"
+            suffix += 1
+        seen.add(chunk_id)
+        doc.metadata["chunk_id"] = chunk_id
+    return documents
+
+
+def get_chunk_id(doc: Document) -> Optional[str]:
+    """문서의 정규 청크 ID (부여되지 않았으면 None)"""
+    return doc.metadata.get("chunk_id")
@@ -0,0 +1,97 @@
+"""
+청크 저장소 - PDF 파싱/분할 결과 영속화
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+from langchain_core.documents import Document
+
+from ..config.settings import CHUNK_STORE_DIR, CHUNK_SIZE, CHUNK_OVERLAP
+
+# 저장 포맷이 바뀌면 증가시켜 기존 저장본을 무효화
+CHUNK_STORE_VERSION = 3
+
+
+def compute_file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+    """파일 내용의 SHA-256 해시 계산"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkStore:
+    """PDF 해시 및 청킹 설정(전략 + 파라미터)을 키로 하는 청크 저장소"""
+
+    def __init__(self, store_dir: str = None, chunking: Dict = None):
+        self.store_dir = Path(store_dir or CHUNK_STORE_DIR)
+        self.chunking = chunking or {
+            "strategy": "recursive", "chunk_size": CHUNK_SIZE, "chunk_overlap": CHUNK_OVERLAP
+        }
+
+    def make_key(self, pdf_hash: str) -> str:
+        """저장소 키 생성 (PDF 해시 + 청킹 전략 + 설정 해시)"""
+        config_hash = hashlib.sha256(
+            json.dumps(self.chunking, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:8]
+        return f"{pdf_hash[:16]}_{self.chunking.get('strategy', 'recursive')}_{config_hash}"
+
+    def _store_path(self, pdf_hash: str) -> Path:
+        return self.store_dir / f"{self.make_key(pdf_hash)}.json"
+
+    def load(self, pdf_path: str, pdf_hash: str = None) -> Optional[List[Document]]:
+        """저장된 청크 로드 (없거나 호환되지 않으면 None)"""
+        try:
+            pdf_hash = pdf_hash or compute_file_hash(pdf_path)
+            store_path = self._store_path(pdf_hash)
+            if not store_path.exists():
+                return None
+
+            with open(store_path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+
+            if (payload.get("version") != CHUNK_STORE_VERSION
+                    or payload.get("pdf_hash") != pdf_hash
+                    or payload.get("chunking") != self.chunking):
+                return None
+
+            return [
+                Document(page_content=chunk["page_content"], metadata=chunk["metadata"])
+                for chunk in payload["chunks"]
+            ]
+
+        except Exception as e:
+            print(f"⚠️ 청크 저장소 로드 오류: {str(e)}")
+            return None
+
+    def save(self, pdf_path: str, documents: List[Document], pdf_hash: str = None) -> bool:
+        """청크를 저장소에 기록 (임시 파일 작성 후 교체)"""
+        try:
+            pdf_hash = pdf_hash or compute_file_hash(pdf_path)
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            store_path = self._store_path(pdf_hash)
+
+            payload = {
+                "version": CHUNK_STORE_VERSION,
+                "pdf_hash": pdf_hash,
+                "pdf_name": Path(pdf_path).name,
+                "chunking": self.chunking,
+                "chunks": [
+                    {"page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc in documents
+                ]
+            }
+
+            tmp_path = store_path.with_suffix(".json.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, store_path)
+            return True
+
+        except Exception as e:
+            print(f"⚠️ 청크 저장소 저장 오류: {str(e)}")
+            return False
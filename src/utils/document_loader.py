@@ -3,26 +3,57 @@
 """
 
 import os
-from typing import List
+from typing import Dict, List
 from pathlib import Path
 from langchain_core.documents import Document
-from langchain_community.document_loaders import PyPDFLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
-from ..config.settings import CHUNK_SIZE, CHUNK_OVERLAP
+from ..config.settings import (
+    CHUNK_SIZE, CHUNK_OVERLAP, CHUNKING_STRATEGY,
+    CHUNK_TARGET_TOKENS, CHUNK_MAX_TOKENS, HEADING_FONT_RATIO
+)
+from .chunk_store import ChunkStore, compute_file_hash
+from .chunk_ids import assign_chunk_ids
+
+
+def get_chunking_config(strategy: str = CHUNKING_STRATEGY,
+                        chunk_size: int = CHUNK_SIZE,
+                        chunk_overlap: int = CHUNK_OVERLAP) -> Dict:
+    """청킹 전략과 결과에 영향을 주는 파라미터 (청크 저장소 키/인덱스 매니페스트용)"""
+    if strategy == "structure":
+        return {
+            "strategy": strategy,
+            "target_tokens": CHUNK_TARGET_TOKENS,
+            "max_tokens": CHUNK_MAX_TOKENS,
+            "heading_ratio": HEADING_FONT_RATIO
+        }
+    return {"strategy": "recursive", "chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
 
 
 class DocumentLoader:
     """PDF 문서 로딩 및 전처리 유틸리티"""
     
-    def __init__(self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP):
+    def __init__(self, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP,
+                 chunk_store: ChunkStore = None, strategy: str = CHUNKING_STRATEGY):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-        )
+        self.strategy = strategy
+        self.chunking_config = get_chunking_config(strategy, chunk_size, chunk_overlap)
+        # 마지막으로 반환한 청크를 실제로 만든 청킹 설정 (구조 청킹 실패 시 고정 길이 설정)
+        self.last_chunking_config = self.chunking_config
+        self._text_splitter = None
+        self.chunk_store = chunk_store or ChunkStore(chunking=self.chunking_config)
+    
+    @property
+    def text_splitter(self):
+        """텍스트 분할기 (청크 저장소 미스 시에만 필요하므로 첫 사용 시 생성)"""
+        if self._text_splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=self.chunk_size,
+                chunk_overlap=self.chunk_overlap,
+                length_function=len,
+            )
+        return self._text_splitter
     
     def load_pdf(self, pdf_path: str) -> List[Document]:
         """PDF 파일을 로드하고 문서로 변환"""
@@ -34,6 +65,7 @@ class DocumentLoader:
             print(f"📄 PDF 파일 로딩 중: {Path(pdf_path).name}")
             
             # PDF 로더로 문서 로드
+            from langchain_community.document_loaders import PyPDFLoader
             loader = PyPDFLoader(pdf_path)
             documents = loader.load()
             
@@ -65,7 +97,7 @@ class DocumentLoader:
             # 분할된 문서의 메타데이터 보강
             for i, doc in enumerate(split_docs):
                 doc.metadata.update({
-                    'chunk_id': i,
+                    'chunk_index': i,
                     'chunk_size': len(doc.page_content)
                 })
             
@@ -75,13 +107,43 @@ class DocumentLoader:
             print(f"❌ 문서 분할 오류: {str(e)}")
             return []
     
-    def load_and_split_pdf(self, pdf_path: str) -> List[Document]:
-        """PDF 로드 및 분할을 한번에 수행"""
-        documents = self.load_pdf(pdf_path)
-        if not documents:
+    def load_and_split_pdf(self, pdf_path: str, use_cache: bool = True) -> List[Document]:
+        """PDF 로드 및 분할을 한번에 수행 (청크 저장소 우선 사용)"""
+        if not os.path.exists(pdf_path):
+            print(f"❌ PDF 로딩 오류: PDF 파일을 찾을 수 없습니다: {pdf_path}")
             return []
         
-        return self.split_documents(documents)
+        pdf_hash = compute_file_hash(pdf_path)
+        self.last_chunking_config = self.chunking_config
+        
+        # 저장된 청크가 있으면 PDF 파싱/분할 없이 바로 반환
+        if use_cache:
+            cached_docs = self.chunk_store.load(pdf_path, pdf_hash=pdf_hash)
+            if cached_docs:
+                print(f"📦 청크 저장소에서 로드: {len(cached_docs)}개 문서 조각 ({Path(pdf_path).name})")
+                return cached_docs
+        
+        if self.strategy == "structure":
+            from .structure_chunker import StructureChunker
+            split_docs = StructureChunker().chunk_pdf(pdf_path)
+            if not split_docs:
+                # 레이아웃 분석 실패 시 고정 길이 분할로 대체 (저장소에는 기록하지 않음)
+                print("⚠️ 구조 기반 청킹 실패, 고정 길이 분할로 대체합니다.")
+                self.last_chunking_config = get_chunking_config("recursive", self.chunk_size, self.chunk_overlap)
+                return assign_chunk_ids(self.split_documents(self.load_pdf(pdf_path)))
+        else:
+            documents = self.load_pdf(pdf_path)
+            if not documents:
+                return []
+            split_docs = self.split_documents(documents)
+        
+        # 모든 인덱스가 공유하는 정규 페이지/청크 ID 부여
+        assign_chunk_ids(split_docs)
+        
+        if split_docs and use_cache:
+            self.chunk_store.save(pdf_path, split_docs, pdf_hash=pdf_hash)
+        
+        return split_docs
     
     def get_document_stats(self, documents: List[Document]) -> dict:
         """문서 통계 정보 반환"""
@@ -6,7 +6,8 @@ import re
 from typing import Dict, Any, List, Optional
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
+
+from .llm_cache import create_chat_llm
 
 
 class DrivingContextAnalysis(BaseModel):
@@ -30,7 +31,7 @@ class DrivingContextDetector:
     """주행 중 상황 감지 및 답변 압축기"""
     
     def __init__(self, llm_model: str = "gpt-4o-mini", temperature: float = 0):
-        self.llm = ChatOpenAI(model=llm_model, temperature=temperature)
+        self.llm = create_chat_llm(llm_model, temperature)
         
         # 구조화된 출력을 위한 LLM 설정
         self.structured_analyzer = self.llm.with_structured_output(DrivingContextAnalysis)
@@ -0,0 +1,142 @@
+"""
+질의 임베딩 캐시 - 요청 범위 + 프로세스 전역(LRU/TTL) 2단계 캐시
+"""
+
+import re
+import threading
+import unicodedata
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from langchain_core.embeddings import Embeddings
+
+from ..config.settings import EMBEDDING_CACHE_SIZE, EMBEDDING_CACHE_TTL
+from .cache import LRUCache
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_request_scope: ContextVar[Optional["_RequestEmbeddingScope"]] = ContextVar(
+    "embedding_request_scope", default=None
+)
+
+
+def normalize_query_text(text: str) -> str:
+    """캐시 키용 질의 정규화 (유니코드 NFC, 공백 정리)"""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class _RequestEmbeddingScope:
+    """한 요청 안에서 같은 질의를 한 번만 임베딩하도록 결과와 진행 중 계산을 공유"""
+
+    def __init__(self):
+        self.vectors: Dict[Tuple[str, str], List[float]] = {}
+        self.pending: Dict[Tuple[str, str], threading.Event] = {}
+        self.lock = threading.Lock()
+        self.embed_calls = 0
+
+
+@contextmanager
+def embedding_request_scope():
+    """요청 범위 임베딩 캐시 (중첩 시 바깥 범위 재사용)"""
+    if _request_scope.get() is not None:
+        yield _request_scope.get()
+        return
+    scope = _RequestEmbeddingScope()
+    token = _request_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        _request_scope.reset(token)
+
+
+class CachedEmbeddings(Embeddings):
+    """임베딩 모델 래퍼 - embed_query 결과를 (모델, 정규화 질의) 키로 캐시
+
+    요청 범위(embedding_request_scope) 안에서는 동시에 들어온 같은 질의도 한 번만
+    임베딩하고, 프로세스 전역 LRU 캐시로 반복 질의는 재임베딩하지 않는다.
+    문서 임베딩(embed_documents)은 캐시하지 않는다.
+    """
+
+    def __init__(self, base: Embeddings, maxsize: int = EMBEDDING_CACHE_SIZE,
+                 ttl: Optional[float] = EMBEDDING_CACHE_TTL):
+        self.base = base
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    @property
+    def model(self) -> str:
+        """기반 모델명 (인덱스 매니페스트 호환성 판단용)"""
+        return getattr(self.base, "model", "unknown")
+
+    def _key(self, text: str) -> Tuple[str, str]:
+        return self.model, normalize_query_text(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.base.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key(text)
+        scope = _request_scope.get()
+        if scope is None:
+            return self._embed_cached(key)
+
+        while True:
+            with scope.lock:
+                if key in scope.vectors:
+                    return scope.vectors[key]
+                event = scope.pending.get(key)
+                if event is None:
+                    event = scope.pending[key] = threading.Event()
+                    break
+            # 같은 요청의 다른 스레드가 임베딩 중이면 결과를 기다림
+            event.wait()
+
+        try:
+            vector = self._embed_cached(key, scope)
+            with scope.lock:
+                scope.vectors[key] = vector
+            return vector
+        finally:
+            with scope.lock:
+                scope.pending.pop(key, None)
+            event.set()
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """여러 질의를 캐시 확인 후 미적중분만 한 번의 배치 호출로 임베딩
+
+        배치 호출은 기반 모델의 embed_documents를 사용하므로 질의/문서 임베딩이 같은
+        모델(OpenAI 등)에서만 embed_query와 같은 벡터를 얻는다.
+        """
+        keys = [self._key(text) for text in texts]
+        scope = _request_scope.get()
+        vectors: List[Optional[List[float]]] = []
+        for key in keys:
+            vector = scope.vectors.get(key) if scope is not None else None
+            vectors.append(vector if vector is not None else self.cache.get(key))
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = self.base.embed_documents([keys[i][1] for i in missing])
+            for i, vector in zip(missing, embedded):
+                self.cache.set(keys[i], vector)
+                vectors[i] = vector
+            if scope is not None:
+                scope.embed_calls += 1
+
+        if scope is not None:
+            with scope.lock:
+                scope.vectors.update(zip(keys, vectors))
+        return vectors
+
+    def _embed_cached(self, key: Tuple[str, str],
+                      scope: Optional[_RequestEmbeddingScope] = None) -> List[float]:
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.base.embed_query(key[1])
+            self.cache.set(key, vector)
+            if scope is not None:
+                scope.embed_calls += 1
+        return vector
+
+    def stats(self) -> Dict:
+        """프로세스 캐시 적중률 통계"""
+        return self.cache.stats()
@@ -5,6 +5,14 @@
 import re
 from typing import Dict, List, Tuple, Any
 
+# 응급 수준 (낮음 → 높음)
+PRIORITY_LEVELS = ["NORMAL", "LOW", "MEDIUM", "HIGH", "CRITICAL"]
+
+
+def emergency_severity(priority_level: str) -> int:
+    """응급 수준의 순위 (알 수 없는 수준은 NORMAL)"""
+    return PRIORITY_LEVELS.index(priority_level) if priority_level in PRIORITY_LEVELS else 0
+
 
 class EmergencyDetector:
     """응급 상황 질문 감지 및 분류 클래스"""
@@ -0,0 +1,99 @@
+"""
+한국어 토크나이저 - Kiwi 배치(멀티스레드) 분석 및 질의 토큰 캐시
+"""
+
+import re
+import unicodedata
+import importlib.util
+from typing import Iterable, List, Tuple
+
+from ..config.settings import CUSTOM_WORDS, KIWI_NUM_WORKERS, QUERY_TOKEN_CACHE_SIZE
+from .cache import LRUCache
+
+# 설치 여부만 확인하고 실제 임포트(모델 로딩 포함)는 토크나이저 생성 시점으로 미룸
+KIWI_AVAILABLE = importlib.util.find_spec("kiwipiepy") is not None
+
+# 검색에 사용할 품사 (명사, 동사, 형용사, 대명사)
+KEEP_POS_PREFIXES = ('NN', 'VV', 'VA', 'NP')
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.~…]+$")
+
+
+def normalize_query(text: str) -> str:
+    """질의 캐시 키용 정규화 (유니코드 정규화, 공백 압축, 끝 문장부호 제거)"""
+    text = unicodedata.normalize("NFKC", text)
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    return _TRAILING_PUNCT_RE.sub("", text)
+
+
+class KoreanTokenizer:
+    """Kiwi 기반 한국어 토크나이저 (Kiwi가 없으면 공백 분리)"""
+
+    def __init__(self, num_workers: int = KIWI_NUM_WORKERS,
+                 cache_size: int = QUERY_TOKEN_CACHE_SIZE):
+        self.kiwi_model = None
+        self.query_cache = LRUCache(maxsize=cache_size)
+        if KIWI_AVAILABLE:
+            self._setup_kiwi(num_workers)
+        else:
+            print("⚠️ Kiwi 토크나이저가 설치되지 않았습니다. 기본 토크나이저를 사용합니다.")
+
+    def _setup_kiwi(self, num_workers: int):
+        """Kiwi 모델 로드 및 사용자 정의 단어 추가"""
+        try:
+            from kiwipiepy import Kiwi
+            self.kiwi_model = Kiwi(num_workers=num_workers)
+            for word, pos in CUSTOM_WORDS:
+                self.kiwi_model.add_user_word(word, pos)
+            print(f"✅ 한국어 토크나이저 설정 완료: {len(CUSTOM_WORDS)}개 사용자 단어 추가 "
+                  f"(작업 스레드 {num_workers}개)")
+        except Exception as e:
+            print(f"한국어 토크나이저 설정 오류: {str(e)}")
+            self.kiwi_model = None
+
+    @property
+    def name(self) -> str:
+        """토큰화 결과가 달라지는 설정을 담은 식별자 (BM25 인덱스 버전 관리용)"""
+        if self.kiwi_model is None:
+            return "whitespace"
+        custom_words = ",".join(f"{word}/{pos}" for word, pos in CUSTOM_WORDS)
+        return f"kiwi-tokenize:{'|'.join(KEEP_POS_PREFIXES)}:{custom_words}"
+
+    @staticmethod
+    def _extract(tokens, text: str) -> List[str]:
+        """검색용 품사만 추출 (없으면 공백 분리)"""
+        forms = [token.form for token in tokens if token.tag.startswith(KEEP_POS_PREFIXES)]
+        return forms if forms else text.split()
+
+    def tokenize(self, text: str) -> List[str]:
+        """단일 텍스트 토크나이징"""
+        if self.kiwi_model is None:
+            return text.split()
+        try:
+            return self._extract(self.kiwi_model.tokenize(text), text)
+        except Exception:
+            return text.split()
+
+    def tokenize_query(self, text: str) -> List[str]:
+        """질의 토크나이징 (정규화된 질의 기준 LRU 캐시)"""
+        key = normalize_query(text)
+        cached: Tuple[str, ...] = self.query_cache.get(key)
+        if cached is None:
+            cached = tuple(self.tokenize(key))
+            self.query_cache.set(key, cached)
+        return list(cached)
+
+    def tokenize_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        """코퍼스 일괄 토크나이징 (Kiwi 멀티스레드 배치 분석)"""
+        texts = list(texts)
+        if self.kiwi_model is None:
+            return [text.split() for text in texts]
+        try:
+            return [
+                self._extract(tokens, text)
+                for tokens, text in zip(self.kiwi_model.tokenize(texts), texts)
+            ]
+        except Exception as e:
+            print(f"⚠️ 배치 토크나이징 오류, 순차 처리로 전환: {str(e)}")
+            return [self.tokenize(text) for text in texts]
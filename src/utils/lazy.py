@@ -0,0 +1,66 @@
+"""
+지연 초기화 컴포넌트 - 첫 사용 시 생성 또는 백그라운드 워밍업
+"""
+
+import time
+import threading
+from typing import Any, Callable, List
+
+
+class LazyComponent:
+    """첫 접근 시 factory를 한 번만 실행하여 실제 객체를 생성하는 프록시
+
+    속성 접근(예: .invoke)은 생성된 객체로 위임된다. 생성에 실패하면 None으로
+    고정되며 이후 속성 접근은 AttributeError를 발생시킨다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def get(self) -> Any:
+        """실제 객체 반환 (필요 시 생성)"""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    start_time = time.time()
+                    try:
+                        self._instance = self._factory()
+                    except Exception as e:
+                        print(f"{self._name} 지연 초기화 오류: {str(e)}")
+                        self._instance = None
+                    self._loaded = True
+                    if self._instance is not None:
+                        print(f"⏱️  {self._name} 준비 완료 ({time.time() - start_time:.2f}초)")
+        return self._instance
+
+    def __getattr__(self, item: str) -> Any:
+        instance = self.get()
+        if instance is None:
+            raise AttributeError(f"{self._name}이(가) 초기화되지 않았습니다.")
+        return getattr(instance, item)
+
+
+def warm_up_in_background(components: List[Any]) -> threading.Thread:
+    """지연 컴포넌트들을 백그라운드 스레드에서 순차적으로 미리 생성"""
+
+    def _warm_up():
+        for component in components:
+            if isinstance(component, LazyComponent) and not component.is_loaded:
+                component.get()
+        print("🔥 백그라운드 워밍업 완료")
+
+    thread = threading.Thread(target=_warm_up, name="retriever-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,149 @@
+"""
+LLM 응답 캐시 - (모델 설정, 프롬프트) 해시 → 응답을 SQLite에 영속 저장
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from langchain_core._api import suppress_langchain_beta_warning
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+from langchain_openai import ChatOpenAI
+
+from ..config.settings import (
+    DEFAULT_LLM_MODEL, DEFAULT_LLM_TEMPERATURE, LLM_CACHE_ENABLED, LLM_CACHE_PATH,
+    LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL
+)
+
+
+def prompt_hash(prompt: str, llm_string: str) -> str:
+    """캐시 키 (모델/파라미터 문자열 + 직렬화된 프롬프트의 sha256)"""
+    digest = hashlib.sha256()
+    digest.update(llm_string.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(prompt.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SQLiteLLMCache(BaseCache):
+    """프롬프트 해시 → 생성 결과 SQLite 캐시
+
+    LangChain 캐시 인터페이스를 구현하므로 모델의 cache 인자로 넘기면 모든 호출에 적용된다.
+    응답은 메시지 전체(도구 호출 포함)를 직렬화해 저장하므로 with_structured_output 결과도
+    캐시된다. llm_string에 모델명과 temperature 등 호출 파라미터가 들어 있어 설정이 다르면
+    다른 키가 된다. ttl이 지난 항목은 조회하지 않고, 저장할 때 만료 항목과 max_entries를
+    넘는 오래된 항목을 삭제한다.
+    """
+
+    def __init__(self, database_path: Path = LLM_CACHE_PATH, max_entries: Optional[int] = LLM_CACHE_MAX_ENTRIES,
+                 ttl: Optional[float] = LLM_CACHE_TTL):
+        self.database_path = Path(database_path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(self.database_path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, llm_string TEXT, response TEXT, created_at REAL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS llm_cache_created_at ON llm_cache (created_at)")
+        self._connection.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        key = prompt_hash(prompt, llm_string)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response FROM llm_cache WHERE key = ? AND created_at >= ?", (key, self._expiry_cutoff())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+        try:
+            with suppress_langchain_beta_warning():
+                generations = loads(row[0])
+        except Exception as e:
+            print(f"⚠️ LLM 캐시 항목 복원 오류, 다시 호출합니다: {str(e)}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = prompt_hash(prompt, llm_string)
+        response = dumps(list(return_val))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, response, created_at) VALUES (?, ?, ?, ?)",
+                (key, llm_string, response, time.time())
+            )
+            self._prune()
+            self._connection.commit()
+
+    def _expiry_cutoff(self) -> float:
+        """이 시각 이전에 저장된 항목은 만료 (ttl이 없으면 -inf)"""
+        return time.time() - self.ttl if self.ttl else float("-inf")
+
+    def _prune(self):
+        """만료 항목과 max_entries를 넘는 오래된 항목 삭제 (잠금을 잡은 상태에서 호출)"""
+        if self.ttl:
+            self._connection.execute("DELETE FROM llm_cache WHERE created_at < ?", (self._expiry_cutoff(),))
+        if self.max_entries:
+            self._connection.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM llm_cache")
+            self._connection.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """적중/미스 통계와 저장 항목 수"""
+        with self._lock:
+            size = self._connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """공용 LLM 응답 캐시 (LLM_CACHE_ENABLED가 False이거나 열 수 없으면 None)"""
+    global _default_cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                try:
+                    _default_cache = SQLiteLLMCache()
+                except Exception as e:
+                    print(f"⚠️ LLM 캐시 초기화 실패, 캐시 없이 실행: {str(e)}")
+                    return None
+    return _default_cache
+
+
+def create_chat_llm(model: str = DEFAULT_LLM_MODEL, temperature: float = DEFAULT_LLM_TEMPERATURE,
+                    **kwargs) -> ChatOpenAI:
+    """응답 캐시가 연결된 ChatOpenAI 생성 (에이전트의 모든 LLM 공용)"""
+    cache = get_llm_cache()
+    if cache is not None:
+        kwargs.setdefault("cache", cache)
+    return ChatOpenAI(model=model, temperature=temperature, **kwargs)
@@ -5,9 +5,10 @@ LLM 기반 응급 상황 감지 및 주행 상황 감지 시스템
 from typing import Dict, Any, List
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from langchain_core.output_parsers import StrOutputParser
 
+from .llm_cache import create_chat_llm
+
 
 class EmergencyAnalysis(BaseModel):
     """응급 상황 분석 결과"""
@@ -33,7 +34,7 @@ class LLMEmergencyDetector:
     """LLM 기반 응급 상황 감지기"""
     
     def __init__(self, llm_model: str = "gpt-4o-mini", temperature: float = 0):
-        self.llm = ChatOpenAI(model=llm_model, temperature=temperature)
+        self.llm = create_chat_llm(llm_model, temperature)
         
         # 구조화된 출력을 위한 LLM 설정
         self.emergency_analyzer = self.llm.with_structured_output(EmergencyAnalysis)
@@ -0,0 +1,253 @@
+"""
+질의 라우터 - 규칙 테이블과 문자 n-gram 로지스틱 회귀로 검색 전략/방법을 LLM 없이 결정
+"""
+
+import json
+import math
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from ..config.settings import (
+    QUERY_ROUTER_MODEL_PATH, QUERY_ROUTER_EXAMPLES_PATH, QUERY_ROUTER_CONFIDENCE_THRESHOLD,
+    QUERY_ROUTER_RULE_CONFIDENCE, QUERY_ROUTING_RULES, STRATEGY_SEARCH_METHODS
+)
+
+MODEL_FORMAT_VERSION = 1
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = (1, 3)) -> Counter:
+    """공백 정규화/소문자 질의의 문자 n-gram 빈도 (양 끝은 공백으로 표시)"""
+    text = f" {' '.join(text.lower().split())} "
+    low, high = ngram_range
+    return Counter(
+        text[start:start + n]
+        for n in range(low, high + 1)
+        for start in range(len(text) - n + 1)
+    )
+
+
+class CharNgramClassifier:
+    """문자 n-gram 다항 로지스틱 회귀 분류기
+
+    추론은 질의 n-gram의 가중치 행을 딕셔너리에서 더하는 순수 Python 연산이라 마이크로초 단위다.
+    학습은 NumPy 전체 배치 경사 하강이며, 가중치는 JSON 모델 파일로 저장/로드한다.
+    """
+
+    def __init__(self, labels: List[str], weights: Dict[str, List[float]], bias: List[float],
+                 ngram_range: Tuple[int, int] = (1, 3)):
+        self.labels = list(labels)
+        self.weights = weights
+        self.bias = list(bias)
+        self.ngram_range = tuple(ngram_range)
+
+    @staticmethod
+    def _normalized_features(text: str, ngram_range: Tuple[int, int]) -> Dict[str, float]:
+        counts = char_ngrams(text, ngram_range)
+        norm = math.sqrt(sum(count * count for count in counts.values())) or 1.0
+        return {ngram: count / norm for ngram, count in counts.items()}
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """레이블별 확률"""
+        logits = list(self.bias)
+        for ngram, value in self._normalized_features(text, self.ngram_range).items():
+            row = self.weights.get(ngram)
+            if row is not None:
+                for i, weight in enumerate(row):
+                    logits[i] += weight * value
+        top = max(logits)
+        exps = [math.exp(logit - top) for logit in logits]
+        total = sum(exps)
+        return {label: exp / total for label, exp in zip(self.labels, exps)}
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """(가장 확률이 높은 레이블, 확률)"""
+        probabilities = self.predict_proba(text)
+        label = max(probabilities, key=probabilities.get)
+        return label, probabilities[label]
+
+    @classmethod
+    def fit(cls, texts: Sequence[str], labels: Sequence[str], ngram_range: Tuple[int, int] = (1, 3),
+            epochs: int = 300, learning_rate: float = 2.0, l2: float = 1e-3,
+            prune_below: float = 1e-3) -> "CharNgramClassifier":
+        """레이블된 질의로 학습 (절댓값이 prune_below 미만인 n-gram 가중치는 버림)"""
+        label_names = sorted(set(labels))
+        features = [cls._normalized_features(text, ngram_range) for text in texts]
+        vocab = {ngram: i for i, ngram in enumerate(sorted({ngram for f in features for ngram in f}))}
+
+        x = np.zeros((len(texts), len(vocab)), dtype=np.float64)
+        for row, f in enumerate(features):
+            for ngram, value in f.items():
+                x[row, vocab[ngram]] = value
+        y = np.zeros((len(texts), len(label_names)))
+        y[np.arange(len(texts)), [label_names.index(label) for label in labels]] = 1.0
+
+        w = np.zeros((len(vocab), len(label_names)))
+        b = np.zeros(len(label_names))
+        for _ in range(epochs):
+            logits = x @ w + b
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            grad = (probs - y) / len(texts)
+            w -= learning_rate * (x.T @ grad + l2 * w)
+            b -= learning_rate * grad.sum(axis=0)
+
+        weights = {
+            ngram: [round(float(v), 6) for v in w[i]]
+            for ngram, i in vocab.items() if np.abs(w[i]).max() >= prune_below
+        }
+        return cls(label_names, weights, [round(float(v), 6) for v in b], ngram_range)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": MODEL_FORMAT_VERSION,
+            "labels": self.labels,
+            "ngram_range": list(self.ngram_range),
+            "bias": self.bias,
+            "weights": self.weights
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CharNgramClassifier":
+        if data.get("version") != MODEL_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 라우터 모델 버전: {data.get('version')}")
+        return cls(data["labels"], data["weights"], data["bias"], tuple(data["ngram_range"]))
+
+    def save(self, path: Path):
+        Path(path).write_text(json.dumps(self.to_dict(), ensure_ascii=False), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> "CharNgramClassifier":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+
+@dataclass
+class RouteDecision:
+    """라우팅 결과 (항목별 신뢰도와 출처: "rule", "model", "default", "llm")"""
+    strategy: str
+    method: str
+    strategy_confidence: float
+    method_confidence: float
+    strategy_source: str
+    method_source: str
+
+    @property
+    def confidence(self) -> float:
+        return min(self.strategy_confidence, self.method_confidence)
+
+    @property
+    def source(self) -> str:
+        sources = {self.strategy_source, self.method_source}
+        return sources.pop() if len(sources) == 1 else "+".join(sorted(sources))
+
+
+class QueryRouter:
+    """규칙 우선, 분류기 다음 순서로 검색 전략/방법을 정하는 질의 라우터
+
+    - 검색 방법: 규칙(교체/문제 → expanded_query, 긴 질문 → multi_query), 없으면 전략별 기본 방법
+    - 검색 전략: 규칙, 없으면 분류기 예측 확률
+    둘 중 하나라도 신뢰도가 threshold 미만이면 fallback(LLM 분석)을 호출해 규칙으로 정하지 않은 그 항목만 대체한다.
+    """
+
+    def __init__(self, classifier: Optional[CharNgramClassifier] = None,
+                 rules: Sequence[Tuple[str, Optional[str], Optional[str]]] = QUERY_ROUTING_RULES,
+                 threshold: float = QUERY_ROUTER_CONFIDENCE_THRESHOLD,
+                 rule_confidence: float = QUERY_ROUTER_RULE_CONFIDENCE):
+        self.classifier = classifier
+        self.rules = [(re.compile(pattern, re.IGNORECASE), strategy, method) for pattern, strategy, method in rules]
+        self.threshold = threshold
+        self.rule_confidence = rule_confidence
+
+    @classmethod
+    def load(cls, model_path: Path = QUERY_ROUTER_MODEL_PATH, **kwargs) -> "QueryRouter":
+        """모델 파일로 라우터 생성 (로드 실패 시 규칙만 사용)"""
+        try:
+            classifier = CharNgramClassifier.load(model_path)
+        except Exception as e:
+            print(f"⚠️ 질의 라우터 모델 로드 실패, 규칙만 사용: {str(e)}")
+            classifier = None
+        return cls(classifier, **kwargs)
+
+    def _match_rules(self, query: str) -> Tuple[Optional[str], Optional[str]]:
+        strategy = method = None
+        for pattern, rule_strategy, rule_method in self.rules:
+            if (strategy is None and rule_strategy or method is None and rule_method) and pattern.search(query):
+                strategy = strategy or rule_strategy
+                method = method or rule_method
+        return strategy, method
+
+    def classify(self, query: str) -> RouteDecision:
+        """규칙과 분류기만으로 결정 (LLM 호출 없음)"""
+        strategy, method = self._match_rules(query)
+
+        if strategy is not None:
+            strategy_confidence, strategy_source = self.rule_confidence, "rule"
+        elif self.classifier is not None:
+            strategy, strategy_confidence = self.classifier.predict(query)
+            strategy_source = "model"
+        else:
+            strategy, strategy_confidence, strategy_source = "general", 0.0, "default"
+
+        if method is not None:
+            method_confidence, method_source = self.rule_confidence, "rule"
+        else:
+            method = STRATEGY_SEARCH_METHODS.get(strategy, "hybrid_semantic")
+            method_confidence, method_source = strategy_confidence, strategy_source
+
+        return RouteDecision(strategy, method, strategy_confidence, method_confidence,
+                             strategy_source, method_source)
+
+    def route(self, query: str,
+              fallback: Optional[Callable[[str], Tuple[str, str, float]]] = None) -> RouteDecision:
+        """라우팅 (신뢰도가 낮은 항목만 fallback(query) → (전략, 방법, 신뢰도) 결과로 대체)"""
+        decision = self.classify(query)
+        if fallback is None or decision.confidence >= self.threshold:
+            return decision
+
+        try:
+            strategy, method, confidence = fallback(query)
+        except Exception as e:
+            print(f"⚠️ 라우터 대체 분석 오류, 로컬 결정 사용: {str(e)}")
+            return decision
+
+        # 규칙으로 정한 항목은 유지
+        if decision.strategy_source != "rule" and decision.strategy_confidence < self.threshold:
+            decision.strategy, decision.strategy_confidence, decision.strategy_source = strategy, confidence, "llm"
+        if decision.method_source != "rule" and decision.method_confidence < self.threshold:
+            decision.method, decision.method_confidence, decision.method_source = method, confidence, "llm"
+        return decision
+
+
+def train_router_model(examples_path: Path = QUERY_ROUTER_EXAMPLES_PATH,
+                       model_path: Path = QUERY_ROUTER_MODEL_PATH) -> CharNgramClassifier:
+    """레이블된 예시 질의(JSON: [{"query", "strategy"}])로 전략 분류기를 학습해 모델 파일로 저장"""
+    examples = json.loads(Path(examples_path).read_text(encoding="utf-8"))
+    classifier = CharNgramClassifier.fit(
+        [example["query"] for example in examples], [example["strategy"] for example in examples]
+    )
+    classifier.save(model_path)
+    print(f"✅ 질의 라우터 모델 저장: {model_path} ({len(examples)}개 예시, {len(classifier.weights)}개 n-gram)")
+    return classifier
+
+
+_default_router = None
+_default_router_lock = threading.Lock()
+
+
+def get_query_router() -> QueryRouter:
+    """배포 모델 파일로 만든 공용 라우터 (첫 호출 시 로드)"""
+    global _default_router
+    if _default_router is None:
+        with _default_router_lock:
+            if _default_router is None:
+                _default_router = QueryRouter.load()
+    return _default_router
+
+
+if __name__ == "__main__":
+    train_router_model()
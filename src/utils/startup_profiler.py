@@ -0,0 +1,140 @@
+"""
+시작 시간 프로파일러 - 모듈 임포트 및 초기화 단계별 소요 시간 트리
+"""
+
+import sys
+import time
+import builtins
+import threading
+import importlib.util
+from contextlib import contextmanager
+from typing import List, Optional
+
+_active_profiler: Optional["StartupProfiler"] = None
+
+
+class _TimingNode:
+    """타이밍 트리 노드"""
+
+    def __init__(self, name: str, kind: str = "section"):
+        self.name = name
+        self.kind = kind
+        self.elapsed = 0.0
+        self.children: List["_TimingNode"] = []
+
+
+class StartupProfiler:
+    """임포트/초기화 단계를 중첩 트리로 기록하는 프로파일러
+
+    section()으로 초기화 단계를 감싸고, install_import_hook()으로 처음 로드되는
+    모듈의 임포트 시간을 현재 단계 아래에 기록한다 (메인 스레드만 기록).
+    """
+
+    def __init__(self):
+        self.root = _TimingNode("startup")
+        self._stack: List[_TimingNode] = [self.root]
+        self._thread_id = threading.get_ident()
+        self._original_import = None
+        self._importing = set()
+        self._start_time = time.perf_counter()
+
+    def _record(self):
+        return threading.get_ident() == self._thread_id
+
+    @contextmanager
+    def section(self, name: str, kind: str = "section"):
+        """이름 있는 단계의 소요 시간 측정"""
+        if not self._record():
+            yield
+            return
+        node = _TimingNode(name, kind)
+        self._stack[-1].children.append(node)
+        self._stack.append(node)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            node.elapsed = time.perf_counter() - start_time
+            self._stack.pop()
+
+    def install_import_hook(self):
+        """builtins.__import__를 감싸 새로 로드되는 모듈의 임포트 시간 기록"""
+        if self._original_import is not None:
+            return
+        original_import = builtins.__import__
+        self._original_import = original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if not self._record():
+                return original_import(name, globals, locals, fromlist, level)
+            try:
+                module_name = name
+                if level:
+                    package = (globals or {}).get("__package__") or ""
+                    module_name = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                module_name = name
+            if not module_name or module_name in sys.modules or module_name in self._importing:
+                return original_import(name, globals, locals, fromlist, level)
+            self._importing.add(module_name)
+            try:
+                with self.section(module_name, kind="import"):
+                    return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self._importing.discard(module_name)
+
+        builtins.__import__ = timed_import
+
+    def uninstall_import_hook(self):
+        """임포트 훅 해제"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def print_report(self, min_ms: float = 10.0):
+        """min_ms 이상 걸린 항목만 트리 형태로 출력"""
+        self.root.elapsed = time.perf_counter() - self._start_time
+        print("\n" + "=" * 60)
+        print(f"⏱️  시작 시간 프로파일 (총 {self.root.elapsed * 1000:.0f}ms, {min_ms:.0f}ms 미만 생략)")
+        print("=" * 60)
+        for child in self.root.children:
+            self._print_node(child, 0, min_ms)
+        print("=" * 60)
+
+    def _print_node(self, node: _TimingNode, depth: int, min_ms: float):
+        elapsed_ms = node.elapsed * 1000
+        if elapsed_ms < min_ms:
+            return
+        icon = "📦" if node.kind == "import" else "🔧"
+        print(f"{'  ' * depth}{icon} {node.name}: {elapsed_ms:.0f}ms")
+        for child in node.children:
+            self._print_node(child, depth + 1, min_ms)
+
+
+def start_profiling(track_imports: bool = True) -> StartupProfiler:
+    """전역 프로파일러 활성화"""
+    global _active_profiler
+    _active_profiler = StartupProfiler()
+    if track_imports:
+        _active_profiler.install_import_hook()
+    return _active_profiler
+
+
+def stop_profiling() -> Optional[StartupProfiler]:
+    """전역 프로파일러 비활성화 (임포트 훅 해제)"""
+    global _active_profiler
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.uninstall_import_hook()
+    _active_profiler = None
+    return profiler
+
+
+@contextmanager
+def profile_section(name: str):
+    """활성 프로파일러가 있을 때만 단계 시간을 기록"""
+    if _active_profiler is None:
+        yield
+        return
+    with _active_profiler.section(name):
+        yield
@@ -0,0 +1,301 @@
+"""
+구조 인식 청커 - 매뉴얼의 제목/목록/표/경고 상자 단위로 청크 생성
+"""
+
+import re
+from collections import Counter
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+from langchain_core.documents import Document
+
+from ..config.settings import CHUNK_TARGET_TOKENS, CHUNK_MAX_TOKENS, HEADING_FONT_RATIO
+from .token_counter import estimate_tokens
+
+# 블록 유형
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_LIST = "list"
+BLOCK_TABLE = "table"
+BLOCK_WARNING = "warning"
+
+MAX_HEADING_LEVELS = 3
+MAX_HEADING_CHARS = 80
+
+_LIST_ITEM_RE = re.compile(r"^\s*([•·▪■□◦\-–*]|\d{1,2}[.)]|[①-⑳]|[가-하][.)])\s*")
+_WARNING_RE = re.compile(r"^\s*(경고|주의|위험|중요|참고|WARNING|CAUTION|DANGER|NOTE|IMPORTANT)\b")
+_CJK_START = 0x2E80
+
+
+class LayoutLine(NamedTuple):
+    """PDF 레이아웃에서 복원한 한 줄 (cells가 2개 이상이면 표 행)"""
+    page: int
+    text: str
+    font_size: float
+    cells: Tuple[str, ...] = ()
+
+
+class _Block:
+    """같은 유형의 연속된 줄 묶음"""
+
+    def __init__(self, kind: str, section_path: Tuple[str, ...], page: int):
+        self.kind = kind
+        self.section_path = section_path
+        self.start_page = page
+        self.end_page = page
+        self.lines: List[str] = []
+
+    def add(self, text: str, page: int):
+        self.lines.append(text)
+        self.end_page = max(self.end_page, page)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _matrix_multiply(m: List[float], n: List[float]) -> List[float]:
+    """PDF 변환 행렬 곱 (tm × cm)"""
+    return [
+        m[0] * n[0] + m[1] * n[2], m[0] * n[1] + m[1] * n[3],
+        m[2] * n[0] + m[3] * n[2], m[2] * n[1] + m[3] * n[3],
+        m[4] * n[0] + m[5] * n[2] + n[4], m[4] * n[1] + m[5] * n[3] + n[5],
+    ]
+
+
+def _estimate_width(text: str, font_size: float) -> float:
+    """글자 폭 근사 (CJK 전각, 그 외 반각)"""
+    return sum(font_size if ord(ch) >= _CJK_START else font_size * 0.5 for ch in text)
+
+
+def extract_layout_lines(pdf_path: str) -> List[LayoutLine]:
+    """pypdf 텍스트 방문자로 글꼴 크기/좌표를 수집하여 줄 단위로 복원"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(pdf_path)
+    lines: List[LayoutLine] = []
+
+    for page_number, page in enumerate(reader.pages, start=1):
+        runs = []
+
+        def visitor(text, cm, tm, font_dict, font_size):
+            if not text or not text.strip():
+                return
+            matrix = _matrix_multiply(tm, cm)
+            size = font_size * (abs(matrix[3]) or 1.0)
+            runs.append((matrix[4], matrix[5], round(size, 1), text.strip()))
+
+        page.extract_text(visitor_text=visitor)
+
+        # y 좌표가 가까운 조각을 한 줄로 묶음 (위에서 아래로)
+        rows: List[list] = []
+        for x, y, size, text in sorted(runs, key=lambda run: (-run[1], run[0])):
+            if rows and abs(rows[-1][0] - y) <= max(size, 1.0) * 0.5:
+                rows[-1][1].append((x, size, text))
+            else:
+                rows.append([y, [(x, size, text)]])
+
+        # 페이지 번호만 있는 머리/꼬리 줄 제거
+        while rows and " ".join(text for _, _, text in rows[-1][1]).isdigit():
+            rows.pop()
+        while rows and " ".join(text for _, _, text in rows[0][1]).isdigit():
+            rows.pop(0)
+
+        for _, row in rows:
+            row.sort(key=lambda run: run[0])
+            cells: List[str] = []
+            prev_end = None
+            for x, size, text in row:
+                if prev_end is not None and x - prev_end <= size * 2:
+                    cells[-1] = f"{cells[-1]} {text}"
+                else:
+                    cells.append(text)
+                prev_end = x + _estimate_width(text, size)
+            line_size = max(size for _, size, _ in row)
+            lines.append(LayoutLine(
+                page=page_number,
+                text=" ".join(cells),
+                font_size=line_size,
+                cells=tuple(cells) if len(cells) > 1 else ()
+            ))
+
+    return lines
+
+
+class StructureChunker:
+    """제목 계층을 따라 섹션을 나누고 목록/표/경고 상자를 깨지 않는 청커"""
+
+    def __init__(self, target_tokens: int = CHUNK_TARGET_TOKENS,
+                 max_tokens: int = CHUNK_MAX_TOKENS,
+                 heading_ratio: float = HEADING_FONT_RATIO):
+        self.target_tokens = target_tokens
+        self.max_tokens = max_tokens
+        self.heading_ratio = heading_ratio
+
+    def chunk_pdf(self, pdf_path: str) -> List[Document]:
+        """PDF를 구조 단위 청크로 변환 (실패 시 빈 리스트)"""
+        try:
+            print(f"🧱 구조 기반 청킹 중: {Path(pdf_path).name} (목표 {self.target_tokens} 토큰)")
+            lines = extract_layout_lines(pdf_path)
+            documents = self.chunk_lines(lines, source=pdf_path)
+            print(f"   📑 구조 청크 수: {len(documents)}")
+            return documents
+        except Exception as e:
+            print(f"❌ 구조 기반 청킹 오류: {str(e)}")
+            return []
+
+    def chunk_lines(self, lines: List[LayoutLine], source: str = "") -> List[Document]:
+        """레이아웃 줄 목록을 청크 문서로 변환"""
+        if not lines:
+            return []
+        blocks = self._build_blocks(lines)
+        total_pages = max(line.page for line in lines)
+        documents = []
+        for section_path, pieces, start_page, end_page, kinds in self._pack_blocks(blocks):
+            body = "\n\n".join(pieces)
+            header = " > ".join(section_path)
+            content = f"{header}\n{body}" if header else body
+            documents.append(Document(
+                page_content=content,
+                metadata={
+                    "source": source,
+                    "page": start_page,
+                    "end_page": end_page,
+                    "total_pages": total_pages,
+                    "section_path": header,
+                    "block_types": ",".join(kinds),
+                    "chunk_index": len(documents),
+                    "chunk_size": len(content),
+                    "chunk_tokens": estimate_tokens(content)
+                }
+            ))
+        return documents
+
+    def _heading_levels(self, lines: List[LayoutLine]) -> dict:
+        """본문 글꼴보다 큰 글꼴 크기를 제목 레벨(1부터)로 매핑"""
+        weighted = Counter()
+        for line in lines:
+            weighted[line.font_size] += len(line.text)
+        body_size = weighted.most_common(1)[0][0]
+        heading_sizes = sorted(
+            (size for size in weighted if size >= body_size * self.heading_ratio), reverse=True
+        )
+        return {
+            size: min(level, MAX_HEADING_LEVELS)
+            for level, size in enumerate(heading_sizes, start=1)
+        }
+
+    @staticmethod
+    def _table_rows(lines: List[LayoutLine]) -> List[bool]:
+        """열 개수가 같은 다중 셀 줄이 2줄 이상 연속될 때만 표 행으로 판단"""
+        flags = [False] * len(lines)
+        for i, line in enumerate(lines):
+            if not line.cells:
+                continue
+            for j in (i - 1, i + 1):
+                if 0 <= j < len(lines) and len(lines[j].cells) == len(line.cells):
+                    flags[i] = True
+        return flags
+
+    def _build_blocks(self, lines: List[LayoutLine]) -> List[_Block]:
+        """줄을 제목/목록/표/경고/문단 블록으로 분류"""
+        heading_levels = self._heading_levels(lines)
+        table_rows = self._table_rows(lines)
+        section: List[str] = []
+        blocks: List[_Block] = []
+        current: Optional[_Block] = None
+        last_heading: Optional[Tuple[int, int]] = None  # (레벨, 페이지) - 여러 줄 제목 병합용
+
+        def start(kind: str, page: int) -> _Block:
+            block = _Block(kind, tuple(section), page)
+            blocks.append(block)
+            return block
+
+        for line, is_table_row in zip(lines, table_rows):
+            text = line.text.strip()
+            if not text:
+                continue
+
+            level = heading_levels.get(line.font_size)
+            if level and len(text) <= MAX_HEADING_CHARS and not is_table_row:
+                if last_heading == (level, line.page) and len(section) == level:
+                    section[-1] = f"{section[-1]} {text}"
+                else:
+                    del section[level - 1:]
+                    section.extend([""] * (level - 1 - len(section)))
+                    section.append(text)
+                last_heading = (level, line.page)
+                current = None
+                continue
+            last_heading = None
+            if current is not None and current.section_path != tuple(section):
+                current = None
+
+            if _WARNING_RE.match(text):
+                current = start(BLOCK_WARNING, line.page)
+            elif is_table_row:
+                if current is None or current.kind != BLOCK_TABLE:
+                    current = start(BLOCK_TABLE, line.page)
+                text = " | ".join(line.cells)
+            elif _LIST_ITEM_RE.match(text):
+                if current is None or current.kind not in (BLOCK_LIST, BLOCK_WARNING):
+                    current = start(BLOCK_LIST, line.page)
+            elif current is None or current.kind == BLOCK_TABLE:
+                current = start(BLOCK_PARAGRAPH, line.page)
+
+            current.add(text, line.page)
+
+        for block in blocks:
+            block.section_path = tuple(title for title in block.section_path if title)
+        return blocks
+
+    def _split_block(self, block: _Block) -> List[str]:
+        """최대 토큰을 넘는 블록을 줄 경계에서 분할 (표는 머리 행 반복)"""
+        header = block.lines[0] if block.kind == BLOCK_TABLE else None
+        pieces, current, current_tokens = [], [], 0
+        for line in block.lines:
+            line_tokens = estimate_tokens(line)
+            if current and current_tokens + line_tokens > self.max_tokens:
+                pieces.append("\n".join(current))
+                current = [header] if header is not None else []
+                current_tokens = estimate_tokens(header) if header is not None else 0
+            current.append(line)
+            current_tokens += line_tokens
+        if current:
+            pieces.append("\n".join(current))
+        return pieces
+
+    def _pack_blocks(self, blocks: List[_Block]):
+        """같은 섹션의 블록을 목표 토큰 수까지 묶어 (섹션, 본문 조각, 페이지 범위, 블록 유형) 생성"""
+        pending: List[str] = []
+        pending_tokens = 0
+        pending_kinds: List[str] = []
+        pending_section: Tuple[str, ...] = ()
+        pages = [0, 0]
+
+        def flush():
+            nonlocal pending, pending_tokens, pending_kinds
+            if pending:
+                yield pending_section, pending, pages[0], pages[1], pending_kinds
+            pending, pending_tokens, pending_kinds = [], 0, []
+
+        for block in blocks:
+            block_tokens = estimate_tokens(block.text)
+            if pending and (block.section_path != pending_section
+                            or pending_tokens + block_tokens > self.target_tokens):
+                yield from flush()
+
+            if block_tokens > self.max_tokens:
+                yield from flush()
+                for piece in self._split_block(block):
+                    yield block.section_path, [piece], block.start_page, block.end_page, [block.kind]
+                continue
+
+            if not pending:
+                pending_section = block.section_path
+                pages[:] = [block.start_page, block.end_page]
+            pending.append(block.text)
+            pending_tokens += block_tokens
+            pages[1] = max(pages[1], block.end_page)
+            if block.kind not in pending_kinds:
+                pending_kinds.append(block.kind)
+
+        yield from flush()
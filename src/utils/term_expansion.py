@@ -0,0 +1,170 @@
+"""
+차량 전문 용어 질의 확장 - Aho-Corasick 오토마톤으로 용어/동의어를 한 번에 찾아 가중 확장
+"""
+
+import threading
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple
+import numpy as np
+
+from ..config.settings import VEHICLE_TERMS, EXPANSION_TERM_WEIGHT, EXPANSION_VECTOR_WEIGHT
+
+
+class AhoCorasick:
+    """다중 패턴 문자열 검색 오토마톤 (생성 시 한 번 컴파일, 검색은 텍스트 길이에 비례)"""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(pattern_id)
+
+        # 너비 우선으로 실패 링크 계산 (접미사 상태의 출력 병합)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """모든 (시작, 끝, 패턴) 일치 (겹침 포함)"""
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for pattern_id in self._output[state]:
+                pattern = self.patterns[pattern_id]
+                matches.append((position + 1 - len(pattern), position + 1, pattern))
+        return matches
+
+    def find_longest(self, text: str) -> List[Tuple[int, int, str]]:
+        """겹치지 않는 최장 일치 (왼쪽부터)"""
+        selected, last_end = [], 0
+        for start, end, pattern in sorted(self.find_all(text), key=lambda m: (m[0], m[0] - m[1])):
+            if start >= last_end:
+                selected.append((start, end, pattern))
+                last_end = end
+        return selected
+
+
+@dataclass
+class TermExpansion:
+    """질의 확장 결과"""
+    query: str
+    matched_terms: List[str] = field(default_factory=list)
+    groups: List[str] = field(default_factory=list)
+    synonyms: List[str] = field(default_factory=list)  # 질의에 없는 확장 용어
+
+
+class VehicleTermExpander:
+    """차량 전문 용어 확장기
+
+    VEHICLE_TERMS의 대표 용어와 동의어 전체를 하나의 오토마톤으로 컴파일해 질의를 한 번만
+    훑는다. 어떤 동의어가 나와도 해당 용어 그룹으로 확장하며, 확장은 문자열 연결 대신
+    BM25 가중 질의 용어(동의어는 term_weight)와 그룹 임베딩 평균을 섞은 질의 벡터로 제공한다.
+    """
+
+    def __init__(self, vehicle_terms: Dict[str, List[str]] = None,
+                 term_weight: float = EXPANSION_TERM_WEIGHT, vector_weight: float = EXPANSION_VECTOR_WEIGHT):
+        vehicle_terms = VEHICLE_TERMS if vehicle_terms is None else vehicle_terms
+        self.term_weight = term_weight
+        self.vector_weight = vector_weight
+        self.groups: Dict[str, List[str]] = {
+            group: list(dict.fromkeys([group] + synonyms)) for group, synonyms in vehicle_terms.items()
+        }
+        self._term_groups: Dict[str, List[str]] = {}
+        for group, terms in self.groups.items():
+            for term in terms:
+                self._term_groups.setdefault(term.lower(), []).append(group)
+        self.automaton = AhoCorasick(self._term_groups)
+        self._group_vectors: Dict[Tuple[str, str], np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def expand(self, query: str) -> TermExpansion:
+        """질의의 용어 그룹과 확장 용어 (그룹 순서 유지, 중복 제거)"""
+        query_lower = query.lower()
+        expansion = TermExpansion(query=query)
+        for _, _, term in self.automaton.find_longest(query_lower):
+            expansion.matched_terms.append(term)
+            for group in self._term_groups[term]:
+                if group not in expansion.groups:
+                    expansion.groups.append(group)
+
+        seen = set()
+        for group in expansion.groups:
+            for synonym in self.groups[group]:
+                key = synonym.lower()
+                if key not in seen and key not in query_lower:
+                    seen.add(key)
+                    expansion.synonyms.append(synonym)
+        return expansion
+
+    def bm25_term_weights(self, query: str, tokenize: Callable[[str], List[str]]) -> Dict[str, float]:
+        """BM25 가중 질의 (원본 토큰은 출현 횟수, 확장 토큰은 term_weight)"""
+        weights: Dict[str, float] = dict(Counter(tokenize(query)))
+        for synonym in self.expand(query).synonyms:
+            for token in tokenize(synonym):
+                weights[token] = max(weights.get(token, 0.0), self.term_weight)
+        return weights
+
+    def _group_vector(self, group: str, embeddings) -> np.ndarray:
+        """용어 그룹의 정규화 평균 벡터 (모델별로 한 번만 임베딩)"""
+        key = (getattr(embeddings, "model", type(embeddings).__name__), group)
+        vector = self._group_vectors.get(key)
+        if vector is None:
+            terms = self.groups[group]
+            if hasattr(embeddings, "embed_queries"):
+                term_vectors = embeddings.embed_queries(terms)
+            else:
+                term_vectors = embeddings.embed_documents(terms)
+            vector = np.mean(np.asarray(term_vectors, dtype=np.float32), axis=0)
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+            with self._lock:
+                self._group_vectors[key] = vector
+        return vector
+
+    def expanded_vector(self, query: str, embeddings) -> List[float]:
+        """질의 벡터와 일치한 용어 그룹 평균 벡터의 가중 평균 (일치가 없으면 질의 벡터)"""
+        query_vector = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+        groups = self.expand(query).groups
+        if not groups or self.vector_weight <= 0:
+            return query_vector.tolist()
+
+        query_vector /= max(float(np.linalg.norm(query_vector)), 1e-12)
+        group_mean = np.mean([self._group_vector(group, embeddings) for group in groups], axis=0)
+        vector = (1.0 - self.vector_weight) * query_vector + self.vector_weight * group_mean
+        return (vector / max(float(np.linalg.norm(vector)), 1e-12)).tolist()
+
+
+_default_expander = None
+_default_expander_lock = threading.Lock()
+
+
+def get_vehicle_term_expander() -> VehicleTermExpander:
+    """VEHICLE_TERMS로 컴파일한 공용 확장기 (첫 호출 시 생성)"""
+    global _default_expander
+    if _default_expander is None:
+        with _default_expander_lock:
+            if _default_expander is None:
+                _default_expander = VehicleTermExpander()
+    return _default_expander
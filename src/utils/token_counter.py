@@ -0,0 +1,8 @@
+"""
+토큰 수 추정 유틸리티
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (한글 1자≈1토큰, 영문 3~4자≈1토큰 수준의 보수적 추정)"""
+    return len(text.encode("utf-8")) // 3 + 1
@@ -1,3 +1,13 @@
 """
 Tests module for Vehicle Manual RAG System
 """
+
+import atexit
+import os
+import shutil
+import tempfile
+
+# 테스트 중 생성되는 에이전트의 LLM 응답 캐시는 임시 디렉터리에 저장 (설정 모듈 로드 전에 지정)
+_llm_cache_dir = tempfile.mkdtemp(prefix="llm_cache_test_")
+os.environ["LLM_CACHE_PATH"] = os.path.join(_llm_cache_dir, "llm_cache.sqlite3")
+atexit.register(shutil.rmtree, _llm_cache_dir, ignore_errors=True)
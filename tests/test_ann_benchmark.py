@@ -0,0 +1,177 @@
+"""
+ANN 인덱스 벤치마크
+정확 검색(flat) 대비 IVF 근사 검색의 재현율/지연 시간 비교
+"""
+
+import os
+import json
+import time
+import statistics
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+import numpy as np
+
+from src.config.settings import VECTOR_INDEX_DIR
+from src.retrievers.numpy_vector_store import FlatVectorIndex, normalize_rows
+from src.retrievers.ann_index import IVFVectorIndex
+
+# 실제 매뉴얼 질의 (OPENAI_API_KEY가 있으면 임베딩하여 사용)
+BENCHMARK_QUERIES = [
+    "브레이크 경고등이 켜졌어요",
+    "엔진 과열 시 대처 방법",
+    "타이어 공기압 점검 방법",
+    "에어백 경고등 의미",
+    "연료 주입구 여는 방법",
+    "와이퍼 교체 방법",
+    "시트 조정 방법",
+    "블루투스 연결 방법",
+    "엔진 오일 교체 주기",
+    "차선 유지 보조 기능 사용법",
+]
+
+
+@dataclass
+class ANNBenchmarkResult:
+    """nprobe 설정별 벤치마크 결과"""
+    nprobe: int
+    recall: float
+    avg_ms: float
+    p95_ms: float
+    scanned_ratio: float
+
+
+def load_manual_vectors(index_dir=VECTOR_INDEX_DIR) -> Optional[np.ndarray]:
+    """저장된 벡터 인덱스(유형 무관)에서 매뉴얼 청크 임베딩 로드"""
+    vectors_path = os.path.join(str(index_dir), "vectors.npy")
+    if not os.path.exists(vectors_path):
+        return None
+    return np.asarray(np.load(vectors_path), dtype=np.float32)
+
+
+def embed_benchmark_queries() -> Optional[np.ndarray]:
+    """실제 질의 임베딩 (API 키가 없으면 None)"""
+    if not os.getenv("OPENAI_API_KEY"):
+        return None
+    from langchain_openai import OpenAIEmbeddings
+    return np.asarray(OpenAIEmbeddings().embed_documents(BENCHMARK_QUERIES), dtype=np.float32)
+
+
+def replicate_fleet(vectors: np.ndarray, copies: int, noise: float = 0.05, seed: int = 0) -> np.ndarray:
+    """매뉴얼 벡터를 잡음과 함께 복제하여 여러 매뉴얼 규모를 모사"""
+    if copies <= 1:
+        return vectors
+    rng = np.random.default_rng(seed)
+    replicas = [vectors] + [
+        normalize_rows(vectors + rng.normal(scale=noise, size=vectors.shape).astype(np.float32))
+        for _ in range(copies - 1)
+    ]
+    return np.concatenate(replicas)
+
+
+def synthetic_vectors(num_vectors: int = 20000, dim: int = 256, clusters: int = 200,
+                      seed: int = 0) -> np.ndarray:
+    """군집 구조를 가진 합성 벡터 (저장된 인덱스가 없을 때)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=num_vectors)
+    return normalize_rows(centers[labels] + rng.normal(scale=0.6, size=(num_vectors, dim)).astype(np.float32))
+
+
+class ANNBenchmark:
+    """정확 검색 대비 IVF 재현율/지연 시간 벤치마크"""
+
+    def __init__(self, vectors: np.ndarray, queries: np.ndarray, k: int = 10, nlist: int = 0):
+        ids = [f"v{i}" for i in range(len(vectors))]
+        self.k = k
+        self.queries = queries
+        self.exact = FlatVectorIndex.build(ids, vectors, "benchmark")
+
+        start_time = time.time()
+        self.ivf = IVFVectorIndex.build(ids, vectors, "benchmark", nlist=nlist)
+        self.build_time = time.time() - start_time
+        print(f"🧮 IVF 빌드: {len(ids)}개 벡터, {self.ivf.nlist}개 리스트, {self.build_time:.2f}초")
+
+        self.ground_truth = [
+            {self.exact.ids[position] for position, _ in hits}
+            for hits in self.exact.search(queries, k)
+        ]
+
+    def _time_search(self, index, **kwargs):
+        """질의별 검색 시간(ms)과 결과"""
+        index.search(self.queries[0], self.k, **kwargs)  # 워밍업
+        times, results = [], []
+        for query in self.queries:
+            start_time = time.perf_counter()
+            hits = index.search(query, self.k, **kwargs)[0]
+            times.append((time.perf_counter() - start_time) * 1000)
+            results.append({index.ids[position] for position, _ in hits})
+        return times, results
+
+    @staticmethod
+    def _summary(times: List[float]):
+        return statistics.mean(times), sorted(times)[max(0, int(len(times) * 0.95) - 1)]
+
+    def run(self, nprobes: List[int]) -> Dict:
+        """nprobe 설정별 재현율@k와 지연 시간 측정"""
+        exact_times, _ = self._time_search(self.exact)
+        exact_avg, exact_p95 = self._summary(exact_times)
+        print(f"\n📏 정확 검색: 평균 {exact_avg:.2f}ms, p95 {exact_p95:.2f}ms")
+
+        results = []
+        list_sizes = np.diff(self.ivf.list_offsets)
+        for nprobe in sorted(set(min(n, self.ivf.nlist) for n in nprobes)):
+            times, found = self._time_search(self.ivf, nprobe=nprobe)
+            recall = statistics.mean(
+                len(hits & truth) / max(len(truth), 1) for hits, truth in zip(found, self.ground_truth)
+            )
+            avg_ms, p95_ms = self._summary(times)
+            scanned = np.sort(list_sizes)[::-1][:nprobe].sum() / max(self.ivf.num_vectors, 1)
+            results.append(ANNBenchmarkResult(nprobe, recall, avg_ms, p95_ms, float(scanned)))
+            print(f"   nprobe={nprobe:4d}: recall@{self.k} {recall:.3f}, "
+                  f"평균 {avg_ms:.2f}ms, p95 {p95_ms:.2f}ms (스캔 ≤{scanned:.1%})")
+
+        return {
+            "num_vectors": self.ivf.num_vectors,
+            "nlist": self.ivf.nlist,
+            "build_time": self.build_time,
+            "exact_avg_ms": exact_avg,
+            "exact_p95_ms": exact_p95,
+            "results": [result.__dict__ for result in results]
+        }
+
+
+def run_ann_benchmark(fleet_copies: int = 50, k: int = 10, nprobes: List[int] = None,
+                      num_queries: int = 200):
+    """실제 매뉴얼 임베딩(없으면 합성 벡터)으로 ANN 벤치마크 실행"""
+    try:
+        nprobes = nprobes or [1, 2, 4, 8, 16, 32, 64]
+        rng = np.random.default_rng(1)
+        manual_vectors = load_manual_vectors()
+
+        queries = None
+        if manual_vectors is not None:
+            print(f"📘 매뉴얼 임베딩 {len(manual_vectors)}개 x {fleet_copies}대 규모로 벤치마크")
+            vectors = replicate_fleet(manual_vectors, fleet_copies)
+            queries = embed_benchmark_queries()
+        else:
+            print("⚠️ 저장된 벡터 인덱스가 없어 합성 벡터로 벤치마크합니다")
+            vectors = synthetic_vectors()
+
+        if queries is None:
+            # 실제 질의를 임베딩할 수 없으면 저장된 벡터에 잡음을 더해 질의로 사용
+            picks = rng.choice(len(vectors), min(num_queries, len(vectors)), replace=False)
+            queries = normalize_rows(vectors[picks] + rng.normal(scale=0.1, size=(len(picks), vectors.shape[1])))
+
+        report = ANNBenchmark(vectors, queries, k=k).run(nprobes)
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return report
+
+    except Exception as e:
+        print(f"❌ ANN 벤치마크 실행 중 오류: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+if __name__ == "__main__":
+    run_ann_benchmark()
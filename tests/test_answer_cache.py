@@ -0,0 +1,154 @@
+"""
+의미 기반 답변 캐시 테스트
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from src.agents.vehicle_agent import VehicleManualAgent
+from src.retrievers.shard_manager import ManualShard
+from src.utils.answer_cache import SemanticAnswerCache
+from src.utils.emergency_detector import EmergencyDetector
+
+# (캐시된 질의, 새 질의, 같은 답변이어야 하는지) - 임베딩 유사도가 임계값을 넘어도 부품이나 증상 여부가 다르면 미스
+LABELLED_PAIRS = [
+    ("엔진 오일 교체 주기", "엔진오일 교체는 언제", True),
+    ("타이어 공기압은 얼마", "타이어 압력 권장값", True),
+    ("배터리 충전 방법", "배터리 충전하는 법", True),
+    ("엔진 오일 교체 주기", "오일 언제 갈아요", True),
+    ("엔진 오일 교체 주기", "엔진 오일 언제 갈아요", True),
+    ("엔진 오일 교체 주기", "브레이크 오일 교체 주기", False),
+    ("타이어 공기압 점검", "타이어 공기압 경고등", False),
+    ("배터리 방전 시 대처", "연료 부족 시 대처", False),
+    ("시동 거는 방법", "주차 보조 사용 방법", False),
+    ("브레이크 패드 교체", "브레이크 패드 소음 문제", False),
+]
+
+
+class TestSemanticAnswerCache(unittest.TestCase):
+    """의미 기반 답변 캐시 테스트"""
+
+    def setUp(self):
+        self.cache = SemanticAnswerCache(threshold=0.95, maxsize=2, ttl=None)
+        self.cache.store("xc60", "v1", "엔진 오일 교체 주기", [1.0, 0.0, 0.0], "1만 km마다 교체\n\n📚 참고 페이지: 326", [326])
+
+    def test_similar_query_hits(self):
+        """유사도가 임계값 이상인 질의는 저장된 답변과 참고 페이지 반환"""
+        hit = self.cache.lookup("xc60", "v1", "엔진오일 교체는 언제", [0.99, 0.1, 0.0])
+        self.assertIsNotNone(hit)
+        cached, similarity = hit
+        self.assertEqual(cached.page_references, [326])
+        self.assertGreater(similarity, 0.95)
+        self.assertIsNone(self.cache.lookup("xc60", "v1", "엔진오일 교체는 언제", [0.9, 0.4, 0.0]))
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_labelled_near_misses_rejected(self):
+        """임베딩이 임계값을 넘는 좁은 대역이어도 부품 그룹이나 증상 여부가 다른 질문은 적중하지 않음"""
+        for cached_query, query, same in LABELLED_PAIRS:
+            cache = SemanticAnswerCache(threshold=0.95, ttl=None)
+            cache.store("xc60", "v1", cached_query, [1.0, 0.0, 0.0], "답변", [1])
+            hit = cache.lookup("xc60", "v1", query, [0.97, 0.243, 0.0])
+            self.assertEqual(hit is not None, same, (cached_query, query))
+
+    def test_emergency_query_near_cached_answer_misses(self):
+        """캐시된 일반 답변과 가까워도 응급 질의는 적중하지 않고, 응급 답변은 저장하지 않음"""
+        self.cache.store("xc60", "v1", "엔진 정지 후 재시동 방법", [0.0, 1.0, 0.0], "시동 버튼을 누르세요", [120])
+        emergency_query = "엔진이 갑자기 정지했어요! 시동 방법은?"
+        self.assertIsNotNone(self.cache.lookup("xc60", "v1", emergency_query, [0.0, 1.0, 0.0]))
+        for level in ["MEDIUM", "HIGH", "CRITICAL"]:
+            self.assertIsNone(self.cache.lookup("xc60", "v1", emergency_query, [0.0, 1.0, 0.0], emergency_level=level))
+        self.assertEqual(self.cache.stats()["bypassed"], 3)
+
+        self.cache.store("xc60", "v1", "주행 중 핸들이 잠겼어요", [0.0, 0.0, 1.0], "즉시 정차", [50], emergency_level="HIGH")
+        self.assertIsNone(self.cache.lookup("xc60", "v1", "주행 중 핸들이 잠겼어요", [0.0, 0.0, 1.0]))
+
+    def test_namespaces_and_fingerprint_invalidation(self):
+        """다른 차량 매뉴얼과는 공유하지 않고, 인덱스 지문이 바뀌면 비움"""
+        query = "엔진 오일 교체 주기"
+        self.assertIsNone(self.cache.lookup("ex30", "v1", query, [1.0, 0.0, 0.0]))
+        self.assertIsNone(self.cache.lookup("xc60", "v2", query, [1.0, 0.0, 0.0]))
+        self.assertIsNone(self.cache.lookup("xc60", "v1", query, [1.0, 0.0, 0.0]))
+
+    def test_lru_eviction_and_ttl(self):
+        """용량 초과 시 가장 오래 사용하지 않은 항목 제거, TTL 지나면 만료"""
+        self.cache.store("xc60", "v1", "타이어 공기압", [0.0, 1.0, 0.0], "36 psi", [316])
+        self.assertIsNotNone(self.cache.lookup("xc60", "v1", "엔진 오일 교체 주기", [1.0, 0.0, 0.0]))
+        self.cache.store("xc60", "v1", "연료 탱크 용량", [0.0, 0.0, 1.0], "68리터", [89])
+        self.assertIsNone(self.cache.lookup("xc60", "v1", "타이어 공기압", [0.0, 1.0, 0.0]))
+        self.assertIsNotNone(self.cache.lookup("xc60", "v1", "엔진 오일 교체 주기", [1.0, 0.0, 0.0]))
+
+        self.cache.ttl = 0.01
+        self.cache.store("xc60", "v1", "와이퍼 교체", [0.6, 0.0, 0.8], "교체 방법", [300])
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.lookup("xc60", "v1", "와이퍼 교체", [0.6, 0.0, 0.8]))
+
+
+class FixedEmbeddings:
+    """모든 질의에 같은 벡터 반환"""
+
+    def embed_query(self, text):
+        return [0.0, 1.0, 0.0]
+
+
+class FakeGraph:
+    """고정 결과를 반환하는 그래프"""
+
+    def __init__(self, result):
+        self.result = result
+
+    def invoke(self, state, config=None):
+        return self.result
+
+
+class TestAgentAnswerCacheBypass(unittest.TestCase):
+    """에이전트의 답변 캐시 로컬 게이트 테스트"""
+
+    def setUp(self):
+        # 모델 없이 캐시 조회/저장 경로만 사용
+        self.agent = object.__new__(VehicleManualAgent)
+        self.agent.answer_cache = SemanticAnswerCache(threshold=0.95, ttl=None)
+        self.agent.keyword_emergency_detector = EmergencyDetector()
+        self.agent.embeddings = FixedEmbeddings()
+        self.agent.default_vehicle_id = "xc60"
+        self.shard = ManualShard("xc60", {"pdf_path": "xc60.pdf"})
+        self.agent.get_shard = lambda vehicle_id: self.shard
+        self.agent.answer_cache.store("xc60", "", "엔진 정지 후 재시동 방법", [0.0, 1.0, 0.0], "시동 버튼을 누르세요", [120])
+        self.result = {"final_answer": "새 답변", "page_references": [7], "emergency_level": "NORMAL"}
+        self.agent.create_graph = lambda: FakeGraph(self.result)
+        self.agent.create_emergency_fast_path = lambda: FakeGraph(self.result)
+
+    def detector(self, priority_level: str):
+        """LLM 응급 감지기 대체 (호출 횟수 기록)"""
+        detector = mock.Mock()
+        detector.return_value.detect_emergency.return_value = {
+            "is_emergency": priority_level != "NORMAL", "priority_level": priority_level, "total_score": 0.0
+        }
+        return mock.patch("src.utils.llm_emergency_detector.LLMEmergencyDetector", detector)
+
+    def test_hit_is_served_without_llm_detection(self):
+        """로컬 게이트를 통과한 질의는 LLM 응급 감지 없이 캐시 답변 반환"""
+        with self.detector("HIGH") as detector:
+            self.assertEqual(self.agent.query("엔진 정지 후 재시동 방법은?"), "시동 버튼을 누르세요")
+        detector.assert_not_called()
+
+    def test_local_cues_bypass_cache(self):
+        """키워드 감지 수준이 NORMAL보다 높거나 고장/증상 단서가 있으면 조회하지 않음"""
+        for query in ["엔진에서 연기가 나요", "엔진 재시동 시 소음이 나요"]:
+            self.assertEqual(self.agent._lookup_cached_answer(query, self.shard), (None, None))
+        self.assertEqual(self.agent.answer_cache.stats()["bypassed"], 2)
+
+    def test_only_llm_confirmed_normal_answers_are_stored(self):
+        """캐시 미스 후 LLM이 응급으로 판단한 답변은 빠른 경로로 처리하고 저장하지 않음"""
+        with self.detector("HIGH") as detector:
+            self.assertEqual(self.agent.query("타이어 공기압은 얼마"), "새 답변")
+        detector.assert_called_once()
+        self.assertEqual(self.agent.answer_cache.stats()["namespaces"]["xc60"], 1)
+
+        with self.detector("NORMAL"):
+            self.agent.query("타이어 공기압은 얼마")
+        self.assertEqual(self.agent.answer_cache.stats()["namespaces"]["xc60"], 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+BM25 역색인 테스트
+"""
+
+import math
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+from langchain_core.documents import Document
+
+from src.retrievers.bm25_index import BM25Index, BM25_K1, BM25_B
+from src.retrievers.bm25_retriever import InvertedIndexBM25Retriever
+
+
+def reference_bm25(tokenized_docs, query_tokens, doc):
+    """전체 문서를 순회하는 참조 BM25 점수"""
+    n = len(tokenized_docs)
+    avgdl = sum(len(d) for d in tokenized_docs) / n
+    counts = Counter(doc)
+    score = 0.0
+    for term in query_tokens:
+        df = sum(1 for d in tokenized_docs if term in d)
+        idf = math.log1p((n - df + 0.5) / (df + 0.5))
+        tf = counts[term]
+        score += idf * tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * len(doc) / avgdl))
+    return score
+
+
+class TestBM25Index(unittest.TestCase):
+    """BM25 역색인 테스트"""
+
+    def setUp(self):
+        self.tokenized_docs = [
+            ["타이어", "공기압", "점검"],
+            ["브레이크", "패드", "교체"],
+            ["엔진", "오일", "교체", "주기"],
+            ["타이어", "교체", "방법", "타이어"],
+            ["와이퍼", "블레이드"],
+        ]
+        self.index = BM25Index.build(self.tokenized_docs, "corpus-v1", "whitespace")
+
+    def test_scores_match_reference(self):
+        """포스팅 기반 점수가 전체 순회 점수와 일치"""
+        query = ["타이어", "교체"]
+        hits = self.index.search(query, k=5)
+        self.assertEqual(hits[0][0], 3)
+        for doc_id, score in hits:
+            expected = reference_bm25(self.tokenized_docs, query, self.tokenized_docs[doc_id])
+            self.assertAlmostEqual(score, expected, places=4)
+
+    def test_only_matching_documents_returned(self):
+        """질의 용어가 없는 문서는 결과에 포함되지 않음"""
+        hits = self.index.search(["와이퍼"], k=5)
+        self.assertEqual([doc_id for doc_id, _ in hits], [4])
+        self.assertEqual(self.index.search(["없는용어"], k=5), [])
+
+    def test_save_and_load_roundtrip(self):
+        """저장 후 메모리 매핑 로드 및 버전 검증"""
+        with tempfile.TemporaryDirectory() as tmp:
+            index_dir = Path(tmp) / "bm25"
+            self.index.save(index_dir)
+
+            loaded = BM25Index.load(index_dir, "corpus-v1", "whitespace")
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.search(["교체"], k=3), self.index.search(["교체"], k=3))
+
+            self.assertIsNone(BM25Index.load(index_dir, "corpus-v2", "whitespace"))
+            self.assertIsNone(BM25Index.load(index_dir, "corpus-v1", "kiwi"))
+
+    def test_retriever_exposes_scores(self):
+        """리트리버가 metadata에 BM25 점수를 담아 반환"""
+        docs = [
+            Document(page_content=" ".join(tokens), metadata={"page": i + 1})
+            for i, tokens in enumerate(self.tokenized_docs)
+        ]
+        retriever = InvertedIndexBM25Retriever.from_index(
+            self.index, docs=docs, preprocess_func=str.split, k=2
+        )
+        results = retriever.invoke("타이어 교체")
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0].metadata["page"], 4)
+        self.assertGreater(results[0].metadata["score"], results[1].metadata["score"])
+        self.assertNotIn("score", docs[3].metadata)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+질의 임베딩 캐시 테스트
+"""
+
+import contextvars
+import threading
+import time
+import unittest
+from typing import List
+from langchain_core.embeddings import Embeddings
+
+from src.utils.embedding_cache import CachedEmbeddings, embedding_request_scope
+
+
+class CountingEmbeddings(Embeddings):
+    """호출 횟수를 세는 느린 가짜 임베딩"""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.query_calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls += 1
+        time.sleep(0.05)
+        return [float(len(text))]
+
+
+class TestCachedEmbeddings(unittest.TestCase):
+    """질의 임베딩 캐시 테스트"""
+
+    def test_repeated_query_embedded_once(self):
+        """정규화 후 같은 질의는 프로세스 캐시에서 반환"""
+        base = CountingEmbeddings()
+        embeddings = CachedEmbeddings(base)
+        first = embeddings.embed_query("타이어  공기압 ")
+        self.assertEqual(embeddings.embed_query("타이어 공기압"), first)
+        self.assertEqual(base.query_calls, 1)
+        self.assertEqual(embeddings.model, "fake-embedding")
+
+    def test_concurrent_retrievers_share_request_scope(self):
+        """한 요청 안에서 동시에 임베딩을 요청해도 한 번만 호출"""
+        base = CountingEmbeddings()
+        embeddings = CachedEmbeddings(base, ttl=None)
+        with embedding_request_scope() as scope:
+            threads = [
+                threading.Thread(target=contextvars.copy_context().run,
+                                 args=(embeddings.embed_query, "브레이크 경고등"))
+                for _ in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(base.query_calls, 1)
+        self.assertEqual(scope.embed_calls, 1)
+
+    def test_ttl_expiry_reembeds(self):
+        """TTL이 지나면 다시 임베딩"""
+        base = CountingEmbeddings()
+        embeddings = CachedEmbeddings(base, ttl=0.01)
+        embeddings.embed_query("엔진 오일")
+        time.sleep(0.02)
+        embeddings.embed_query("엔진 오일")
+        self.assertEqual(base.query_calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+벌크 임베딩 파이프라인 테스트
+"""
+
+import tempfile
+import time
+import unittest
+from functools import partial
+from typing import List
+from unittest import mock
+
+from src.retrievers.embedding_pipeline import (
+    EmbeddingIngestionError, EmbeddingIngestionPipeline, IngestionCheckpoint, TokenBudgetLimiter
+)
+from src.retrievers.index_manifest import build_chunk_hashes
+from src.retrievers.vector_retriever import VectorStoreManager
+from src.utils.document_loader import get_chunking_config
+from src.utils.token_counter import estimate_tokens
+from tests.test_index_sync import InMemoryVectorStore, RecordingEmbeddings, make_docs
+
+
+class FlakyEmbeddings(RecordingEmbeddings):
+    """지정한 오류를 차례로 발생시킨 뒤 정상 임베딩 (특정 텍스트는 항상 실패 가능)"""
+
+    def __init__(self, errors: List[Exception] = None, always_fail: str = None):
+        super().__init__()
+        self.errors = list(errors or [])
+        self.always_fail = always_fail
+        self.calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        if self.always_fail in texts:
+            raise ValueError("400: 입력이 너무 깁니다")
+        return super().embed_documents(texts)
+
+
+class RecordingLimiter(TokenBudgetLimiter):
+    """차감 요청을 기록하는 토큰 버킷"""
+
+    def __init__(self):
+        super().__init__(1_000_000)
+        self.acquired: List[int] = []
+
+    def acquire(self, tokens: int):
+        self.acquired.append(tokens)
+        super().acquire(tokens)
+
+
+class TestTokenBudgetLimiter(unittest.TestCase):
+    """토큰 버킷 테스트"""
+
+    def test_waits_for_refill_after_budget_spent(self):
+        """예산을 다 쓰면 보충될 때까지 대기하고, 용량보다 큰 요청은 용량으로 제한"""
+        limiter = TokenBudgetLimiter(60_000)  # 초당 1000 토큰
+        start = time.monotonic()
+        limiter.acquire(100_000)
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertLess(limiter.available, 1.0)
+
+        start = time.monotonic()
+        limiter.acquire(100)
+        self.assertGreaterEqual(time.monotonic() - start, 0.08)
+
+
+class TestEmbedWithRetry(unittest.TestCase):
+    """배치 임베딩 재시도 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.texts = ["브레이크 점검", "타이어 교체"]
+        self.tokens = sum(estimate_tokens(text) for text in self.texts)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pipeline(self, embeddings) -> EmbeddingIngestionPipeline:
+        pipeline = EmbeddingIngestionPipeline(embeddings, InMemoryVectorStore(), self.tmp.name, "fake-embedding",
+                                              max_retries=3, retry_base_delay=0.0)
+        pipeline.limiter = RecordingLimiter()
+        return pipeline
+
+    def test_every_attempt_is_charged_to_the_budget(self):
+        """일시적 오류 후 재시도할 때마다 배치 토큰을 다시 차감"""
+        embeddings = FlakyEmbeddings([TimeoutError("timeout"), ConnectionError("reset")])
+        pipeline = self.pipeline(embeddings)
+        self.assertEqual(len(pipeline._embed_with_retry(self.texts)), 2)
+        self.assertEqual(pipeline.limiter.acquired, [self.tokens] * 3)
+        self.assertEqual(pipeline.retry_count, 2)
+
+    def test_permanent_errors_are_not_retried(self):
+        """재시도해도 성공하지 않는 오류(400 등)는 바로 실패"""
+        embeddings = FlakyEmbeddings([ValueError("400: 입력이 너무 깁니다")])
+        pipeline = self.pipeline(embeddings)
+        with self.assertRaises(ValueError):
+            pipeline._embed_with_retry(self.texts)
+        self.assertEqual(embeddings.calls, 1)
+        self.assertEqual(pipeline.retry_count, 0)
+
+
+class TestResumableIngestion(unittest.TestCase):
+    """체크포인트 기반 재개 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_dir = self.tmp.name
+        self.store = InMemoryVectorStore()
+        self.docs = make_docs("브레이크", "타이어", "엔진", "배터리")
+        self.hashes = build_chunk_hashes(self.docs)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, embeddings):
+        manager = VectorStoreManager("manual.pdf", chroma_dir=self.index_dir, embeddings=embeddings)
+        manager.vector_store = self.store
+        # 청크마다 한 배치 (배치 단위 실패/재개 확인용)
+        pipeline_cls = partial(EmbeddingIngestionPipeline, batch_size=1, max_workers=1)
+        with mock.patch("src.retrievers.vector_retriever.EmbeddingIngestionPipeline", pipeline_cls):
+            manager._sync_index(self.docs, self.index_dir, get_chunking_config())
+        return manager
+
+    def test_partial_failure_is_retried_on_next_sync(self):
+        """실패한 배치만 매니페스트에서 빠지고 다음 동기화에서 그 청크만 임베딩"""
+        with self.assertRaises(EmbeddingIngestionError) as raised:
+            self.sync(FlakyEmbeddings(always_fail="엔진"))
+        failed_ids = raised.exception.failed_ids
+        self.assertEqual(len(failed_ids), 1)
+        checkpoint = IngestionCheckpoint(self.index_dir, "fake-embedding").load()
+        self.assertEqual(len(checkpoint), 3)
+        self.assertNotIn(failed_ids[0], checkpoint)
+
+        embeddings = RecordingEmbeddings()
+        manager = self.sync(embeddings)
+        self.assertEqual(embeddings.embedded, ["엔진"])
+        self.assertEqual(manager.manifest.data["chunks"], self.hashes)
+        self.assertEqual(IngestionCheckpoint(self.index_dir, "fake-embedding").load(), {})
+
+    def test_interrupted_build_resumes_from_checkpoint(self):
+        """매니페스트 저장 전에 중단돼도 체크포인트에 기록된 청크는 다시 임베딩하지 않음"""
+        docs_by_id = {doc.metadata["chunk_id"]: doc for doc in self.docs[:2]}
+        EmbeddingIngestionPipeline(RecordingEmbeddings(), self.store, self.index_dir, "fake-embedding").run(
+            docs_by_id, {chunk_id: self.hashes[chunk_id] for chunk_id in docs_by_id}
+        )
+
+        self.assertEqual(IngestionCheckpoint(self.index_dir, "other-embedding").load(), {})
+        embeddings = RecordingEmbeddings()
+        self.sync(embeddings)
+        self.assertEqual(sorted(embeddings.embedded), ["배터리", "엔진"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+융합 리트리버 테스트
+"""
+
+import time
+import unittest
+from contextvars import ContextVar
+from typing import List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from src.retrievers.fusion_retriever import FusionRetriever, fuse_rankings
+
+_request_tag: ContextVar[str] = ContextVar("request_tag", default="")
+
+
+def make_doc(chunk_id: str, score: float = None) -> Document:
+    metadata = {"chunk_id": chunk_id, "page": 1}
+    if score is not None:
+        metadata["score"] = score
+    return Document(page_content=f"내용 {chunk_id}", metadata=metadata)
+
+
+class StaticRetriever(BaseRetriever):
+    """고정 결과 반환 (지연 시간과 요청 컨텍스트 기록)"""
+
+    docs: List[Document]
+    delay: float = 0.0
+    seen_tags: List[str] = []
+    fail: bool = False
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        if self.fail:
+            raise RuntimeError("검색 실패")
+        time.sleep(self.delay)
+        self.seen_tags.append(_request_tag.get())
+        return self.docs
+
+
+class TestFusionRetriever(unittest.TestCase):
+    """융합 리트리버 테스트"""
+
+    def test_rrf_scores_are_calibrated_and_deduplicated(self):
+        """양쪽 1위 문서는 1.0, 청크 ID가 같은 문서는 한 번만 반환"""
+        vector = [make_doc("a", 0.9), make_doc("b", 0.8)]
+        bm25 = [make_doc("a", 12.0), make_doc("c", 7.0), make_doc("a", 3.0)]
+        docs = fuse_rankings([vector, bm25], [0.5, 0.5], ["vector", "bm25"], method="rrf")
+
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["a", "b", "c"])
+        self.assertAlmostEqual(docs[0].metadata["score"], 1.0)
+        self.assertTrue(all(0.0 < doc.metadata["score"] < 0.5 for doc in docs[1:]))
+        self.assertEqual(docs[0].metadata["retrieval_scores"], {"vector": 0.9, "bm25": 12.0})
+
+    def test_score_fusion_respects_weights(self):
+        """정규화 점수 융합은 가중치가 큰 검색기의 1위를 우선"""
+        vector = [make_doc("a", 0.9), make_doc("b", 0.5)]
+        bm25 = [make_doc("b", 20.0), make_doc("a", 2.0)]
+        docs = fuse_rankings([vector, bm25], [0.7, 0.3], ["vector", "bm25"], method="score")
+
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["a", "b"])
+        self.assertAlmostEqual(docs[0].metadata["score"], 0.7)
+        self.assertAlmostEqual(docs[1].metadata["score"], 0.3)
+
+    def test_legs_run_concurrently_with_request_context(self):
+        """검색기를 동시에 실행하고 요청 컨텍스트를 각 스레드로 복사, 실패한 검색기는 건너뜀"""
+        slow_a = StaticRetriever(docs=[make_doc("a", 0.9)], delay=0.2, seen_tags=[])
+        slow_b = StaticRetriever(docs=[make_doc("b", 5.0)], delay=0.2, seen_tags=[])
+        broken = StaticRetriever(docs=[], fail=True)
+        retriever = FusionRetriever(retrievers=[slow_a, slow_b, broken], weights=[0.5, 0.3, 0.2])
+
+        token = _request_tag.set("request-1")
+        try:
+            start_time = time.perf_counter()
+            docs = retriever.invoke("브레이크")
+            elapsed = time.perf_counter() - start_time
+        finally:
+            _request_tag.reset(token)
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["a", "b"])
+        self.assertEqual(slow_a.seen_tags + slow_b.seen_tags, ["request-1", "request-1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+벡터 인덱스 증분 동기화 테스트
+"""
+
+import tempfile
+import unittest
+from typing import Dict, List
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.retrievers.index_manifest import IndexManifest, build_chunk_hashes
+from src.retrievers.vector_retriever import VectorStoreManager
+from src.utils.document_loader import get_chunking_config
+
+
+class RecordingEmbeddings(Embeddings):
+    """임베딩한 문서 텍스트를 기록하는 가짜 임베딩"""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.embedded: List[str] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0]
+
+
+class InMemoryCollection:
+    """Chroma 컬렉션의 upsert만 흉내 낸 메모리 저장소"""
+
+    def __init__(self):
+        self.rows: Dict[str, Dict] = {}
+
+    def upsert(self, ids, embeddings, metadatas, documents):
+        for chunk_id, vector, metadata, text in zip(ids, embeddings, metadatas, documents):
+            self.rows[chunk_id] = {"embedding": vector, "metadata": metadata, "document": text}
+
+
+class InMemoryVectorStore:
+    """동기화에 쓰이는 Chroma 메서드(get/delete/_collection)만 구현한 벡터 저장소"""
+
+    def __init__(self):
+        self._collection = InMemoryCollection()
+
+    def get(self, include=None):
+        return {"ids": list(self._collection.rows)}
+
+    def delete(self, ids):
+        for chunk_id in ids:
+            self._collection.rows.pop(chunk_id, None)
+
+
+def make_docs(*texts) -> List[Document]:
+    return [Document(page_content=text, metadata={"page": i + 1}) for i, text in enumerate(texts)]
+
+
+class TestIndexManifestDiff(unittest.TestCase):
+    """매니페스트 diff 테스트"""
+
+    def test_added_changed_and_deleted_chunks(self):
+        """신규/내용 변경 청크는 추가, 사라지거나 변경된 청크는 삭제"""
+        indexed = {"a": "h1", "b": "h2", "c": "h3"}
+        current = {"a": "h1", "b": "h2-new", "d": "h4"}
+        to_add, to_delete = IndexManifest.diff(indexed, current)
+        self.assertEqual(sorted(to_add), ["b", "d"])
+        self.assertEqual(sorted(to_delete), ["b", "c"])
+        self.assertEqual(IndexManifest.diff(current, current), ([], []))
+
+
+class TestIncrementalSync(unittest.TestCase):
+    """VectorStoreManager._sync_index 증분 동기화 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index_dir = self.tmp.name
+        self.embeddings = RecordingEmbeddings()
+        self.manager = VectorStoreManager("manual.pdf", chroma_dir=self.index_dir, embeddings=self.embeddings)
+        self.manager.vector_store = InMemoryVectorStore()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def sync(self, docs: List[Document]):
+        self.embeddings.embedded.clear()
+        self.manager._sync_index(docs, self.index_dir, get_chunking_config())
+        return sorted(self.embeddings.embedded)
+
+    def test_only_new_and_changed_chunks_are_embedded(self):
+        """두 번째 동기화는 바뀐 청크만 임베딩하고 사라진 청크는 삭제"""
+        self.assertEqual(self.sync(make_docs("브레이크", "타이어", "엔진")), ["브레이크", "엔진", "타이어"])
+        self.assertEqual(self.sync(make_docs("브레이크", "타이어", "엔진")), [])
+
+        docs = make_docs("브레이크", "타이어 공기압", "배터리")
+        self.assertEqual(self.sync(docs), ["배터리", "타이어 공기압"])
+        current_ids = set(build_chunk_hashes(docs))
+        self.assertEqual(set(self.manager.vector_store._collection.rows), current_ids)
+        self.assertEqual(set(self.manager.manifest.data["chunks"]), current_ids)
+        self.assertEqual(self.manager.manifest.data["chunking"], get_chunking_config())
+
+    def test_incompatible_manifest_drops_unknown_vectors(self):
+        """임베딩 모델이 바뀌면 출처를 알 수 없는 벡터를 지우고 전체 재색인"""
+        self.sync(make_docs("브레이크", "타이어"))
+        self.manager.vector_store._collection.upsert(["orphan"], [[0.0, 0.0]], [{}], ["고아 벡터"])
+
+        self.embeddings.model = "other-embedding"
+        self.assertEqual(self.sync(make_docs("브레이크", "타이어")), ["브레이크", "타이어"])
+        self.assertNotIn("orphan", self.manager.vector_store._collection.rows)
+        self.assertEqual(self.manager.manifest.data["embedding_model"], "other-embedding")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+LLM 응답 캐시 테스트
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from pydantic import BaseModel
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers.openai_tools import PydanticToolsParser
+from langchain_core.outputs import ChatGeneration
+
+from src.config import settings
+from src.utils.llm_cache import SQLiteLLMCache
+
+
+class Analysis(BaseModel):
+    """구조화 출력 예시"""
+    is_emergency: bool
+    priority_level: str
+
+
+def fake_llm(cache, *messages):
+    """주어진 응답을 순서대로 한 번씩만 반환하는 가짜 채팅 모델"""
+    return GenericFakeChatModel(messages=iter(messages), cache=cache)
+
+
+class TestSQLiteLLMCache(unittest.TestCase):
+    """LLM 응답 캐시 테스트"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "llm_cache.sqlite3"
+        self.cache = SQLiteLLMCache(self.path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_prompt_served_from_cache(self):
+        """같은 프롬프트는 모델을 다시 호출하지 않고 적중/미스 집계"""
+        llm = fake_llm(self.cache, AIMessage(content="1만 km마다 교체하세요."))
+        first = llm.invoke("오일 교체 주기")
+        second = llm.invoke("오일 교체 주기")  # 모델 응답이 소진되어 호출되면 오류
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(self.cache.stats(), {"size": 1, "hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_structured_output_persists_across_instances(self):
+        """도구 호출(구조화 출력) 응답도 저장되고 재시작 후에도 재사용"""
+        tool_call = {"name": "Analysis", "args": {"is_emergency": True, "priority_level": "HIGH"}, "id": "call_1"}
+        parser = PydanticToolsParser(tools=[Analysis], first_tool_only=True)
+        first = (fake_llm(self.cache, AIMessage(content="", tool_calls=[tool_call])) | parser).invoke("브레이크 고장")
+
+        reopened = SQLiteLLMCache(self.path)
+        second = (fake_llm(reopened) | parser).invoke("브레이크 고장")
+        self.assertEqual(second, first)
+        self.assertEqual(second.priority_level, "HIGH")
+        self.assertEqual(reopened.hits, 1)
+
+    def test_model_parameters_are_part_of_key(self):
+        """모델 설정 문자열이 다르면 다른 캐시 항목, clear로 전체 삭제"""
+        generations = [ChatGeneration(message=AIMessage(content="A"))]
+        self.cache.update("질문", "model=gpt-4o-mini,temperature=0", generations)
+        self.assertIsNotNone(self.cache.lookup("질문", "model=gpt-4o-mini,temperature=0"))
+        self.assertIsNone(self.cache.lookup("질문", "model=gpt-4o,temperature=0"))
+        self.cache.clear()
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_entries_capped_by_count_and_age(self):
+        """max_entries를 넘으면 오래된 항목부터 삭제하고 ttl이 지난 항목은 조회하지 않음"""
+        generations = [ChatGeneration(message=AIMessage(content="A"))]
+        cache = SQLiteLLMCache(self.path, max_entries=2, ttl=None)
+        for prompt in ["질문1", "질문2", "질문3"]:
+            cache.update(prompt, "model", generations)
+            time.sleep(0.001)
+        self.assertEqual(cache.stats()["size"], 2)
+        self.assertIsNone(cache.lookup("질문1", "model"))
+        self.assertIsNotNone(cache.lookup("질문3", "model"))
+
+        cache.ttl = 0.01
+        time.sleep(0.02)
+        self.assertIsNone(cache.lookup("질문3", "model"))
+        cache.update("질문4", "model", generations)
+        self.assertEqual(cache.stats()["size"], 1)
+
+    def test_default_path_is_outside_source_tree(self):
+        """기본 캐시 경로는 환경 변수로 지정되며 테스트에서는 임시 디렉터리"""
+        self.assertEqual(str(settings.LLM_CACHE_PATH), os.environ["LLM_CACHE_PATH"])
+        self.assertNotIn(settings.PROJECT_ROOT.resolve(), settings.LLM_CACHE_PATH.resolve().parents)
+
+
+if __name__ == "__main__":
+    unittest.main()
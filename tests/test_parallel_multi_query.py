@@ -0,0 +1,87 @@
+"""
+병렬 다중 쿼리 리트리버 테스트
+"""
+
+import time
+import unittest
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.runnables import RunnableLambda
+
+from src.retrievers.numpy_vector_store import FlatVectorIndex, NumpyVectorStore
+from src.retrievers.parallel_multi_query import ParallelMultiQueryRetriever
+from src.utils.embedding_cache import CachedEmbeddings
+
+VECTORS = {
+    "엔진 오일": [1.0, 0.0, 0.0],
+    "오일 교체 주기": [0.9, 0.4, 0.0],
+    "엔진 윤활유 점검": [0.8, 0.0, 0.6],
+}
+
+
+class RecordingEmbeddings(Embeddings):
+    """질의/배치 임베딩 호출 시각과 입력 기록"""
+
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.query_calls: List[float] = []
+        self.document_batches: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.document_batches.append(list(texts))
+        return [VECTORS[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.query_calls.append(time.perf_counter())
+        return VECTORS[text]
+
+
+class TestParallelMultiQueryRetriever(unittest.TestCase):
+    """병렬 다중 쿼리 리트리버 테스트"""
+
+    def setUp(self):
+        docs = [Document(page_content=f"문서 {i}", metadata={"chunk_id": f"c{i}"}) for i in range(3)]
+        index = FlatVectorIndex.build(["c0", "c1", "c2"],
+                                      np.array([[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]), "v1")
+        self.base = RecordingEmbeddings()
+        self.store = NumpyVectorStore(index, docs, CachedEmbeddings(self.base))
+        self.llm_finished = []
+
+    def _slow_llm(self, lines: List[str]):
+        def generate(inputs):
+            time.sleep(0.2)
+            self.llm_finished.append(time.perf_counter())
+            return lines
+        return RunnableLambda(generate)
+
+    def test_original_query_searched_while_llm_generates(self):
+        """LLM 응답 전에 원본 질의를 검색하고 재작성 질의는 한 번에 배치 임베딩"""
+        retriever = ParallelMultiQueryRetriever(
+            vector_store=self.store, k=2,
+            llm_chain=self._slow_llm(["오일 교체 주기", "엔진  오일", "엔진 윤활유 점검", "오일 교체 주기"])
+        )
+        docs = retriever.invoke("엔진 오일")
+
+        self.assertLess(self.base.query_calls[0], self.llm_finished[0])
+        self.assertEqual(self.base.document_batches, [["오일 교체 주기", "엔진 윤활유 점검"]])
+        chunk_ids = [doc.metadata["chunk_id"] for doc in docs]
+        self.assertEqual(chunk_ids[0], "c0")
+        self.assertEqual(len(chunk_ids), len(set(chunk_ids)))
+        self.assertEqual(set(docs[0].metadata["retrieval_scores"]), {"original", "query_1", "query_2"})
+
+    def test_generation_failure_returns_original_results(self):
+        """질의 생성이 실패하면 원본 질의 결과만 반환"""
+        def fail(inputs):
+            raise RuntimeError("LLM 오류")
+
+        retriever = ParallelMultiQueryRetriever(vector_store=self.store, llm_chain=RunnableLambda(fail), k=1)
+        docs = retriever.invoke("엔진 오일")
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c0"])
+        self.assertEqual(self.base.document_batches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
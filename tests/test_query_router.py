@@ -0,0 +1,92 @@
+"""
+질의 라우터 테스트
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.utils.query_router import CharNgramClassifier, QueryRouter, get_query_router
+
+TEXTS = ["시동이 안 걸려요", "경고등이 켜졌어요", "공기압은 몇 psi", "오일 용량은 몇 리터", "블루투스 연결 방법", "크루즈 사용법"]
+LABELS = ["troubleshooting", "troubleshooting", "specific", "specific", "general", "general"]
+
+
+class TestCharNgramClassifier(unittest.TestCase):
+    """문자 n-gram 분류기 테스트"""
+
+    def test_fit_predict_and_roundtrip(self):
+        """학습 데이터를 맞히고 모델 파일 저장/로드 후 같은 확률"""
+        classifier = CharNgramClassifier.fit(TEXTS, LABELS)
+        for text, label in zip(TEXTS, LABELS):
+            self.assertEqual(classifier.predict(text)[0], label)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "router.json"
+            classifier.save(path)
+            loaded = CharNgramClassifier.load(path)
+        for label, probability in classifier.predict_proba("와이퍼 사용법").items():
+            self.assertAlmostEqual(loaded.predict_proba("와이퍼 사용법")[label], probability, places=9)
+
+
+class TestQueryRouter(unittest.TestCase):
+    """규칙 + 분류기 + LLM 대체 라우팅 테스트"""
+
+    def setUp(self):
+        self.router = QueryRouter(CharNgramClassifier.fit(TEXTS, LABELS), threshold=0.6)
+        self.fallback_calls = []
+
+    def _fallback(self, query):
+        self.fallback_calls.append(query)
+        return "general", "hybrid_balanced", 0.9
+
+    def test_rules_decide_without_fallback(self):
+        """규칙에 걸린 항목은 규칙 신뢰도로 결정 (기존 키워드 재지정 유지)"""
+        decision = self.router.route("브레이크 패드 교체 시 경고등이 켜졌어요", fallback=self._fallback)
+        self.assertEqual((decision.strategy, decision.method), ("troubleshooting", "expanded_query"))
+        self.assertEqual(decision.source, "rule")
+        self.assertEqual(self.fallback_calls, [])
+
+        long_question = self.router.classify("장거리 여행을 떠나기 전에 차량에서 확인해야 하는 항목은 무엇인가요?")
+        self.assertEqual(long_question.method, "multi_query")
+
+    def test_quantity_isang_is_not_a_symptom(self):
+        """수량 뒤 "이상"(~ 이상)은 문제 규칙에 걸리지 않고, 이상 증상 표현만 걸림"""
+        for query in ["속도 제한은 시속 몇 km 이상인가요?", "20km 이상이면 점검 받아야 하나요", "냉각수는 몇 리터 이상"]:
+            decision = self.router.classify(query)
+            self.assertEqual(decision.strategy, "specific", query)
+            self.assertNotEqual(decision.method, "expanded_query", query)
+        for query in ["타이어 소음이 이상해요", "엔진에서 이상한 소리", "브레이크에 이상이 있어요", "엔진 이상 증상"]:
+            decision = self.router.classify(query)
+            self.assertEqual((decision.strategy, decision.method), ("troubleshooting", "expanded_query"), query)
+
+    def test_model_decides_strategy_and_default_method(self):
+        """규칙이 없으면 분류기 전략과 전략별 기본 검색 방법 사용"""
+        decision = self.router.route("크루즈 사용 방법", fallback=self._fallback)
+        self.assertEqual((decision.strategy, decision.method), ("general", "hybrid_semantic"))
+        self.assertEqual(decision.source, "model")
+        self.assertEqual(self.fallback_calls, [])
+
+    def test_low_confidence_falls_back_only_for_uncertain_fields(self):
+        """신뢰도가 낮으면 LLM 결과로 대체하되 규칙으로 정한 항목은 유지"""
+        self.router.threshold = 0.99
+        decision = self.router.route("크루즈 교체", fallback=self._fallback)
+        self.assertEqual(self.fallback_calls, ["크루즈 교체"])
+        self.assertEqual((decision.strategy, decision.method), ("general", "expanded_query"))
+        self.assertEqual((decision.strategy_source, decision.method_source), ("llm", "rule"))
+
+        def fail(query):
+            raise RuntimeError("LLM 오류")
+        self.assertEqual(self.router.route("크루즈 사용 방법", fallback=fail).source, "model")
+
+    def test_shipped_model_routes_common_queries(self):
+        """배포 모델 파일로 LLM 없이 대표 질의 라우팅"""
+        router = get_query_router()
+        self.assertIsNotNone(router.classifier)
+        self.assertEqual(router.classify("XC60의 타이어 공기압은?").strategy, "specific")
+        self.assertEqual(router.classify("블루투스 페어링 방법").strategy, "general")
+        self.assertGreaterEqual(router.classify("블루투스 페어링 방법").confidence, router.threshold)
+
+
+if __name__ == "__main__":
+    unittest.main()
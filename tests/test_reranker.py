@@ -0,0 +1,195 @@
+"""
+Cross-Encoder 재순위화 엔진 테스트
+"""
+
+import unittest
+from typing import List, Tuple
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.retrievers.numpy_vector_store import FlatVectorIndex, NumpyVectorStore, normalize_rows
+from src.retrievers.reranker import (
+    CrossEncoderRerankEngine, CrossEncoderRerankCompressor, CascadeRerankCompressor,
+    truncate_to_token_budget
+)
+from src.utils.token_counter import estimate_tokens
+
+
+class RecordingScorer:
+    """배치별 입력을 기록하고 문서 길이에 비례한 점수를 반환하는 가짜 모델"""
+
+    def __init__(self):
+        self.batches: List[List[Tuple[str, str]]] = []
+
+    def __call__(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        self.batches.append(pairs)
+        return [min(len(text) / 100.0, 1.0) for _, text in pairs]
+
+
+def make_doc(chunk_id: str, text: str) -> Document:
+    return Document(page_content=text, metadata={"chunk_id": chunk_id, "score": 0.5})
+
+
+class TestRerankEngine(unittest.TestCase):
+    """재순위화 엔진 테스트"""
+
+    def setUp(self):
+        self.scorer = RecordingScorer()
+        self.engine = CrossEncoderRerankEngine(self.scorer, name="fake", batch_size=2, max_tokens=64)
+        self.docs = [make_doc(f"c{i}", "가" * length) for i, length in enumerate([40, 5, 30, 10, 20])]
+
+    def test_length_bucketed_batches(self):
+        """짧은 문서끼리, 긴 문서끼리 batch_size 단위로 추론"""
+        self.engine.score("브레이크", self.docs)
+        lengths = [[len(text) for _, text in batch] for batch in self.scorer.batches]
+        self.assertEqual(lengths, [[5, 10], [20, 30], [40]])
+
+    def test_score_cache_skips_model(self):
+        """같은 질의(공백 차이 무시)와 청크는 캐시 점수 사용"""
+        first = self.engine.score("브레이크 점검", self.docs)
+        second = self.engine.score(" 브레이크   점검 ", self.docs[:3])
+        self.assertEqual(second, first[:3])
+        self.assertEqual(self.engine.stats()["batches"], 3)
+        self.engine.score("타이어", self.docs[:1])
+        self.assertEqual(self.engine.stats()["batches"], 4)
+
+    def test_documents_truncated_to_token_budget(self):
+        """질의 + 문서가 토큰 예산을 넘지 않도록 문서 절단"""
+        long_doc = make_doc("long", "가나다라" * 200)
+        self.engine.score("질의", [long_doc])
+        (query, text), = self.scorer.batches[0]
+        self.assertLessEqual(estimate_tokens(text), 64 - estimate_tokens(query))
+        self.assertTrue(long_doc.page_content.startswith(text))
+        self.assertEqual(truncate_to_token_budget("짧은 문서", 64), "짧은 문서")
+
+    def test_compressor_sorts_and_sets_scores(self):
+        """재순위화 점수 순으로 top_n개 반환하고 점수를 메타데이터에 기록"""
+        docs = CrossEncoderRerankCompressor(engine=self.engine, top_n=2).compress_documents(self.docs, "질의")
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c0", "c2"])
+        self.assertEqual(docs[0].metadata["score"], docs[0].metadata["rerank_score"])
+        self.assertAlmostEqual(docs[0].metadata["score"], 0.4)
+
+
+class QueryTableEmbeddings(Embeddings):
+    """질의별 고정 벡터 (문서는 저장 벡터 사용)"""
+
+    QUERIES = {"명확": [1.0, 0.0, 0.0], "애매": [0.7, 0.7, 0.1]}
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        raise AssertionError("저장 벡터가 있는 문서는 재임베딩하지 않아야 합니다")
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.QUERIES[text]
+
+
+class FixedBM25:
+    """청크 ID별 고정 BM25 점수"""
+
+    def __init__(self, scores):
+        self.scores = scores
+
+    def score_documents(self, query: str, documents) -> List[float]:
+        return [self.scores.get(doc.metadata["chunk_id"], 0.0) for doc in documents]
+
+
+class TestCascadeReranker(unittest.TestCase):
+    """캐스케이드 재순위화 테스트"""
+
+    def setUp(self):
+        vectors = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.6, 0.8, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 1.0]]
+        self.docs = [make_doc(f"c{i}", "가" * (10 * (i + 1))) for i in range(len(vectors))]
+        embeddings = QueryTableEmbeddings()
+        index = FlatVectorIndex.build([doc.metadata["chunk_id"] for doc in self.docs], np.array(vectors), "v1")
+        self.scorer = RecordingScorer()
+        engine = CrossEncoderRerankEngine(self.scorer, name="fake", batch_size=8, max_tokens=64)
+        self.cascade = CascadeRerankCompressor(
+            vector_store=NumpyVectorStore(index, self.docs, embeddings),
+            embeddings=embeddings,
+            reranker=CrossEncoderRerankCompressor(engine=engine, top_n=2),
+            top_n=2, band_size=3, decisive_margin=0.15
+        )
+
+    def test_decisive_margin_skips_cross_encoder(self):
+        """저비용 점수 1위가 확실하면 Cross-Encoder를 호출하지 않음"""
+        docs = self.cascade.compress_documents(self.docs, "명확")
+        self.assertEqual(self.scorer.batches, [])
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c0", "c3"])
+        self.assertEqual(docs[0].metadata["rerank_stage"], "cheap")
+        self.assertAlmostEqual(docs[0].metadata["score"], 1.0, places=5)
+
+    def test_ambiguous_band_goes_to_cross_encoder(self):
+        """점수 차가 작으면 상위 band_size개만 Cross-Encoder로 재채점"""
+        docs = self.cascade.compress_documents(self.docs, "애매")
+        scored = sorted(len(text) for batch in self.scorer.batches for _, text in batch)
+        self.assertEqual(scored, [10, 30, 40])  # c2, c3 동점 다음은 c0 (c1과 동점, 안정 정렬)
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c3", "c2"])
+        self.assertEqual(docs[0].metadata["rerank_stage"], "cross_encoder")
+        self.assertIn("cheap_score", docs[0].metadata)
+
+    def test_bm25_spread_alone_does_not_skip_cross_encoder(self):
+        """코사인이 거의 같으면 BM25 차이가 커도 Cross-Encoder로 재채점"""
+        self.cascade.bm25_retriever = FixedBM25({"c2": 9.0, "c3": 1.0})
+        docs = self.cascade.compress_documents(self.docs, "애매")
+        self.assertNotEqual(self.scorer.batches, [])
+        self.assertEqual(docs[0].metadata["chunk_id"], "c3")
+
+    def test_bm25_disagreement_skips_early_exit(self):
+        """코사인 차이가 커도 BM25 1위가 다르면 Cross-Encoder로 재채점"""
+        self.cascade.bm25_retriever = FixedBM25({"c3": 5.0})
+        self.cascade.compress_documents(self.docs, "명확")
+        self.assertNotEqual(self.scorer.batches, [])
+
+    def test_cross_encoder_failure_falls_back_to_cheap_ranking(self):
+        """Cross-Encoder를 쓸 수 없으면 저비용 순위 반환"""
+        self.cascade.reranker.engine.score_batch = None
+        docs = self.cascade.compress_documents(self.docs, "애매")
+        self.assertEqual(len(docs), 2)
+        self.assertTrue(all(doc.metadata["rerank_stage"] == "cheap" for doc in docs))
+
+
+class TestCascadeTopOneAgreement(unittest.TestCase):
+    """캐스케이드 1위와 전체 Cross-Encoder 1위 비교"""
+
+    def test_top1_matches_full_cross_encoder(self):
+        """Cross-Encoder 점수가 코사인 ± decisive_margin/2 안이면 무작위 BM25에서도 1위가 같음
+
+        조기 종료 판단만 검증하도록 band_size는 후보 전체로 둔다.
+        """
+        rng = np.random.default_rng(0)
+        margin, num_docs, dim = 0.1, 20, 16
+        embeddings, truth = QueryTableEmbeddings(), {}
+        embeddings.QUERIES = {}
+        queries = embeddings.QUERIES
+
+        def scorer(pairs):
+            return [truth[(query, text)] for query, text in pairs]
+
+        early_exits = 0
+        for trial in range(200):
+            vectors = rng.normal(size=(num_docs, dim))
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            query = f"q{trial}"
+            queries[query] = (vectors[0] + rng.normal(scale=0.6, size=dim)).tolist()
+            docs = [make_doc(f"t{trial}-{i}", f"t{trial}-{i}") for i in range(num_docs)]
+            cosine = normalize_rows(vectors) @ (np.array(queries[query]) / np.linalg.norm(queries[query]))
+            for i, doc in enumerate(docs):
+                truth[(query, doc.page_content)] = float(cosine[i] + rng.uniform(-0.49, 0.49) * margin)
+
+            index = FlatVectorIndex.build([doc.metadata["chunk_id"] for doc in docs], vectors, "v1")
+            engine = CrossEncoderRerankEngine(scorer, name="fake", batch_size=32, max_tokens=64)
+            full = CrossEncoderRerankCompressor(engine=engine, top_n=1).compress_documents(docs, query)
+            bm25 = FixedBM25({doc.metadata["chunk_id"]: float(score) for doc, score
+                              in zip(docs, rng.exponential(scale=3.0, size=num_docs))})
+            cascade = CascadeRerankCompressor(
+                vector_store=NumpyVectorStore(index, docs, embeddings), embeddings=embeddings,
+                reranker=CrossEncoderRerankCompressor(engine=engine, top_n=1), bm25_retriever=bm25,
+                top_n=1, band_size=num_docs, decisive_margin=margin
+            ).compress_documents(docs, query)
+            early_exits += cascade[0].metadata["rerank_stage"] == "cheap"
+            self.assertEqual(cascade[0].metadata["chunk_id"], full[0].metadata["chunk_id"], query)
+        self.assertGreater(early_exits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
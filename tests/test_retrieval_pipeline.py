@@ -0,0 +1,77 @@
+"""
+단계형 검색 파이프라인 테스트
+"""
+
+import unittest
+from typing import List, Optional, Sequence
+from langchain_core.callbacks import CallbackManagerForRetrieverRun, Callbacks
+from langchain_core.documents import Document
+from langchain_core.documents.compressor import BaseDocumentCompressor
+from langchain_core.retrievers import BaseRetriever
+
+from src.retrievers.retrieval_pipeline import RetrievalPipeline
+
+
+class CountingRetriever(BaseRetriever):
+    """고정 후보 반환 (호출 횟수 기록)"""
+
+    docs: List[Document]
+    calls: int = 0
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        self.calls += 1
+        return self.docs
+
+
+class ReverseStage(BaseDocumentCompressor):
+    """받은 후보를 역순으로 정렬하고 입력 후보를 기록"""
+
+    received: List[str] = []
+
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        self.received.extend(doc.metadata["chunk_id"] for doc in documents)
+        return list(reversed(documents))
+
+
+class FailingStage(BaseDocumentCompressor):
+    def compress_documents(self, documents: Sequence[Document], query: str,
+                           callbacks: Optional[Callbacks] = None) -> Sequence[Document]:
+        raise RuntimeError("모델 로드 실패")
+
+
+class TestRetrievalPipeline(unittest.TestCase):
+    """단계형 검색 파이프라인 테스트"""
+
+    def setUp(self):
+        self.docs = [Document(page_content=f"내용 {i}", metadata={"chunk_id": f"c{i}"}) for i in range(6)]
+        self.retriever = CountingRetriever(docs=self.docs)
+
+    def test_stages_consume_first_stage_candidates(self):
+        """재순위화 단계는 1차 후보를 받고 추가 검색은 없음"""
+        stage = ReverseStage(received=[])
+        pipeline = RetrievalPipeline(retriever=self.retriever, stages=[("rerank", stage)], top_k=3)
+
+        docs = pipeline.invoke("브레이크")
+
+        self.assertEqual(self.retriever.calls, 1)
+        self.assertEqual(stage.received, [f"c{i}" for i in range(6)])
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c5", "c4", "c3"])
+
+    def test_failed_or_missing_stage_keeps_candidates(self):
+        """실패하거나 초기화되지 않은 단계는 건너뛰고 이전 후보 유지"""
+        pipeline = RetrievalPipeline(
+            retriever=self.retriever,
+            stages=[("rerank", FailingStage()), ("compress", None), ("reverse", ReverseStage(received=[]))]
+        )
+
+        docs = pipeline.refine("브레이크", self.docs[:2])
+
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c1", "c0"])
+        self.assertEqual(self.retriever.calls, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+매뉴얼 샤드 관리자 테스트
+"""
+
+import threading
+import time
+import unittest
+from langchain_core.documents import Document
+
+from src.retrievers.shard_manager import ManualShard, ShardManager, get_shard_dirs
+
+MB = 1024 * 1024
+
+
+class TestShardManager(unittest.TestCase):
+    """샤드 지연 로드/LRU 해제 테스트"""
+
+    def setUp(self):
+        self.catalog = {
+            vehicle_id: {"name": vehicle_id, "pdf_path": f"{vehicle_id}.pdf"}
+            for vehicle_id in ("base", "a", "b", "c")
+        }
+        self.build_count = {}
+
+    def build_shard(self, vehicle_id, manual):
+        """1MB 분량의 청크를 가진 샤드"""
+        time.sleep(0.05)
+        self.build_count[vehicle_id] = self.build_count.get(vehicle_id, 0) + 1
+        shard = ManualShard(vehicle_id, manual)
+        shard.documents = [Document(page_content="x" * MB)]
+        return shard
+
+    def test_lazy_load_and_lru_eviction(self):
+        """예산 초과 시 고정 샤드와 방금 사용한 샤드를 제외하고 가장 오래된 샤드 해제"""
+        manager = ShardManager(self.catalog, self.build_shard, memory_budget_mb=3.5, pinned=["base"])
+        self.assertEqual(manager.loaded_vehicle_ids(), [])
+        for vehicle_id in ("base", "a", "b"):
+            manager.get(vehicle_id)
+        manager.get("a")  # a를 최근 사용으로 갱신
+        manager.get("c")
+        self.assertEqual(sorted(manager.loaded_vehicle_ids()), ["a", "base", "c"])
+        self.assertLessEqual(manager.memory_usage_mb(), 3.5)
+
+        manager.get("b")  # 해제된 샤드는 다시 로드
+        self.assertEqual(self.build_count["b"], 2)
+        self.assertIn("base", manager.loaded_vehicle_ids())
+
+    def test_concurrent_requests_build_once(self):
+        """같은 샤드 동시 요청은 한 번만 로드"""
+        manager = ShardManager(self.catalog, self.build_shard)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(manager.get("a"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.build_count, {"a": 1})
+        self.assertTrue(all(shard is results[0] for shard in results))
+
+    def test_unknown_vehicle_and_shard_dirs(self):
+        """등록되지 않은 차량은 오류, 인덱스 경로는 차량별로 분리"""
+        manager = ShardManager(self.catalog, self.build_shard)
+        with self.assertRaises(ValueError):
+            manager.get("unknown")
+        dirs_a = get_shard_dirs("a", self.catalog["a"])
+        dirs_b = get_shard_dirs("b", self.catalog["b"])
+        self.assertNotEqual(dirs_a["chroma_dir"], dirs_b["chroma_dir"])
+        self.assertEqual(get_shard_dirs("a", {"index_root": "/data"})["bm25_index_dir"].as_posix(),
+                         "/data/bm25_index")
+
+
+if __name__ == "__main__":
+    unittest.main()
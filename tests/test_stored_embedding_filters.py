@@ -0,0 +1,73 @@
+"""
+저장 임베딩 기반 압축 필터 테스트
+"""
+
+import unittest
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.retrievers.numpy_vector_store import FlatVectorIndex, NumpyVectorStore
+from src.retrievers.stored_embedding_filters import (
+    StoredEmbeddingsFilter, StoredEmbeddingsRedundantFilter
+)
+
+VECTORS = {
+    "브레이크 점검": [1.0, 0.0, 0.0],
+    "브레이크 점검 안내": [0.99, 0.1, 0.0],
+    "타이어 교체": [0.0, 1.0, 0.0],
+    "브레이크": [1.0, 0.05, 0.0],
+}
+
+
+class TableEmbeddings(Embeddings):
+    """고정 벡터 표 임베딩 (문서 임베딩 호출 횟수 기록)"""
+
+    def __init__(self):
+        self.document_calls = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.document_calls += len(texts)
+        return [VECTORS.get(text, [0.0, 0.0, 1.0]) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return VECTORS[text]
+
+
+class TestStoredEmbeddingFilters(unittest.TestCase):
+    """저장 임베딩 필터 테스트"""
+
+    def setUp(self):
+        texts = ["브레이크 점검", "브레이크 점검 안내", "타이어 교체"]
+        self.docs = [Document(page_content=text, metadata={"chunk_id": f"c{i}"}) for i, text in enumerate(texts)]
+        self.embeddings = TableEmbeddings()
+        index = FlatVectorIndex.build([doc.metadata["chunk_id"] for doc in self.docs],
+                                      np.array([VECTORS[text] for text in texts]), "v1")
+        self.store = NumpyVectorStore(index, self.docs, self.embeddings)
+
+    def test_similarity_filter_uses_stored_vectors(self):
+        """질의와 유사한 문서만 남기고 문서는 재임베딩하지 않음"""
+        docs = StoredEmbeddingsFilter(vector_store=self.store, embeddings=self.embeddings,
+                                      similarity_threshold=0.6).compress_documents(self.docs, "브레이크")
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c0", "c1"])
+        self.assertGreater(docs[0].metadata["query_similarity_score"], 0.9)
+        self.assertEqual(self.embeddings.document_calls, 0)
+
+    def test_redundant_filter_drops_near_duplicates(self):
+        """앞선 문서와 거의 같은 문서 제거"""
+        docs = StoredEmbeddingsRedundantFilter(vector_store=self.store, embeddings=self.embeddings,
+                                               similarity_threshold=0.9).compress_documents(self.docs, "")
+        self.assertEqual([doc.metadata["chunk_id"] for doc in docs], ["c0", "c2"])
+
+    def test_unindexed_documents_are_embedded(self):
+        """저장소에 없는 청크만 임베딩"""
+        extra = Document(page_content="브레이크", metadata={"chunk_id": "new"})
+        docs = StoredEmbeddingsFilter(vector_store=self.store, embeddings=self.embeddings,
+                                      similarity_threshold=0.6).compress_documents(self.docs + [extra], "브레이크")
+        self.assertEqual(self.embeddings.document_calls, 1)
+        self.assertIn("new", [doc.metadata["chunk_id"] for doc in docs])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+구조 인식 청커 테스트
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from langchain_core.documents import Document
+
+from src.utils.chunk_store import ChunkStore
+from src.utils.document_loader import DocumentLoader, get_chunking_config
+from src.utils.structure_chunker import LayoutLine, StructureChunker
+
+
+def body(page, text):
+    return LayoutLine(page=page, text=text, font_size=10.0)
+
+
+class TestStructureChunker(unittest.TestCase):
+    """구조 인식 청커 테스트"""
+
+    def setUp(self):
+        self.lines = [
+            LayoutLine(page=1, text="운전", font_size=18.0),
+            LayoutLine(page=1, text="브레이크", font_size=14.0),
+            body(1, "브레이크 시스템은 차량을 감속하고 정지시킵니다."),
+            body(1, "경고"),
+            body(1, "브레이크 경고등이 켜진 상태로 주행하지 마십시오."),
+            body(1, "• 즉시 안전한 곳에 정차하십시오."),
+            LayoutLine(page=2, text="타이어", font_size=14.0),
+            LayoutLine(page=2, text="구분 앞 뒤", font_size=10.0, cells=("구분", "앞", "뒤")),
+            LayoutLine(page=2, text="공기압 36 38", font_size=10.0, cells=("공기압", "36", "38")),
+            body(2, "1. 타이어가 식은 상태에서 점검하십시오."),
+            body(2, "2. 밸브 캡을 다시 닫으십시오."),
+        ]
+
+    def test_section_paths_follow_headings(self):
+        """제목 글꼴 크기로 섹션 경로를 만들고 섹션 경계에서 청크를 나눔"""
+        docs = StructureChunker(target_tokens=400).chunk_lines(self.lines, source="manual.pdf")
+        self.assertEqual([doc.metadata["section_path"] for doc in docs],
+                         ["운전 > 브레이크", "운전 > 타이어"])
+        self.assertTrue(docs[0].page_content.startswith("운전 > 브레이크\n"))
+        self.assertEqual((docs[1].metadata["page"], docs[1].metadata["end_page"]), (2, 2))
+
+    def test_warning_and_table_blocks_stay_intact(self):
+        """경고 상자와 표는 한 블록으로 유지"""
+        docs = StructureChunker(target_tokens=400).chunk_lines(self.lines)
+        self.assertIn("경고\n브레이크 경고등이 켜진 상태로 주행하지 마십시오.\n• 즉시", docs[0].page_content)
+        self.assertEqual(docs[0].metadata["block_types"], "paragraph,warning")
+        self.assertIn("구분 | 앞 | 뒤\n공기압 | 36 | 38", docs[1].page_content)
+        self.assertEqual(docs[1].metadata["block_types"], "table,list")
+
+    def test_oversized_table_repeats_header_row(self):
+        """최대 토큰을 넘는 표는 줄 단위로 나누고 머리 행을 반복"""
+        rows = [LayoutLine(page=1, text="항목 값", font_size=10.0, cells=("항목", "값"))]
+        rows += [
+            LayoutLine(page=1, text=f"항목{i} {i}", font_size=10.0, cells=(f"항목{i}", str(i)))
+            for i in range(40)
+        ]
+        docs = StructureChunker(target_tokens=50, max_tokens=60).chunk_lines(rows)
+        self.assertGreater(len(docs), 1)
+        for doc in docs:
+            self.assertTrue(doc.page_content.startswith("항목 | 값"))
+            self.assertLessEqual(doc.metadata["chunk_tokens"], 61)
+
+
+class TestStructureChunkingFallback(unittest.TestCase):
+    """구조 청킹 실패 시 대체 분할 설정 기록 테스트"""
+
+    def test_fallback_reports_recursive_config(self):
+        """고정 길이 분할로 대체하면 실제 사용한 설정을 기록하고 저장소에는 남기지 않음"""
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = Path(tmp) / "manual.pdf"
+            pdf_path.write_bytes(b"%PDF-1.4")
+            store = ChunkStore(store_dir=Path(tmp) / "chunks", chunking=get_chunking_config("structure"))
+            loader = DocumentLoader(chunk_store=store, strategy="structure")
+            pages = [Document(page_content="브레이크 경고등이 켜지면 정차하십시오.", metadata={"page": 1})]
+            with mock.patch.object(StructureChunker, "chunk_pdf", return_value=[]), \
+                    mock.patch.object(DocumentLoader, "load_pdf", return_value=pages):
+                docs = loader.load_and_split_pdf(str(pdf_path))
+
+            self.assertEqual(len(docs), 1)
+            self.assertEqual(loader.last_chunking_config["strategy"], "recursive")
+            self.assertIsNone(store.load(str(pdf_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
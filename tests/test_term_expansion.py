@@ -0,0 +1,98 @@
+"""
+전문 용어 확장 엔진 테스트
+"""
+
+import unittest
+from typing import List
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.retrievers.bm25_index import BM25Index
+from src.retrievers.bm25_retriever import InvertedIndexBM25Retriever
+from src.retrievers.expanded_query_retriever import ExpandedBM25Retriever
+from src.utils.term_expansion import AhoCorasick, VehicleTermExpander
+
+TERMS = {
+    "브레이크": ["브레이크", "제동", "브레이크 패드", "브레이크액"],
+    "타이어": ["타이어", "공기압", "PSI"],
+}
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """다중 패턴 오토마톤 테스트"""
+
+    def test_finds_overlapping_matches(self):
+        """접미사/겹치는 패턴을 한 번의 순회로 모두 찾음"""
+        automaton = AhoCorasick(["he", "she", "his", "hers"])
+        matches = sorted(automaton.find_all("ushers"))
+        self.assertEqual(matches, [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")])
+
+    def test_longest_non_overlapping(self):
+        """겹치면 왼쪽부터 가장 긴 패턴 선택"""
+        automaton = AhoCorasick(["브레이크", "브레이크 패드", "패드"])
+        self.assertEqual(
+            [pattern for _, _, pattern in automaton.find_longest("브레이크 패드 교체와 패드 점검")],
+            ["브레이크 패드", "패드"]
+        )
+
+
+class TestVehicleTermExpander(unittest.TestCase):
+    """차량 용어 확장기 테스트"""
+
+    def setUp(self):
+        self.expander = VehicleTermExpander(TERMS, term_weight=0.3, vector_weight=0.5)
+
+    def test_synonym_triggers_group(self):
+        """대표 용어가 아닌 동의어(대소문자 무시)도 그룹 확장"""
+        expansion = self.expander.expand("제동이 밀리고 psi 경고")
+        self.assertEqual(expansion.groups, ["브레이크", "타이어"])
+        self.assertNotIn("제동", expansion.synonyms)
+        self.assertIn("브레이크액", expansion.synonyms)
+        self.assertEqual(self.expander.expand("와이퍼 교체").groups, [])
+
+    def test_bm25_weights_boost_synonyms_below_original(self):
+        """원본 용어는 출현 횟수, 확장 용어는 낮은 가중치로 추가"""
+        weights = self.expander.bm25_term_weights("제동 제동 소음", str.split)
+        self.assertEqual(weights["제동"], 2)
+        self.assertEqual(weights["소음"], 1)
+        self.assertEqual(weights["브레이크액"], 0.3)
+        self.assertEqual(weights["패드"], 0.3)
+
+    def test_weighted_bm25_search_single_pass(self):
+        """확장 용어만 가진 문서도 원본 용어 문서보다 낮은 점수로 검색"""
+        tokenized = [["제동", "거리"], ["브레이크액", "교체"], ["와이퍼", "교체"]]
+        docs = [Document(page_content=" ".join(tokens), metadata={"chunk_id": f"c{i}"})
+                for i, tokens in enumerate(tokenized)]
+        bm25 = InvertedIndexBM25Retriever.from_index(
+            BM25Index.build(tokenized, "v1", "whitespace"), docs, str.split, k=3
+        )
+        results = ExpandedBM25Retriever(bm25_retriever=bm25, expander=self.expander, k=3).invoke("제동")
+        self.assertEqual([doc.metadata["chunk_id"] for doc in results], ["c0", "c1"])
+        self.assertGreater(results[0].metadata["score"], results[1].metadata["score"])
+
+    def test_expanded_vector_blends_group_centroid(self):
+        """질의 벡터와 용어 그룹 평균 벡터를 섞고, 그룹 벡터는 한 번만 임베딩"""
+        class AxisEmbeddings(Embeddings):
+            model = "axis"
+
+            def __init__(self):
+                self.document_batches: List[List[str]] = []
+
+            def embed_documents(self, texts: List[str]) -> List[List[float]]:
+                self.document_batches.append(list(texts))
+                return [[0.0, 1.0] for _ in texts]
+
+            def embed_query(self, text: str) -> List[float]:
+                return [1.0, 0.0]
+
+        embeddings = AxisEmbeddings()
+        vector = self.expander.expanded_vector("제동 소음", embeddings)
+        np.testing.assert_allclose(vector, [np.sqrt(0.5), np.sqrt(0.5)], rtol=1e-5)
+        self.expander.expanded_vector("브레이크 소음", embeddings)
+        self.assertEqual(len(embeddings.document_batches), 1)
+        self.assertEqual(self.expander.expanded_vector("와이퍼", embeddings), [1.0, 0.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+벡터 인덱스(정확/IVF) 테스트
+"""
+
+import tempfile
+import unittest
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from src.retrievers.numpy_vector_store import FlatVectorIndex, NumpyVectorStore, ReadOnlyVectorStoreError
+from src.retrievers.vector_retriever import VectorStoreManager
+from src.retrievers.ann_index import IVFVectorIndex
+from src.tools.search_tools import use_components, vector_search
+from tests.test_ann_benchmark import synthetic_vectors
+from tests.test_stored_embedding_filters import VECTORS, TableEmbeddings
+
+
+class TestIVFVectorIndex(unittest.TestCase):
+    """IVF 근사 인덱스 테스트"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.vectors = synthetic_vectors(num_vectors=3000, dim=32, clusters=30)
+        cls.ids = [f"p{i // 10:04d}-{i:016x}" for i in range(len(cls.vectors))]
+        cls.queries = cls.vectors[::150] + 0.05
+        cls.exact = FlatVectorIndex.build(cls.ids, cls.vectors, "v1")
+        cls.ivf = IVFVectorIndex.build(cls.ids, cls.vectors, "v1", nlist=30)
+
+    def _id_sets(self, index, **kwargs):
+        return [{index.ids[position] for position, _ in hits}
+                for hits in index.search(self.queries, 10, **kwargs)]
+
+    def test_full_probe_matches_exact_search(self):
+        """nprobe가 리스트 수와 같으면 정확 검색과 동일"""
+        self.assertEqual(self._id_sets(self.ivf, nprobe=self.ivf.nlist), self._id_sets(self.exact))
+
+    def test_recall_increases_with_nprobe(self):
+        """nprobe를 키우면 재현율이 오름"""
+        truth = self._id_sets(self.exact)
+
+        def recall(nprobe):
+            found = self._id_sets(self.ivf, nprobe=nprobe)
+            return np.mean([len(a & b) / 10 for a, b in zip(found, truth)])
+
+        self.assertLessEqual(recall(1), recall(8))
+        self.assertGreaterEqual(recall(8), 0.9)
+
+    def test_mask_falls_back_to_full_scan(self):
+        """필터로 후보가 부족하면 전체 리스트에서 찾음"""
+        mask = np.zeros(self.ivf.num_vectors, dtype=bool)
+        mask[[5, 1500, 2900]] = True
+        hits = self.ivf.search(self.queries[:1], 10, mask=mask, nprobe=1)[0]
+        self.assertEqual(sorted(position for position, _ in hits), [5, 1500, 2900])
+
+    def test_save_and_load_roundtrip(self):
+        """저장 후 같은 설정으로만 다시 로드"""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.ivf.save(tmp + "/index")
+            loaded = IVFVectorIndex.load(tmp + "/index", "v1", nlist=30, iterations=self.ivf.meta["params"]["iterations"])
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.ids, self.ivf.ids)
+            self.assertEqual(self._id_sets(loaded, nprobe=4), self._id_sets(self.ivf, nprobe=4))
+            self.assertIsNone(IVFVectorIndex.load(tmp + "/index", "v1", nlist=64, iterations=10))
+            self.assertIsNone(FlatVectorIndex.load(tmp + "/index", "v1"))
+
+
+class TestVectorSearchScores(unittest.TestCase):
+    """vector_search 점수 규약 테스트"""
+
+    def test_backends_return_relevance_scores(self):
+        """NumPy/Chroma 모두 클수록 관련성이 높은 [0, 1] 점수로 같은 순서를 반환"""
+        texts = ["브레이크 점검", "타이어 교체", "브레이크 점검 안내"]
+        docs = [Document(page_content=text, metadata={"chunk_id": f"c{i}", "page": i}) for i, text in enumerate(texts)]
+        embeddings = TableEmbeddings()
+        index = FlatVectorIndex.build([doc.metadata["chunk_id"] for doc in docs],
+                                      np.array([VECTORS[text] for text in texts]), "v1")
+        with tempfile.TemporaryDirectory() as tmp:
+            chroma = Chroma(persist_directory=tmp, embedding_function=embeddings,
+                            collection_metadata={"hnsw:space": "cosine"})
+            chroma.add_documents(docs, ids=[doc.metadata["chunk_id"] for doc in docs])
+            for store in (NumpyVectorStore(index, docs, embeddings), chroma):
+                with use_components({"vector_store": store}):
+                    results = vector_search.invoke({"query": "브레이크", "top_k": 3})
+                scores = [result["score"] for result in results]
+                self.assertEqual([result["chunk_id"] for result in results], ["c0", "c2", "c1"])
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                self.assertTrue(all(0.0 <= score <= 1.0 for score in scores))
+
+
+class TestNumpyVectorStoreWrites(unittest.TestCase):
+    """NumpyVectorStore 쓰기 경로 테스트"""
+
+    def test_add_texts_syncs_chroma_and_rebuilds_index(self):
+        """add_texts는 Chroma에 증분 색인한 뒤 같은 저장소 객체의 인덱스를 재생성"""
+        embeddings = TableEmbeddings()
+        with tempfile.TemporaryDirectory() as tmp:
+            pdf_path = f"{tmp}/manual.pdf"
+            open(pdf_path, "wb").close()
+            manager = VectorStoreManager(pdf_path, chroma_dir=f"{tmp}/chroma", vector_index_dir=f"{tmp}/index",
+                                         embeddings=embeddings)
+            docs = [Document(page_content=text, metadata={"page": i + 1})
+                    for i, text in enumerate(["타이어 교체", "브레이크 점검"])]
+            store = manager.initialize_vector_store(documents=docs, backend="numpy")
+            self.assertIsInstance(store, NumpyVectorStore)
+            existing_ids = list(store.index.ids)
+            embeddings.document_calls = 0
+
+            ids = store.add_texts(["브레이크 점검 안내"], metadatas=[{"page": 3}])
+            self.assertEqual(embeddings.document_calls, 1)
+            self.assertEqual(store.index.ids, existing_ids + ids)
+            self.assertEqual(set(manager.manifest.data["chunks"]), set(store.index.ids))
+            hits = store.similarity_search("브레이크", k=2)
+            self.assertEqual([doc.page_content for doc in hits], ["브레이크 점검", "브레이크 점검 안내"])
+
+    def test_detached_store_raises_read_only_error(self):
+        """Chroma 동기화 경로가 없으면 전용 예외로 거부"""
+        docs = [Document(page_content="타이어 교체", metadata={"chunk_id": "c0"})]
+        store = NumpyVectorStore(FlatVectorIndex.build(["c0"], np.array([VECTORS["타이어 교체"]]), "v1"),
+                                 docs, TableEmbeddings())
+        with self.assertRaises(ReadOnlyVectorStoreError):
+            store.add_texts(["브레이크 점검"])
+        with self.assertRaises(ReadOnlyVectorStoreError):
+            NumpyVectorStore.from_texts(["브레이크 점검"], TableEmbeddings())
+
+
+if __name__ == "__main__":
+    unittest.main()